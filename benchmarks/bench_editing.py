@@ -0,0 +1,95 @@
+# 메인 창 편집 경로: set_list / load_labels_from_file / savepoint 시간과 undo 기록 메모리 증가량
+# 사용법: python benchmarks/bench_editing.py [--full]
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import (FULL_POLYGON_COUNTS, QUICK_POLYGON_COUNTS, make_pair, make_polys,  # noqa: E402
+                       median_time, setup_environment)
+
+setup_environment()
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from change_detection_v5 import change_detection  # noqa: E402
+from label_io import label_csv_path, write_labels  # noqa: E402
+from undo_history import HistoryManager  # noqa: E402
+
+IMAGE_SIZE = 1024
+REPEAT = 3
+
+
+def bench_window(directory, counts):
+    """
+    폴리곤 수마다 라벨 리스트 갱신, 라벨 파일 읽기, 저장(백그라운드 스레드 종료까지) 시간
+    """
+    results = {}
+    path_a, path_b = make_pair(directory, IMAGE_SIZE)
+    window = change_detection()
+    try:
+        window.box.path = path_a
+        window.box.set_image(window.prefetcher.pixmap(path_a))
+        for count in counts:
+            polys = make_polys(count, IMAGE_SIZE)
+            window.box.poly_list = polys
+
+            def set_list():
+                window.labels_dirty = True
+                window.set_list()
+            results[f"set_list/{count}_ms"] = median_time(set_list, REPEAT) * 1000
+
+            write_labels(label_csv_path(path_a), polys)
+            results[f"load_labels/{count}_ms"] = median_time(window.load_labels_from_file, REPEAT) * 1000
+
+            def savepoint():
+                window.image_labels[path_a] = polys
+                window.dirty_labels.add(path_a)
+                window.savepoint()
+                window.save_worker.wait()
+                QApplication.processEvents()
+            results[f"savepoint/{count}_ms"] = median_time(savepoint, REPEAT) * 1000
+    finally:
+        window.prefetcher.shutdown()
+        window.proposal_engine.shutdown()
+        window.journal.close()
+    return results
+
+
+def bench_undo(counts):
+    """
+    폴리곤을 하나씩 추가하는 편집 count개를 쌓았을 때 undo 기록이 실제로 늘린 메모리 (tracemalloc)
+    """
+    results = {}
+    for count in counts:
+        polys = make_polys(count, IMAGE_SIZE)
+        history = HistoryManager()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for row, poly_dict in enumerate(polys):
+            history.push("image.png", ('add', [(row, poly_dict)]))
+        growth = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        results[f"undo/{count}/bytes"] = growth
+        results[f"undo/{count}/estimated_bytes"] = history.total_bytes()
+    return results
+
+
+def run(full=False, directory=None):
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    counts = FULL_POLYGON_COUNTS if full else QUICK_POLYGON_COUNTS
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="cd_bench_")
+    try:
+        results = bench_window(directory, counts)
+        results.update(bench_undo(counts))
+    finally:
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run("--full" in sys.argv[1:]).items():
+        print(f"{name:<40} {value:>12.2f}")
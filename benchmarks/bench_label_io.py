@@ -0,0 +1,72 @@
+# CSV / NPZ 라벨 저장·로드 시간 비교
+# 사용법: python benchmarks/bench_label_io.py [폴리곤 수 ...]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from label_io import read_labels, read_labels_npz, write_labels, write_labels_npz  # noqa: E402
+
+DEFAULT_SIZES = [10, 1000, 10000, 50000]
+REPEAT = 3
+
+
+def make_polys(count, seed=0):
+    """
+    꼭짓점 4~200개짜리 임의 폴리곤 생성
+    """
+    rng = np.random.default_rng(seed)
+    polys = []
+    for _ in range(count):
+        n = int(rng.integers(4, 200))
+        points = (rng.random(n * 2) * 20000).tolist()
+        polys.append({'points': points, 'class': int(rng.integers(1, 6))})
+    return polys
+
+
+def best_time(func, *args):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=DEFAULT_SIZES):
+    """
+    {'label_io/<폴리곤 수>/<형식>/save_ms' 등: 값} (run_benchmarks.py에서 기준값과 비교)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in sizes:
+            polys = make_polys(count)
+            csv_path = os.path.join(tmp, "label", "bench_Label.csv")
+            binary_path = os.path.join(tmp, "label", "bench_Label.npz")
+            rows = [
+                ('csv', csv_path, write_labels, read_labels),
+                ('npz', binary_path, write_labels_npz, read_labels_npz),
+            ]
+            for name, path, write, read in rows:
+                prefix = f"label_io/{count}/{name}"
+                results[f"{prefix}/save_ms"] = best_time(write, path, polys) * 1000
+                results[f"{prefix}/load_ms"] = best_time(read, path) * 1000
+                results[f"{prefix}/size_kb"] = os.path.getsize(path) / 1024
+    return results
+
+
+def main(sizes):
+    results = run(sizes)
+    print(f"{'polygons':>9} {'format':>6} {'save(ms)':>10} {'load(ms)':>10} {'size(KB)':>10}")
+    for count in sizes:
+        for name in ('csv', 'npz'):
+            prefix = f"label_io/{count}/{name}"
+            print(f"{count:>9} {name:>6} {results[prefix + '/save_ms']:>10.1f} "
+                  f"{results[prefix + '/load_ms']:>10.1f} {results[prefix + '/size_kb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,127 @@
+# 오프스크린(QT_QPA_PLATFORM=offscreen) 화면 그리기 시간과 이미지 쌍 로딩 지연
+# 사용법: python benchmarks/bench_render.py [--full]
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import (FULL_IMAGE_SIZES, FULL_POLYGON_COUNTS, QUICK_IMAGE_SIZES,  # noqa: E402
+                       QUICK_POLYGON_COUNTS, make_pair, make_polys, median_time, setup_environment)
+
+setup_environment()
+from PyQt5.QtCore import QPoint  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+from change_detection_v5 import ImageBox  # noqa: E402
+from image_cache import DiskCache  # noqa: E402
+from image_prefetch import ImagePrefetcher  # noqa: E402
+
+VIEW_SIZE = (1280, 800)  # 그리는 창 크기
+FRAMES = 10  # 단계별로 그리는 프레임 수 (중앙값 사용)
+DECODE_REPEAT = 3
+
+
+def fit_view(box, size, scale=None):
+    """
+    scale이 없으면 영상 전체가 창에 들어오게 맞춤
+    """
+    box.scale = scale if scale is not None else min(VIEW_SIZE[0] / size, VIEW_SIZE[1] / size)
+    box.w = size * box.scale
+    box.h = size * box.scale
+    box.point = QPoint(0, 0)
+    box.zooming = False
+
+
+def bench_frames(directory, sizes, counts):
+    """
+    영상 크기 x 폴리곤 수마다 첫 프레임, 변화 없는 프레임, 1:1 이동, 확대/축소 중 프레임 시간
+    """
+    results = {}
+    prefetcher = ImagePrefetcher(disk=DiskCache(os.path.join(directory, "cache")))
+    box = ImageBox()
+    box.resize(*VIEW_SIZE)
+    box.level_store = prefetcher.level_store
+    try:
+        for size in sizes:
+            path_a, path_b = make_pair(directory, size)
+            box.path = path_a
+            box.set_image(prefetcher.pixmap(path_a))
+            box.imgB = prefetcher.pixmap(path_b)
+            box.pyramidB = box.make_pyramid(box.imgB, box.pyramidB, path_b)
+            for count in counts:
+                box.poly_list = make_polys(count, size)
+                fit_view(box, size)
+                results[f"render/{size}/{count}/first_ms"] = median_time(box.grab, 1) * 1000
+                results[f"render/{size}/{count}/idle_ms"] = median_time(box.grab, FRAMES) * 1000
+
+                fit_view(box, size, 1.0)
+                box.grab()
+
+                def pan():
+                    box.point -= QPoint(16, 8)
+                    box.grab()
+                results[f"render/{size}/{count}/pan_ms"] = median_time(pan, FRAMES) * 1000
+
+                fit_view(box, size)
+                factors = iter([1.1, 1 / 1.1] * FRAMES)
+
+                def zoom():
+                    # 휠을 굴리는 동안처럼 빠른 보간으로 배율만 바꿈
+                    box.scale *= next(factors)
+                    box.w = size * box.scale
+                    box.h = size * box.scale
+                    box.zooming = True
+                    box.grab()
+                results[f"render/{size}/{count}/zoom_ms"] = median_time(zoom, FRAMES) * 1000
+    finally:
+        prefetcher.shutdown()
+    return results
+
+
+def bench_decode(directory, sizes):
+    """
+    쌍 하나를 처음 읽을 때(디코딩), 디스크 캐시에서 읽을 때, 메모리 캐시에서 꺼낼 때의 지연
+    """
+    results = {}
+    for size in sizes:
+        path_a, path_b = make_pair(directory, size)
+        cold, disk = [], []
+        for _ in range(DECODE_REPEAT):
+            cache_dir = tempfile.mkdtemp(dir=directory)
+            # 프로그램과 같은 설정 (전체 해상도 캐시 상한은 기본값)
+            prefetcher = ImagePrefetcher(disk=DiskCache(cache_dir))
+            try:
+                cold.append(median_time(lambda: (prefetcher.pixmap(path_a), prefetcher.pixmap(path_b)), 1))
+                # 백그라운드 쓰기가 끝난 뒤 메모리 캐시만 비우고 다시 읽음
+                prefetcher.disk.writer.submit(lambda: None).result()
+                prefetcher.clear()
+                disk.append(median_time(lambda: (prefetcher.pixmap(path_a), prefetcher.pixmap(path_b)), 1))
+                memory = median_time(lambda: (prefetcher.pixmap(path_a), prefetcher.pixmap(path_b)), FRAMES)
+            finally:
+                prefetcher.shutdown()
+                shutil.rmtree(cache_dir, ignore_errors=True)
+        results[f"decode/{size}/cold_ms"] = sorted(cold)[len(cold) // 2] * 1000
+        results[f"decode/{size}/disk_ms"] = sorted(disk)[len(disk) // 2] * 1000
+        results[f"decode/{size}/memory_ms"] = memory * 1000
+    return results
+
+
+def run(full=False, directory=None):
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    sizes = FULL_IMAGE_SIZES if full else QUICK_IMAGE_SIZES
+    counts = FULL_POLYGON_COUNTS if full else QUICK_POLYGON_COUNTS
+    owned = directory is None
+    directory = directory or tempfile.mkdtemp(prefix="cd_bench_")
+    try:
+        results = bench_decode(directory, sizes)
+        results.update(bench_frames(directory, sizes, counts))
+    finally:
+        if owned:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in run("--full" in sys.argv[1:]).items():
+        print(f"{name:<40} {value:>10.2f}")
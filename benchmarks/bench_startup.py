@@ -0,0 +1,80 @@
+# 프로그램 시작 시간: 모듈 import 내역(-X importtime)과 창이 처음 그려질 때까지 걸린 시간
+# 사용법: python benchmarks/bench_startup.py
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import ROOT, setup_environment  # noqa: E402
+
+setup_environment()
+
+SCRIPT = "change_detection_v5"
+REPEAT = 3
+# 시작할 때 불러오지 않아야 하는 모듈 (다시 즉시 import되면 기준값 0에서 늘어나 회귀로 잡힘)
+DEFERRED = ("cv2", "pandas", "webbrowser", "registration", "mask_export", "concurrent.futures.process")
+
+
+def import_times():
+    """
+    python -X importtime -c "import change_detection_v5" 결과에서
+    {모듈 이름: 누적 시간(ms)} (change_detection_v5와 그 바로 아래에서 import한 모듈)
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {SCRIPT}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stderr
+    times = {}
+    children = {}  # 마지막 최상위 모듈 이후 바로 아래 깊이에서 끝난 import (하위 모듈이 먼저 출력됨)
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # 머리글 줄
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        ms = int(cumulative) / 1000
+        if name in DEFERRED:
+            times[name] = ms  # 어디서 불렸든 기록
+        if depth == 1:
+            children[name] = ms
+        elif depth == 0:
+            if name == SCRIPT:
+                times.update(children)
+                times[name] = ms
+            children = {}
+    return times
+
+
+def window_time():
+    """
+    --startup-time으로 실행해 창이 처음 그려질 때까지의 시간 (프로그램이 출력한 값, 전체 프로세스 시간) (ms)
+    """
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, os.path.join(ROOT, SCRIPT + ".py"), "--startup-time"],
+                            cwd=ROOT, capture_output=True, text=True, check=True, timeout=120).stdout
+    process = (time.perf_counter() - start) * 1000
+    for line in output.splitlines():
+        if line.startswith("startup "):
+            return float(line.split()[1]), process
+    raise RuntimeError(f"--startup-time output not found: {output!r}")
+
+
+def run(full=False):
+    runs = [import_times() for _ in range(REPEAT)]
+    windows = sorted(window_time() for _ in range(REPEAT))
+    median = REPEAT // 2
+    results = {
+        'startup/import_ms': sorted(r.get(SCRIPT, 0.0) for r in runs)[median],
+        'startup/window_ms': sorted(w[0] for w in windows)[median],
+        'startup/process_ms': sorted(w[1] for w in windows)[median],
+    }
+    names = set().union(*runs) | set(DEFERRED)
+    for name in sorted(names - {SCRIPT}):
+        results[f"startup/import/{name}_ms"] = sorted(r.get(name, 0.0) for r in runs)[median]
+    return results
+
+
+if __name__ == "__main__":
+    for name, value in sorted(run().items(), key=lambda item: -item[1]):
+        print(f"{name:<50} {value:>10.1f}")
@@ -0,0 +1,114 @@
+# 전체 벤치마크를 실행하고 저장된 기준값(baseline.json)과 비교 (GPU/디스플레이 없는 리눅스에서 실행 가능)
+# 사용법: python benchmarks/run_benchmarks.py [--full] [--only render,editing,label_io,startup]
+#                                            [--tolerance 1.5] [--output 결과.json] [--update-baseline]
+import argparse
+import json
+import os
+import platform
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from synthetic import FULL_POLYGON_COUNTS, QUICK_POLYGON_COUNTS, setup_environment  # noqa: E402
+
+setup_environment()
+import bench_editing  # noqa: E402
+import bench_label_io  # noqa: E402
+import bench_render  # noqa: E402
+import bench_startup  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+TOLERANCE = 1.5  # 기준값보다 이 배수 이상 느리거나 크면 회귀로 판정
+# 측정 잡음으로 판정하지 않도록 단위별 최소 차이 (이보다 작게 늘어난 것은 무시)
+MIN_DIFF = {'ms': 2.0, 'bytes': 64 * 1024, 'kb': 64.0}
+# 기준값과 관계없이 넘으면 실패로 보는 절대 상한 (이름의 마지막 부분 -> ms). 휠 확대/축소 중에도 30fps 유지
+FRAME_BUDGET_MS = {'zoom_ms': 1000 / 30}
+
+SUITES = {
+    'label_io': lambda full: bench_label_io.run(FULL_POLYGON_COUNTS if full else QUICK_POLYGON_COUNTS),
+    'render': lambda full: bench_render.run(full),
+    'editing': lambda full: bench_editing.run(full),
+    'startup': lambda full: bench_startup.run(full),
+}
+
+
+def unit_of(name):
+    # 'render/1024/10/idle_ms' -> 'ms', 'undo/10/bytes' -> 'bytes'
+    return name.rsplit('/', 1)[-1].rsplit('_', 1)[-1]
+
+
+def over_budget(name, value):
+    budget = FRAME_BUDGET_MS.get(name.rsplit('/', 1)[-1])
+    return budget is not None and value > budget
+
+
+def compare(results, baseline, tolerance):
+    """
+    [(이름, 값, 기준값 또는 None, 비율 또는 None, 회귀 여부), ...] (프레임 예산을 넘어도 회귀)
+    """
+    rows = []
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            rows.append((name, value, None, None, over_budget(name, value)))
+            continue
+        ratio = value / base if base else float('inf') if value else 1.0
+        regressed = ratio > tolerance and value - base > MIN_DIFF.get(unit_of(name), 0)
+        rows.append((name, value, base, ratio, regressed or over_budget(name, value)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="change detection 벤치마크")
+    parser.add_argument("--full", action="store_true", help="20000x20000 영상과 폴리곤 50000개까지 측정")
+    parser.add_argument("--only", default="", help="실행할 묶음 (쉼표 구분): " + ", ".join(SUITES))
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--output", help="측정 결과를 JSON으로 저장")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    names = [n for n in args.only.split(",") if n] or list(SUITES)
+    results = {}
+    for name in names:
+        print(f"[{name}] 측정 중...", flush=True)
+        results.update(SUITES[name](args.full))
+
+    mode = 'full' if args.full else 'quick'
+    stored = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    baseline = stored.get(mode, {}).get('results', {})
+
+    rows = compare(results, baseline, args.tolerance)
+    print(f"{'benchmark':<40} {'value':>12} {'baseline':>12} {'ratio':>7}")
+    for name, value, base, ratio, regressed in rows:
+        base_text = f"{base:>12.2f}" if base is not None else f"{'-':>12}"
+        ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+        mark = '  <-- 프레임 예산 초과' if over_budget(name, value) else '  <-- 회귀' if regressed else ''
+        print(f"{name:<40} {value:>12.2f} {base_text} {ratio_text}{mark}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+    if args.update_baseline:
+        # 다른 모드/묶음의 기준값은 그대로 두고 이번에 측정한 항목만 갱신
+        section = stored.setdefault(mode, {})
+        section['machine'] = f"{platform.platform()} / {platform.processor() or platform.machine()} / Python {platform.python_version()}"
+        section.setdefault('results', {}).update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=1, sort_keys=True)
+        print(f"기준값 저장: {args.baseline}")
+        return 0
+
+    regressions = [row[0] for row in rows if row[4]]
+    if not baseline:
+        print(f"{mode} 기준값이 없습니다. --update-baseline으로 먼저 저장하세요.")
+    if regressions:
+        print(f"회귀 {len(regressions)}개 (허용 배수 {args.tolerance}, 확대/축소 프레임 상한 {FRAME_BUDGET_MS['zoom_ms']:.1f} ms)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# 벤치마크용 합성 데이터 (이미지 쌍, 폴리곤 라벨)와 헤드리스 실행 환경 설정
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PNG_MAX_SIZE = 4096  # 이보다 큰 영상은 PNG 대신 ENVI raw(메모리 매핑 경로)로 생성
+STRIP_ROWS = 1024  # 큰 영상을 나눠 만드는 행 수 (메모리 일정)
+
+QUICK_IMAGE_SIZES = [1024, 4096]
+FULL_IMAGE_SIZES = [1024, 4096, 20000]
+QUICK_POLYGON_COUNTS = [10, 1000, 10000]
+FULL_POLYGON_COUNTS = [10, 1000, 10000, 50000]
+
+
+def setup_environment():
+    """
+    GPU/디스플레이 없이 실행되도록 offscreen 플랫폼을 쓰고, 저널/디스크 캐시가
+    사용자의 ~/.change_detection을 건드리지 않도록 HOME을 임시 폴더로 바꿈.
+    앱 모듈을 import하기 전에 호출해야 함 (여러 번 호출해도 한 번만 적용)
+    """
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if "CHANGE_DETECTION_BENCH_HOME" not in os.environ:
+        home = tempfile.mkdtemp(prefix="cd_bench_home_")
+        os.environ["CHANGE_DETECTION_BENCH_HOME"] = home
+        os.environ["HOME"] = home
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+def image_rows(size, y0, y1, seed=0, changed=False):
+    """
+    size x size 합성 위성영상의 [y0, y1) 행 (BGR uint8). 완만한 밝기 변화 + 블록 무늬 + 잡음이라
+    PNG 압축률이 실제 영상과 비슷하고, changed=True면 같은 자리에 밝은 사각형(변화 영역)이 생김
+    """
+    rng = np.random.default_rng(seed * 100003 + y0)
+    y = np.arange(y0, y1, dtype=np.int32)[:, None]
+    x = np.arange(size, dtype=np.int32)[None, :]
+    rows = np.empty((y1 - y0, size, 3), np.uint8)
+    rows[:, :, 0] = (x * 255 // size + (y // 64 + x // 64) % 2 * 24) % 256
+    rows[:, :, 1] = (y * 255 // size + (x // 16) % 7 * 9) % 256
+    rows[:, :, 2] = ((x + y) * 127 // size + 64) % 256
+    rows += rng.integers(0, 16, rows.shape, dtype=np.uint8)
+    if changed:
+        cell = max(64, size // 16)
+        mask = ((y // cell) % 3 == 1) & ((x // cell) % 4 == 2)
+        rows[mask] = 230
+    return rows
+
+
+def write_image(path, size, seed=0, changed=False):
+    """
+    PNG(size <= PNG_MAX_SIZE) 또는 ENVI raw(.raw + .hdr, BIP)로 저장하고 실제 경로 반환
+    """
+    if size <= PNG_MAX_SIZE:
+        path = os.path.splitext(path)[0] + ".png"
+        cv2.imencode(".png", image_rows(size, 0, size, seed, changed))[1].tofile(path)
+        return path
+    path = os.path.splitext(path)[0] + ".raw"
+    with open(path, 'wb') as f:
+        for y0 in range(0, size, STRIP_ROWS):
+            f.write(image_rows(size, y0, min(size, y0 + STRIP_ROWS), seed, changed).tobytes())
+    with open(os.path.splitext(path)[0] + ".hdr", 'w') as f:
+        f.write(f"ENVI\nsamples = {size}\nlines = {size}\nbands = 3\ndata type = 1\n"
+                f"interleave = bip\nbyte order = 0\n")
+    return path
+
+
+def make_pair(directory, size, seed=0):
+    """
+    <directory>/A/pair_<size>, <directory>/B/pair_<size> 이미지 쌍 생성 (이미 있으면 재사용)
+    """
+    paths = []
+    for name, changed in (("A", False), ("B", True)):
+        folder = os.path.join(directory, name)
+        os.makedirs(folder, exist_ok=True)
+        stem = os.path.join(folder, f"pair_{size}")
+        existing = [stem + ext for ext in (".png", ".raw") if os.path.exists(stem + ext)]
+        paths.append(existing[0] if existing else write_image(stem, size, seed, changed))
+    return tuple(paths)
+
+
+def make_polys(count, size, seed=0):
+    """
+    size x size 영상 안에 흩어진 꼭짓점 4~40개짜리 볼록한 폴리곤 count개
+    """
+    rng = np.random.default_rng(seed)
+    radius = max(4.0, size / 60)
+    polys = []
+    for _ in range(count):
+        n = int(rng.integers(4, 41))
+        cx, cy = rng.random(2) * size
+        angles = np.sort(rng.random(n)) * 2 * np.pi
+        r = radius * (0.5 + rng.random(n) * 0.5)
+        points = np.empty(n * 2)
+        points[0::2] = np.clip(cx + r * np.cos(angles), 0, size - 1)
+        points[1::2] = np.clip(cy + r * np.sin(angles), 0, size - 1)
+        polys.append({'points': points.tolist(), 'class': int(rng.integers(1, 6))})
+    return polys
+
+
+def median_time(func, repeat):
+    """
+    func를 repeat번 실행한 시간의 중앙값(초)
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return sorted(times)[len(times) // 2]
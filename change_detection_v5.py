@@ -1,23 +1,38 @@
 # Change detection tool 폴리곤 작업
-import pandas as pd
-import cv2
+import time
+STARTED = time.perf_counter()  # 시작 시간 측정 기준 (--startup-time)
 import numpy as np
 import os
 import sys
+import threading
 import traceback
+from collections import deque
 from PyQt5.QtCore import (
-    Qt, QPoint, QEvent, QTimer, QStringListModel
+    Qt, QPoint, QRect, QSize, QEvent, QTimer, QStringListModel, QThread, pyqtSignal
 )
 from PyQt5.QtGui import (
-    QPainter, QPen, QColor, QBrush, QPolygon, QPixmap, QIntValidator, QCursor, QMouseEvent, QFont, QImage
+    QPainter, QPen, QColor, QBrush, QPolygon, QPixmap, QRegion, QIcon, QIntValidator, QCursor, QMouseEvent, QFont, QImage
 )
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QAction, QMessageBox, QPushButton,
-    QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, QListView, QInputDialog,
-    QFileDialog, QMenu, QFontDialog, QSplitter
+    QLabel, QLineEdit, QHBoxLayout, QVBoxLayout, QListView, QInputDialog, QTableView, QAbstractItemView,
+    QFileDialog, QMenu, QFontDialog, QSplitter, QProgressBar, QComboBox, QSlider
 )
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
-import webbrowser
+from tile_renderer import SCALED_MAX_PIXELS, CachedLayer, TileCache, TilePyramid, raster_region, scale_region
+from image_decoder import decode_qimage
+from image_prefetch import ImagePrefetcher
+from image_cache import CACHE_BYTES
+from polygon_store import PolygonStore, point_in_polygon, to_qpolygonf
+from undo_history import HistoryManager
+from label_io import label_csv_path, read_label_file, write_label_file
+from label_journal import LabelJournal, journal_path
+from label_store import ProjectStore, VersionConflict
+from polygon_simplify import METHOD_NAMES, METHODS, simplify_points, simplify_polys
+from change_proposal import ProposalEngine
+from pair_index import PairIndex, PairTableModel
+from raster_source import RasterSource
+from profiler import PROFILER, profiled
 
 # 전역 예외 처리기
 def exception_hook(exctype, value, tb):
@@ -28,11 +43,19 @@ def exception_hook(exctype, value, tb):
 
 sys.excepthook = exception_hook
 
+FRAME_INTERVAL_MS = 16  # 다시 그리기 요청을 모아서 처리하는 간격 (약 60fps)
+FRAME_OVERLAY_RECT = QRect(8, 8, 300, 22)  # 프레임 시간 표시 영역
+PROFILE_OVERLAY_RECT = QRect(8, 8, 520, 300)  # 계측 표시 영역 (프레임 시간 + 구간별 백분위 + 캐시 적중률)
+PROFILE_REFRESH_S = 0.25  # 계측 표시 문구를 다시 계산하는 간격
+# 오버레이에 이보다 많은 폴리곤이 보이면(크게 축소한 상태) 외곽선을 1픽셀로 그림 (굵은 선 계산이 그리기 시간 대부분)
+OUTLINE_DETAIL_POLYGONS = 2000
+
 class ImageBox(QWidget):
     def __init__(self):
         super(ImageBox, self).__init__()
 
-        # 라벨 리스트
+        # 라벨 리스트 (좌표는 geometry에 numpy 배열로 펼쳐 보관)
+        self.geometry = PolygonStore()
         self.poly_list = []
 
         # 이미지 관련 변수들
@@ -44,7 +67,24 @@ class ImageBox(QWidget):
 
         # 원본 및 스케일된 이미지
         self.img = None
-        self.imgB = None  # QPixmap 형식
+        self.imgB = None  # QPixmap 형식 (타일로 그릴 큰 영상은 배열을 감싼 QImage, 래스터는 RasterSource)
+
+        # 대용량 영상용 타일 피라미드 (A/B가 하나의 타일 캐시를 공유)
+        self.tile_cache = TileCache()
+        self.pyramid = None
+        self.pyramidB = None
+        self.level_store = None  # 경로 -> 피라미드 레벨 디스크 캐시 (메인 윈도우가 설정)
+
+        # 현재 배율로 확대/축소해 둔 A/B 영상과 폴리곤 오버레이 (이동 시에는 복사만 함)
+        self.scaled_a = CachedLayer()
+        self.scaled_b = CachedLayer()
+        self.overlay = CachedLayer()
+        # 휠 입력이 이어지는 동안은 빠른 보간으로 그리고, 멈추면 부드러운 보간으로 다시 그림
+        self.zooming = False
+        self.zoom_timer = QTimer(self)
+        self.zoom_timer.setSingleShot(True)
+        self.zoom_timer.setInterval(150)
+        self.zoom_timer.timeout.connect(self.finish_zoom)
 
         # 상태 플래그들
         self.start_pos = None
@@ -58,9 +98,19 @@ class ImageBox(QWidget):
         self.is_tempB = False
         self.is_closed = False
 
+        # A/B 비교 방식: 'swap'(전환), 'swipe'(분할선), 'side'(나란히), 'blend'(투명도 혼합)
+        self.compare_mode = 'swap'
+        self.swipe_ratio = 0.5  # 분할선 위치 (위젯 너비 대비)
+        self.blend_alpha = 0.5  # 위에 겹치는 영상의 불투명도
+        self.is_swiping = False
+
         # 추가 변수들
         self.current_class = 1  # 기본 클래스 번호
         self.selected_poly_index = -1  # 선택된 폴리곤 없음
+        self.hover_poly_index = -1  # 커서 아래 폴리곤 없음
+
+        # A/B 차이로 찾은 변화 후보 (poly_list와 같은 dict 형식, 별도 오버레이로 표시)
+        self.proposals = []
 
         # 키보드 이벤트 수신 가능하도록 설정
         self.setFocusPolicy(Qt.ClickFocus)
@@ -68,115 +118,464 @@ class ImageBox(QWidget):
         # 라인 언두/리두 스택
         self.line_redo_stack = []
 
-    def set_image(self):
+        # 다시 그릴 영역을 모아 두었다가 프레임마다 한 번만 update
+        self.pending_region = QRegion()
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self.frame_timer.timeout.connect(self.flush_frame)
+
+        # 디버그용 프레임 시간 표시
+        self.show_frame_time = False
+        self.frame_times = deque(maxlen=120)  # (끝난 시각, 그리는 데 걸린 시간(초))
+        # 계측 표시 (켜져 있을 때만 PROFILER가 기록함)
+        self.show_profile = False
+        self.profile_lines = []
+        self.profile_updated = 0.0
+
+    def set_image(self, pixmap=None):
         """
         이미지를 설정하고 위젯 크기를 이미지 크기에 맞게 조정
+        (미리 디코딩된 pixmap이 주어지면 디코딩을 생략)
         """
         try:
-            img_array = np.fromfile(self.path, np.uint8)  # 한글 경로 문제로 우회.
-            img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)  # 3채널만 읽어서,
-            img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)  # RGB 순서로
-            height, width, channel = img.shape
-            bytesPerLine = 3 * width
-            qimg = QImage(img, width, height, bytesPerLine, QImage.Format_RGB888)
-            self.img = QPixmap(qimg)
-        except:
-            self.img = QPixmap(self.path)
+            # 디코딩/래스터 열기 실패도 여기서 경고로 처리
+            if pixmap is None:
+                pixmap = decode_qimage(self.path)
+                # 큰 영상은 전체 QPixmap을 만들지 않고 타일 피라미드가 필요한 부분만 변환
+                if not TilePyramid.wants_tiles(pixmap):
+                    pixmap = QPixmap.fromImage(pixmap)
+            self.img = pixmap
 
-        try:
             # 이미지 초기화 및 크기 설정
             self.w = self.img.width()
             self.h = self.img.height()
+            self.pyramid = self.make_pyramid(self.img, self.pyramid, self.path)
 
             # 위젯 크기 조정
             self.setMinimumSize(800, 800)
 
             self.point = QPoint(0, 0)
-            self.repaint()
+            self.schedule()
         except Exception as e:
             print(f"set_image 오류: {e}")
             QMessageBox.warning(self, "오류", f"이미지 설정 실패: {e}")
 
     def paintEvent(self, e):
         """
-        페인트 이벤트 수신
+        페인트 이벤트 수신 (e.rect()로 받은 손상 영역만 다시 그림)
         """
         try:
+            start = time.perf_counter()
             # 이미지 그리기
             if self.img:
                 painter = QPainter()
                 painter.begin(self)
-                if self.is_tempB and self.imgB:
-                    painter.drawPixmap(int(self.point.x()), int(self.point.y()), int(self.w), int(self.h), self.imgB)
-                else:
-                    painter.drawPixmap(int(self.point.x()), int(self.point.y()), int(self.w), int(self.h), self.img)
-
-                # 완성된 폴리곤 그리기
-                for index, poly_dict in enumerate(self.poly_list):
-                    p = poly_dict['points']
-                    class_number = poly_dict['class']
-                    # 클래스 번호에 따른 펜 색상 설정
-                    pen = QPen(self.get_class_color(class_number))
-                    pen.setWidth(3)
-                    if index == self.selected_poly_index:
-                        pen.setWidth(5)  # 선택된 폴리곤 강조
-                    painter.setPen(pen)
-                    brush = QBrush(self.get_class_color(class_number, alpha=50))
-                    painter.setBrush(brush)
-                    poly = QPolygon()
-                    num = int(len(p) / 2)
-                    for i in range(num):
-                        x, y = self.get_absolute_coor([[p[i * 2], p[i * 2 + 1]]])
-
-                        # NaN 체크: 좌표가 NaN일 경우 건너뛰기
-                        if np.isnan(x) or np.isnan(y):
-                            continue
-
-                        poly.append(QPoint(int(x), int(y)))
-                    painter.drawPolygon(poly)
-
-                # 미완성된 선 그리기
-                if self.is_drawing and self.pos and self.line:
-                    # 현재 클래스에 따른 펜 색상 설정
-                    pen = QPen(self.get_class_color(self.current_class))
-                    pen.setWidth(3)
-                    painter.setPen(pen)
-                    aaa = self.pos.x()
-                    bbb = self.pos.y()
-
-                    # 시작점 표시
-                    aaa_start, bbb_start = self.get_absolute_coor([[self.line[0], self.line[1]]])
-                    painter.setBrush(Qt.NoBrush)
-                    painter.drawEllipse(QPoint(int(aaa_start), int(bbb_start)), 5, 5)  # 시작점 표시
-
-                    if self.is_closed:
-                        aaa, bbb = self.get_absolute_coor([[self.line[0], self.line[1]]])
-                        painter.drawEllipse(QPoint(int(aaa), int(bbb)), 15, 15)
-
-                    # 기존 선들 그리기
-                    num = int(len(self.line) / 2)
-                    if num > 1:
-                        for i in range(num - 1):
-                            x1, y1, x2, y2 = self.get_absolute_coor([[
-                                self.line[2 * i], self.line[2 * i + 1]],
-                                [self.line[2 * (i + 1)], self.line[2 * (i + 1) + 1]]
-                            ])
-
-                            # NaN 체크: 좌표가 NaN일 경우 건너뛰기
-                            if np.isnan(x1) or np.isnan(y1) or np.isnan(x2) or np.isnan(y2):
-                                continue
-
-                            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
-                    # 마지막 선 그리기
-                    if self.pos:
-                        x1, y1 = self.get_absolute_coor([[self.line[-2], self.line[-1]]])
-                        painter.drawLine(int(x1), int(y1), int(aaa), int(bbb))
-
+                damaged = e.rect()
+                # 나란히 보기에서는 두 창에 같은 위치/배율로 A와 B를 그림
+                for pane, offset in enumerate(self.pane_offsets()):
+                    pane_rect = QRect(offset, 0, self.pane_width(), self.height()).intersected(damaged)
+                    if pane_rect.isEmpty():
+                        continue
+                    view = pane_rect.translated(-offset, 0)
+                    painter.save()
+                    painter.setClipRect(pane_rect)
+                    painter.translate(offset, 0)
+                    self.draw_background(painter, pane, view)
+                    self.draw_overlays(painter, view)
+                    painter.restore()
+
+                if self.compare_mode == 'swipe' and self.imgB:
+                    # 분할선
+                    x = self.swipe_x()
+                    painter.setPen(QPen(QColor(255, 255, 255), 2))
+                    painter.drawLine(x, 0, x, self.height())
+                    painter.setBrush(QBrush(QColor(255, 255, 255)))
+                    painter.drawEllipse(QPoint(x, self.height() // 2), 6, 6)
+
+                if self.show_profile:
+                    self.draw_profile(painter)
+                elif self.show_frame_time:
+                    self.draw_frame_time(painter)
                 painter.end()
-            self.bigbox.set_list()
+            end = time.perf_counter()
+            self.frame_times.append((end, end - start))
+            if PROFILER.enabled:
+                PROFILER.record('paintEvent', start, end - start)
         except Exception as e:
             print(f"paintEvent 오류: {e}")
 
+    def frame_time_text(self):
+        if not self.frame_times:
+            return ""
+        now = time.perf_counter()
+        durations = [d for _, d in self.frame_times]
+        fps = sum(1 for t, _ in self.frame_times if now - t <= 1.0)
+        return (f"paint {durations[-1] * 1000:.1f} ms  avg {sum(durations) / len(durations) * 1000:.1f} ms  "
+                f"{fps} fps")
+
+    def draw_frame_time(self, painter):
+        """
+        최근 프레임의 그리기 시간과 초당 프레임 수를 왼쪽 위에 표시
+        """
+        text = self.frame_time_text()
+        if not text:
+            return
+        painter.fillRect(FRAME_OVERLAY_RECT, QColor(0, 0, 0, 160))
+        painter.setPen(QColor(255, 255, 255))
+        painter.drawText(FRAME_OVERLAY_RECT.adjusted(6, 0, 0, 0), Qt.AlignVCenter | Qt.AlignLeft, text)
+
+    def draw_profile(self, painter):
+        """
+        프레임 시간 아래에 구간별 p50/p95/p99와 캐시 적중률 표시
+        (백분위 계산은 PROFILE_REFRESH_S마다 한 번만 해서 표시 자체가 프레임 시간을 늘리지 않도록 함)
+        """
+        now = time.perf_counter()
+        if now - self.profile_updated >= PROFILE_REFRESH_S:
+            self.profile_updated = now
+            summary = PROFILER.summary()
+            lines = [f"{'section (ms)':<22}{'n':>6}{'last':>8}{'p50':>8}{'p95':>8}{'p99':>8}"]
+            for name, s in sorted(summary['sections'].items()):
+                lines.append(f"{name:<22}{s['count']:>6}{s['last_ms']:>8.1f}{s['p50_ms']:>8.1f}"
+                             f"{s['p95_ms']:>8.1f}{s['p99_ms']:>8.1f}")
+            for name, c in sorted(summary['caches'].items()):
+                lines.append(f"{name + ' hit':<22}{c['hits'] + c['misses']:>6}{c['hit_rate'] * 100:>7.0f}%")
+            self.profile_lines = lines
+        painter.fillRect(PROFILE_OVERLAY_RECT, QColor(0, 0, 0, 170))
+        painter.setPen(QColor(255, 255, 255))
+        painter.setFont(QFont("Monospace", 8))
+        text = "\n".join([self.frame_time_text()] + self.profile_lines)
+        painter.drawText(PROFILE_OVERLAY_RECT.adjusted(6, 4, -4, -4), Qt.AlignTop | Qt.AlignLeft, text)
+
+    def draw_background(self, painter, pane, view):
+        """
+        비교 방식에 맞게 A/B 영상을 view(창 좌표) 영역만 그림.
+        is_tempB가 켜져 있으면 A와 B의 자리를 바꿈
+        """
+        layer_a = (self.img, self.pyramid, self.scaled_a)
+        layer_b = (self.imgB, self.pyramidB, self.scaled_b)
+        if self.compare_mode == 'swap' or not self.imgB:
+            self.draw_image(painter, *(layer_b if self.is_tempB and self.imgB else layer_a), view)
+            return
+        first, second = (layer_b, layer_a) if self.is_tempB else (layer_a, layer_b)
+        if self.compare_mode == 'side':
+            self.draw_image(painter, *(second if pane else first), view)
+        elif self.compare_mode == 'swipe':
+            x = self.swipe_x()
+            halves = (QRect(0, 0, x, self.height()), QRect(x, 0, self.width() - x, self.height()))
+            for half, layer in zip(halves, (first, second)):
+                rect = view.intersected(half)
+                if not rect.isEmpty():
+                    painter.save()
+                    painter.setClipRect(rect, Qt.IntersectClip)
+                    self.draw_image(painter, *layer, rect)
+                    painter.restore()
+        elif self.compare_mode == 'blend':
+            self.draw_image(painter, *first, view)
+            painter.save()
+            painter.setOpacity(self.blend_alpha)
+            self.draw_image(painter, *second, view)
+            painter.restore()
+
+    def draw_overlays(self, painter, view):
+        """
+        폴리곤, 변화 후보, 그리는 중인 선을 그림
+        """
+        # 완성된 폴리곤은 오버레이 레이어에 그려 두고, 폴리곤/배율이 바뀔 때만 다시 그림
+        # (선택/호버 강조는 레이어 위에 따로 그려서 마우스를 움직여도 레이어를 다시 그리지 않음)
+        self.geometry.sync(self.poly_list)
+        need = view.translated(-self.point)
+        key = (self.geometry.version, self.scale)
+        hit = self.overlay.covers(key, need)
+        if PROFILER.enabled:
+            PROFILER.count('overlay_layer', hit)
+        if not hit and self.zooming and self.overlay.pixmap is not None and self.overlay.key[0] == key[0]:
+            # 휠을 굴리는 동안은 영상 레이어처럼 마지막 오버레이를 늘려서 보여주고, finish_zoom에서 한 번 다시 그림
+            self.overlay.blit_scaled(painter, self.point, need, self.scale / self.overlay.key[1])
+        elif not hit:
+            # 창 크기의 절반만큼 여유를 두어 이동 중에는 다시 그리지 않음
+            pane = QRect(0, 0, self.pane_width(), self.height()).translated(-self.point)
+            region = pane.adjusted(-pane.width() // 2, -pane.height() // 2,
+                                   pane.width() // 2, pane.height() // 2).united(need)
+            layer = QPixmap(region.size())
+            layer.fill(Qt.transparent)
+            layer_painter = QPainter(layer)
+            layer_painter.translate(-region.topLeft())
+            self.draw_polygons(layer_painter, region)
+            layer_painter.end()
+            self.overlay.store(key, region, layer)
+            self.overlay.blit(painter, self.point, need)
+        else:
+            self.overlay.blit(painter, self.point, need)
+        self.draw_highlights(painter)
+
+        # 변화 후보 그리기 (점선, 채우기 없음)
+        if self.proposals:
+            pen = QPen(QColor(255, 0, 255), 2, Qt.DashLine)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            origin = np.array([self.point.x(), self.point.y()], np.float64)
+            for proposal in self.proposals:
+                pts = np.asarray(proposal['points'], np.float64).reshape(-1, 2) * self.scale + origin
+                painter.drawPolygon(to_qpolygonf(pts))
+
+        # 미완성된 선 그리기
+        if self.is_drawing and self.pos and self.line:
+            # 현재 클래스에 따른 펜 색상 설정
+            pen = QPen(self.get_class_color(self.current_class))
+            pen.setWidth(3)
+            painter.setPen(pen)
+            aaa = self.pos.x()
+            bbb = self.pos.y()
+
+            # 시작점 표시
+            aaa_start, bbb_start = self.get_absolute_coor([[self.line[0], self.line[1]]])
+            painter.setBrush(Qt.NoBrush)
+            painter.drawEllipse(QPoint(int(aaa_start), int(bbb_start)), 5, 5)  # 시작점 표시
+
+            if self.is_closed:
+                aaa, bbb = self.get_absolute_coor([[self.line[0], self.line[1]]])
+                painter.drawEllipse(QPoint(int(aaa), int(bbb)), 15, 15)
+
+            # 기존 선들 그리기
+            num = int(len(self.line) / 2)
+            if num > 1:
+                for i in range(num - 1):
+                    x1, y1, x2, y2 = self.get_absolute_coor([[
+                        self.line[2 * i], self.line[2 * i + 1]],
+                        [self.line[2 * (i + 1)], self.line[2 * (i + 1) + 1]]
+                    ])
+
+                    # NaN 체크: 좌표가 NaN일 경우 건너뛰기
+                    if np.isnan(x1) or np.isnan(y1) or np.isnan(x2) or np.isnan(y2):
+                        continue
+
+                    painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+            # 마지막 선 그리기
+            if self.pos:
+                x1, y1 = self.get_absolute_coor([[self.line[-2], self.line[-1]]])
+                painter.drawLine(int(x1), int(y1), int(aaa), int(bbb))
+
+    def draw_polygons(self, painter, region):
+        """
+        region(배율 좌표계)과 겹치는 완성된 폴리곤을 영상 원점 기준으로 그림.
+        클래스별로 모아서 펜과 브러시는 클래스마다 한 번만 만듦
+        """
+        # 영역에 보이는 폴리곤만 공간 인덱스로 골라서 그림
+        rows = np.asarray(self.geometry.visible_rows(*self.visible_image_rect(region.translated(self.point))),
+                          np.int64)
+        if not len(rows):
+            return
+        classes = self.geometry.classes[rows]
+        width = 3 if len(rows) <= OUTLINE_DETAIL_POLYGONS else 1
+        for class_number in sorted(set(classes.tolist())):
+            pen = QPen(self.get_class_color(class_number))
+            pen.setWidth(width)
+            painter.setPen(pen)
+            painter.setBrush(QBrush(self.get_class_color(class_number, alpha=50)))
+            for index in rows[classes == class_number].tolist():
+                painter.drawPolygon(self.geometry.scaled_polygon(index, self.scale))
+
+    def draw_highlights(self, painter):
+        """
+        호버/선택된 폴리곤을 오버레이 위에 굵게 다시 그림 (선택이 호버보다 위)
+        """
+        painter.save()
+        painter.translate(self.point)
+        for index in dict.fromkeys((self.hover_poly_index, self.selected_poly_index)):
+            if not 0 <= index < len(self.geometry):
+                continue
+            class_number = int(self.geometry.classes[index])
+            hovered = index == self.hover_poly_index
+            pen = QPen(self.get_class_color(class_number))
+            pen.setWidth(5 if index == self.selected_poly_index else 4)  # 선택된 폴리곤 강조
+            painter.setPen(pen)
+            # 레이어에 이미 알파 50으로 칠해져 있으므로 호버는 50을 한 번 더 겹쳐 약 90이 되게 함
+            painter.setBrush(QBrush(self.get_class_color(class_number, alpha=50)) if hovered else Qt.NoBrush)
+            painter.drawPolygon(self.geometry.scaled_polygon(index, self.scale))
+        painter.restore()
+
+    @property
+    def poly_list(self):
+        return self._poly_list
+
+    @poly_list.setter
+    def poly_list(self, value):
+        # 리스트가 통째로 바뀌면 좌표 배열도 다시 구성
+        self._poly_list = value
+        self.geometry.invalidate()
+
+    def make_pyramid(self, pixmap, old, path=None):
+        """
+        이전 피라미드의 타일을 해제하고, 큰 영상일 때만 타일 피라미드 생성
+        (path가 주어지면 축소 레벨을 디스크 캐시에서 읽고 씀)
+        """
+        if old is not None:
+            old.release()
+        if isinstance(pixmap, RasterSource):
+            return None  # 메모리 매핑 영상은 보이는 창만 직접 읽음
+        if TilePyramid.wants_tiles(pixmap):
+            store = self.level_store(path) if self.level_store is not None and path else None
+            return TilePyramid(pixmap, self.tile_cache, store=store)
+        return None
+
+    def draw_image(self, painter, pixmap, pyramid, layer, view=None):
+        view = self.rect() if view is None else view
+        if pyramid is not None:
+            # 보이는 타일만 가장 가까운 해상도 레벨에서 그림
+            pyramid.draw(painter, self.point, self.w / pyramid.width, view)
+            return
+        # 현재 배율로 확대/축소해 둔 레이어에서 view와 겹치는 부분만 복사
+        w, h = max(1, int(self.w)), max(1, int(self.h))
+        bounds = QRect(0, 0, w, h)
+        need = view.translated(-self.point).intersected(bounds)
+        if need.isEmpty():
+            return
+        raster = isinstance(pixmap, RasterSource)
+        if raster:
+            key = (id(pixmap), pixmap.version, w, h, not self.zooming)
+        else:
+            key = (pixmap.cacheKey(), w, h, not self.zooming)
+        hit = layer.covers(key, need)
+        if PROFILER.enabled:
+            PROFILER.count('scaled_layer', hit)
+        if not hit:
+            if w * h <= SCALED_MAX_PIXELS:
+                region = bounds
+            else:
+                # 크게 확대된 경우 창 주변 여유 영역만 확대
+                pane = QRect(0, 0, self.pane_width(), self.height()).translated(-self.point)
+                region = pane.adjusted(-pane.width() // 2, -pane.height() // 2,
+                                       pane.width() // 2, pane.height() // 2).intersected(bounds).united(need)
+            render = raster_region if raster else scale_region
+            layer.store(key, *render(pixmap, w, h, region, smooth=not self.zooming))
+        layer.blit(painter, self.point, need)
+
+    def finish_zoom(self):
+        # 휠 입력이 멈추면 부드러운 보간으로 한 번 다시 그림
+        self.zooming = False
+        self.schedule()
+
+    def pane_width(self):
+        return self.width() // 2 if self.compare_mode == 'side' else self.width()
+
+    def pane_offsets(self):
+        return [0, self.pane_width()] if self.compare_mode == 'side' else [0]
+
+    def view_pos(self, pos):
+        """
+        위젯 좌표를 창 좌표로 변환 (나란히 보기의 오른쪽 창도 왼쪽 창과 같은 좌표계)
+        """
+        if self.compare_mode == 'side' and pos.x() >= self.pane_width():
+            return QPoint(pos.x() - self.pane_width(), pos.y())
+        return pos
+
+    def swipe_x(self):
+        return int(self.width() * self.swipe_ratio)
+
+    def set_compare_mode(self, mode):
+        self.compare_mode = mode
+        self.is_swiping = False
+        self.schedule()
+
+    def set_swipe_ratio(self, ratio):
+        """
+        분할선을 옮기고 이전/새 위치 사이의 띠만 다시 그림
+        """
+        old_x = self.swipe_x()
+        self.swipe_ratio = min(1.0, max(0.0, ratio))
+        new_x = self.swipe_x()
+        if new_x != old_x:
+            self.schedule(QRect(min(old_x, new_x) - 8, 0, abs(new_x - old_x) + 16, self.height()))
+
+    def set_blend_alpha(self, alpha):
+        self.blend_alpha = min(1.0, max(0.0, alpha))
+        self.schedule()
+
+    def schedule(self, rect=None):
+        """
+        rect(위젯 좌표, None이면 전체)를 다시 그릴 영역에 더하고 다음 프레임에 한 번만 그림
+        """
+        self.pending_region = self.pending_region.united(self.rect() if rect is None else rect)
+        # 프레임 시간 표시용 느린 갱신이 걸려 있어도 다음 프레임에 바로 그림
+        if not self.frame_timer.isActive() or self.frame_timer.remainingTime() > FRAME_INTERVAL_MS:
+            self.frame_timer.start(FRAME_INTERVAL_MS)
+
+    def schedule_view(self, rect):
+        """
+        창 좌표 rect를 모든 창(나란히 보기면 양쪽)에 대해 예약
+        """
+        if rect.isEmpty():
+            return
+        for offset in self.pane_offsets():
+            self.schedule(rect.translated(offset, 0))
+
+    def flush_frame(self):
+        region = self.pending_region
+        self.pending_region = QRegion()
+        if self.show_profile:
+            region = region.united(PROFILE_OVERLAY_RECT)
+            self.frame_timer.start(250)
+        elif self.show_frame_time:
+            region = region.united(FRAME_OVERLAY_RECT)
+            # 표시 중에는 계속 갱신해서 fps가 멈춰 보이지 않도록 함
+            self.frame_timer.start(250)
+        self.update(region)
+
+    def points_rect(self, points, margin=6):
+        """
+        영상 좌표 [x1, y1, ...]를 덮는 창 좌표 사각형 (선 두께만큼 여유)
+        """
+        pts = np.asarray(points, np.float64)
+        pts = pts[:len(pts) // 2 * 2].reshape(-1, 2)
+        pts = pts[~np.isnan(pts).any(axis=1)]
+        if len(pts) == 0:
+            return QRect()
+        x0, y0 = np.floor(pts.min(axis=0) * self.scale).astype(int) - margin
+        x1, y1 = np.ceil(pts.max(axis=0) * self.scale).astype(int) + margin
+        return QRect(int(x0), int(y0), int(x1 - x0) + 1, int(y1 - y0) + 1).translated(self.point)
+
+    def polygon_rect(self, row):
+        if 0 <= row < len(self.poly_list):
+            return self.points_rect(self.poly_list[row]['points'])
+        return QRect()
+
+    def rubber_band_rect(self, last_only=False):
+        """
+        그리는 중인 선(last_only면 마지막 꼭짓점~커서 구간만)과 시작점 표시 원을 덮는 창 좌표 사각형
+        """
+        if not self.line:
+            return QRect()
+        rect = self.points_rect(self.line[-2:] if last_only else self.line)
+        # 시작점 표시 원 (닫힘 표시는 반지름 15)
+        rect = rect.united(self.points_rect(self.line[:2], margin=18))
+        if self.pos is not None:
+            rect = rect.united(QRect(self.pos, self.pos).adjusted(-6, -6, 6, 6))
+        return rect
+
+    def set_selected(self, row):
+        """
+        선택된 폴리곤을 바꾸고 이전/새 폴리곤 영역만 다시 그림
+        """
+        damage = self.polygon_rect(self.selected_poly_index).united(self.polygon_rect(row))
+        self.selected_poly_index = row
+        self.schedule_view(damage)
+
+    def set_show_frame_time(self, checked):
+        self.show_frame_time = checked
+        self.frame_times.clear()
+        self.schedule(FRAME_OVERLAY_RECT)
+
+    def set_show_profile(self, checked):
+        """
+        계측을 켜고(기록을 새로 시작) 표시하거나, 끄고 표시를 지움
+        """
+        PROFILER.set_enabled(checked)
+        self.show_profile = checked
+        self.profile_updated = 0.0
+        self.frame_times.clear()
+        self.schedule(PROFILE_OVERLAY_RECT)
+
     def get_class_color(self, class_number, alpha=255):
         if class_number == 1:
             color = QColor(139, 69, 19, alpha)  # 갈색
@@ -192,6 +591,36 @@ class ImageBox(QWidget):
             color = QColor(0, 0, 0, alpha)  # 기본 검정색
         return color
 
+    def visible_image_rect(self, view=None):
+        """
+        창에 보이는 영역(또는 view 영역)을 영상 좌표 (x0, y0, x1, y1)로 변환
+        """
+        view = QRect(0, 0, self.pane_width(), self.height()) if view is None else view
+        x0 = (view.left() - self.point.x()) / self.scale
+        y0 = (view.top() - self.point.y()) / self.scale
+        return x0, y0, x0 + view.width() / self.scale, y0 + view.height() / self.scale
+
+    def polygon_at(self, pos):
+        """
+        화면 좌표 아래에 있는 폴리곤 인덱스, 없으면 -1
+        """
+        pos = self.view_pos(pos)
+        self.geometry.sync(self.poly_list)
+        return self.geometry.polygon_at((pos.x() - self.point.x()) / self.scale,
+                                        (pos.y() - self.point.y()) / self.scale)
+
+    def proposal_at(self, pos):
+        """
+        화면 좌표 아래에 있는 변화 후보 인덱스, 없으면 -1
+        """
+        pos = self.view_pos(pos)
+        x = (pos.x() - self.point.x()) / self.scale
+        y = (pos.y() - self.point.y()) / self.scale
+        for index, proposal in enumerate(self.proposals):
+            if point_in_polygon(np.asarray(proposal['points'], np.float64).reshape(-1, 2), x, y):
+                return index
+        return -1
+
     def get_absolute_coor(self, coord_list):
         abs_list = []
         for coor in coord_list:
@@ -205,17 +634,23 @@ class ImageBox(QWidget):
         마우스 이동 이벤트 처리
         """
         try:
+            # 분할선 끌기
+            if self.is_swiping:
+                self.set_swipe_ratio(e.pos().x() / max(1, self.width()))
+                return
             # 이미지 이동
             if self.is_left_clicked:
                 self.end_pos = e.pos() - self.start_pos
                 self.point = self.point + self.end_pos
                 self.start_pos = e.pos()
-                self.repaint()
+                self.schedule()
                 self.is_moving = True
 
             # 선 그리기 중 마우스 위치 기록
             if self.is_drawing:
-                self.pos = e.pos()
+                # 마지막 꼭짓점~커서 구간과 시작점 표시만 이전/새 위치 기준으로 다시 그림
+                damage = self.rubber_band_rect(last_only=True)
+                self.pos = self.view_pos(e.pos())
                 if len(self.line) >= 2:
                     x1 = self.point.x() + self.scale * self.line[0]
                     y1 = self.point.y() + self.scale * self.line[1]
@@ -223,7 +658,14 @@ class ImageBox(QWidget):
                         self.is_closed = True
                     else:
                         self.is_closed = False
-                self.repaint()
+                self.schedule_view(damage.united(self.rubber_band_rect(last_only=True)))
+            elif not self.is_left_clicked and self.img:
+                # 커서 아래 폴리곤 강조
+                hover = self.polygon_at(e.pos())
+                if hover != self.hover_poly_index:
+                    damage = self.polygon_rect(self.hover_poly_index).united(self.polygon_rect(hover))
+                    self.hover_poly_index = hover
+                    self.schedule_view(damage)
         except Exception as e:
             print(f"mouseMoveEvent 오류: {e}")
 
@@ -231,20 +673,30 @@ class ImageBox(QWidget):
         # 플래그 변경
         if e.button() == Qt.LeftButton:
             self.setFocus()
+            if self.compare_mode == 'swipe' and self.imgB and abs(e.pos().x() - self.swipe_x()) <= 6:
+                # 분할선 근처를 누르면 이미지 대신 분할선을 이동
+                self.is_swiping = True
+                return
             self.is_left_clicked = True
             self.start_pos = e.pos()
 
     def mouseReleaseEvent(self, e):
         try:
             # 플래그 변경
+            if e.button() == Qt.LeftButton and self.is_swiping:
+                self.is_swiping = False
+                return
             if e.button() == Qt.LeftButton:
                 self.is_left_clicked = False
+                if not self.is_moving and not self.is_drawing and e.modifiers() & Qt.ControlModifier:
+                    # Ctrl+클릭: 커서 아래 폴리곤 선택
+                    self.bigbox.select_polygon_row(self.polygon_at(e.pos()))
                 # 선 또는 점 기록
-                if not self.is_moving:
+                elif not self.is_moving:
                     # 절대 위치 계산
                     if self.img.width() != 0:
                         self.scale = self.w / self.img.width()
-                    absolute_position = e.pos() - self.point
+                    absolute_position = self.view_pos(e.pos()) - self.point
                     a = absolute_position / self.scale
 
                     # 선 그리기 시작 또는 종료
@@ -266,28 +718,23 @@ class ImageBox(QWidget):
 
     def update_line(self, abs, flag="draw"):
         try:
+            # 바뀌기 전/후의 선 영역만 다시 그림 (완성된 폴리곤도 이 영역 안에 있음)
+            damage = self.rubber_band_rect()
             if flag == "cancel":
                 self.line = []
                 self.line_redo_stack.clear()
                 self.is_drawing = False
-                self.repaint()
                 self.is_closed = False
             else:
                 if flag == "finish":
                     if len(self.line) > 4:
-                        # 현재 상태를 undo 스택에 저장
-                        self.bigbox.push_undo()
                         self.is_drawing = False
                         self.is_closed = False
-                        # 클래스 정보와 함께 폴리곤 저장
-                        self.poly_list.append({'points': self.line.copy(), 'class': self.current_class})
-                        self.repaint()
+                        # 클래스 정보와 함께 폴리곤 저장 (켜져 있으면 꼭짓점을 단순화해서)
+                        points = self.bigbox.simplify_drawn(self.line.copy())
+                        self.bigbox.add_polygon({'points': points, 'class': self.current_class})
                         self.line = []
                         self.line_redo_stack.clear()
-                        # 이미지 라벨 업데이트
-                        self.bigbox.image_labels[self.path] = self.poly_list.copy()
-                        # redo 스택 비우기
-                        self.bigbox.redo_stack.clear()
                     else:
                         # 점이 두 개 이하일 때 취소
                         self.update_line(None, "cancel")
@@ -300,7 +747,7 @@ class ImageBox(QWidget):
                         self.line.append(abs.y())
                         # 점 추가 시 redo 스택 초기화
                         self.line_redo_stack.clear()
-            self.repaint()
+            self.schedule_view(damage.united(self.rubber_band_rect()))
         except Exception as e:
             print(f"update_line 오류: {e}")
             QMessageBox.warning(self, "오류", f"선 업데이트 실패: {e}")
@@ -317,10 +764,11 @@ class ImageBox(QWidget):
             if self.is_drawing:
                 # Undo last point in self.line
                 if self.line:
+                    damage = self.rubber_band_rect()
                     # Save the last point for redo
                     self.line_redo_stack.append(self.line[-2:])
                     self.line = self.line[:-2]
-                    self.repaint()
+                    self.schedule_view(damage)
             else:
                 # Undo last completed polygon
                 self.bigbox.undo()
@@ -329,13 +777,14 @@ class ImageBox(QWidget):
                 if self.line_redo_stack:
                     # Redo last undone point
                     self.line.extend(self.line_redo_stack.pop())
-                    self.repaint()
+                    self.schedule_view(self.rubber_band_rect())
             else:
                 # Redo last undone polygon
                 self.bigbox.redo()
         else:
             super().keyPressEvent(event)
 
+    @profiled('wheelEvent')
     def wheelEvent(self, event):
         # 줌 인/아웃 기능 구현
         try:
@@ -351,32 +800,178 @@ class ImageBox(QWidget):
             # 이미지 크기 조정
             self.w = self.img.width() * self.scale
             self.h = self.img.height() * self.scale
-            self.repaint()
+            self.zooming = True
+            self.zoom_timer.start()
+            self.schedule()
         except Exception as e:
             print(f"wheelEvent 오류: {e}")
 
+class LabelSaveWorker(QThread):
+    """
+    변경된 이미지의 라벨만 백그라운드에서 저장하는 스레드
+    """
+    progress = pyqtSignal(int, int)  # (저장한 수, 전체 수)
+    failed = pyqtSignal(str, str)  # (이미지 경로, 오류 메시지)
+
+    def __init__(self, jobs, binary=False, store_path=None, versions=None):
+        super(LabelSaveWorker, self).__init__()
+        self.jobs = jobs  # [(이미지 경로, poly_list 스냅샷), ...]
+        self.binary = binary  # NPZ 바이너리 라벨도 함께 저장
+        # 프로젝트 저장소가 열려 있으면 CSV 대신 저장소에 씀 (versions: 이미지별로 읽었던 버전)
+        self.store_path = store_path
+        self.versions = versions or {}
+        self.failed_paths = []
+        self.saved = {}  # 이미지 경로 -> 저장 후 버전
+        self.conflicts = {}  # 이미지 경로 -> 다른 작업자가 먼저 저장한 버전
+
+    @profiled('save_worker')
+    def run(self):
+        # sqlite 연결은 만든 스레드에서만 쓸 수 있으므로 저장 스레드에서 따로 엶
+        store = ProjectStore(self.store_path) if self.store_path else None
+        try:
+            for done, (image_path, poly_list) in enumerate(self.jobs, 1):
+                try:
+                    if store is not None:
+                        self.saved[image_path] = store.save(image_path, poly_list, self.versions.get(image_path, 0))
+                    else:
+                        write_label_file(label_csv_path(image_path), poly_list, self.binary)
+                except VersionConflict as e:
+                    self.conflicts[image_path] = e.current
+                except Exception as e:
+                    self.failed_paths.append(image_path)
+                    self.failed.emit(image_path, str(e))
+                self.progress.emit(done, len(self.jobs))
+        finally:
+            if store is not None:
+                store.close()
+
+class MaskExportWorker(QThread):
+    """
+    image_labels 전체를 프로세스 풀에서 클래스/변화 마스크로 내보내는 스레드
+    """
+    progress = pyqtSignal(int, int)  # (처리한 수, 전체 수)
+    report = pyqtSignal(str)  # 완료 메시지
+
+    def __init__(self, jobs):
+        super(MaskExportWorker, self).__init__()
+        self.jobs = jobs
+
+    def run(self):
+        from mask_export import export_all  # 처음 내보낼 때 불러옴 (시작 시간 단축)
+        done, failed, images_per_sec, mpix_per_sec = export_all(
+            self.jobs, callback=lambda count, path, error: self.progress.emit(count, len(self.jobs)))
+        for image_path, error in failed:
+            print(f"export_masks 오류: {image_path}: {error}")
+        self.report.emit(f"마스크 {done - len(failed)}/{done}개 저장 ({images_per_sec:.2f} images/s, {mpix_per_sec:.1f} MPix/s)")
+
+class ProjectTransferWorker(QThread):
+    """
+    _Label.csv를 프로젝트 저장소로 일괄 가져오거나(image_paths가 있을 때) 저장소 라벨을 CSV로 내보내는 스레드
+    """
+    progress = pyqtSignal(int, int)  # (처리한 수, 전체 수)
+    report = pyqtSignal(str)  # 완료 메시지
+
+    def __init__(self, store_path, image_paths=None, overwrite=False, binary=False):
+        super(ProjectTransferWorker, self).__init__()
+        self.store_path = store_path
+        self.image_paths = image_paths
+        self.overwrite = overwrite
+        self.binary = binary
+
+    def run(self):
+        store = ProjectStore(self.store_path)
+        try:
+            if self.image_paths is not None:
+                count = store.import_csv(self.image_paths, self.overwrite, callback=self.progress.emit)
+                self.report.emit(f"라벨 {count}개 이미지를 프로젝트로 가져왔습니다.")
+            else:
+                count = store.export_csv(self.binary, callback=self.progress.emit)
+                self.report.emit(f"프로젝트 라벨 {count}개 이미지를 CSV로 내보냈습니다.")
+        except Exception as e:
+            print(f"ProjectTransferWorker 오류: {e}")
+            self.report.emit(f"프로젝트 라벨 가져오기/내보내기 실패: {e}")
+        finally:
+            store.close()
+
 class change_detection(QMainWindow):
+    registration_done = pyqtSignal(str, str)  # (B 경로, 정합된 B 경로 또는 '')
+
     def __init__(self, parent=None):
         super(change_detection, self).__init__(parent)
         self.temp_listA = []
         self.temp_listB = []
         self.image_labels = {}  # 이미지별 라벨 저장 딕셔너리
 
-        # Undo 및 Redo 스택
-        self.undo_stack = []
-        self.redo_stack = []
+        # 이미지별 Undo 및 Redo 기록 (바뀐 폴리곤만 저장)
+        self.history = HistoryManager()
+
+        # 주변 이미지 쌍 백그라운드 디코딩
+        self.prefetcher = ImagePrefetcher()
+        self.prefetcher.thumbnail_ready.connect(self.on_thumbnail_ready)
+
+        # 이미지 쌍을 불러올 때 백그라운드에서 변화 후보 계산
+        self.proposal_engine = ProposalEngine()
+        self.proposal_engine.ready.connect(self.on_proposals_ready)
+
+        # B 영상 정합 (import 시 프로세스 풀에서 계산, 결과는 디스크에 캐시)
+        self.aligned = {}  # B 경로 -> 정합된 B 경로
+        self.registration_pool = None
+        self.registration_done.connect(self.on_registration_done)
 
         # 선택된 이미지 경로를 저장하는 변수 추가
         self.selected_b_image_path = None  # Temporary B 리스트에서 선택된 이미지 경로
 
+        # 마지막 저장 이후 라벨이 바뀐 이미지 경로
+        self.dirty_labels = set()
+        self.save_worker = None
+        self.export_worker = None
+
+        # 여러 작업자가 함께 쓰는 프로젝트 저장소 (열려 있으면 라벨 CSV 대신 사용)
+        self.store = None
+        self.label_versions = {}  # 이미지 경로 -> 라벨을 읽을 때의 저장소 버전
+        self.transfer_worker = None
+
+        # 폴리곤 단순화 방법('dp' | 'vw')과 허용 오차(영상 픽셀)
+        self.simplify_options = {'method': 'dp', 'tolerance': 1.0}
+
+        # 비정상 종료 대비 편집 저널 (작업 폴더/프로젝트를 열 때 그 저널을 엶)
+        self.journal = None
+
         # 윈도우 크기 설정
         self.resize(int(1400*0.8), int(1100*0.8))
 
         importAct = QAction('Import', self, triggered=self.openimage)
-        saveAct = QAction('Save', self, triggered=self.savepoint)
+        # 폴더 두 개를 파일 이름으로 짝지어 불러오기 (대량 타일용)
+        folderAct = QAction('Import folders...', self, triggered=self.import_folders)
+        saveAct = QAction('Save', self, triggered=lambda: self.savepoint())
         saveAct.setShortcut('Ctrl+S')
         undoAct = QAction('Undo', self, triggered=self.undo)
         redoAct = QAction('Redo', self, triggered=self.redo)
+        # 저장 시 NPZ 바이너리 라벨도 함께 기록
+        self.binaryAct = QAction('Save binary labels (.npz)', self, checkable=True)
+        exportAct = QAction('Export masks', self, triggered=self.export_masks)
+        projectAct = QAction('Open project...', self, triggered=self.open_project)
+        self.projectImportAct = QAction('Import labels to project', self, triggered=self.import_project_labels)
+        self.projectExportAct = QAction('Export project labels', self, triggered=self.export_project_labels)
+        self.projectImportAct.setEnabled(False)
+        self.projectExportAct.setEnabled(False)
+        # 그리기를 마칠 때 거의 일직선인 꼭짓점을 줄임
+        self.simplifyAct = QAction('Simplify polygons on finish', self, checkable=True)
+        simplifyOptionsAct = QAction('Simplify settings...', self, triggered=self.set_simplify_options)
+        simplifyAllAct = QAction('Simplify all labels', self, triggered=self.simplify_all_labels)
+        self.proposalAct = QAction('Show change proposals', self, checkable=True)
+        self.proposalAct.setChecked(True)
+        self.proposalAct.toggled.connect(self.update_proposals)
+        self.registerAct = QAction('Register B to A', self, checkable=True)
+        self.registerAct.toggled.connect(self.on_registration_toggled)
+        # 디버그용 프레임 시간 표시
+        rasterAct = QAction('Raster bands...', self, triggered=self.set_raster_bands)
+        cacheAct = QAction('Cache settings...', self, triggered=self.set_cache_options)
+        self.frameTimeAct = QAction('Show frame time', self, checkable=True)
+        self.frameTimeAct.setShortcut('F12')
+        self.profileAct = QAction('Profiling overlay', self, checkable=True)
+        self.profileAct.setShortcut('Ctrl+F12')
+        exportProfileAct = QAction('Export profile...', self, triggered=self.export_profile)
         exitAct = QAction('Exit', self)
         exitAct.setShortcut('Ctrl+Q')
         exitAct.triggered.connect(self.close)
@@ -384,11 +979,11 @@ class change_detection(QMainWindow):
         bar = self.menuBar()
         file = bar.addMenu("File")
         help_menu = bar.addMenu("Help")
-        file.addActions([importAct, saveAct, undoAct, redoAct, exitAct])
+        file.addActions([importAct, folderAct, saveAct, self.binaryAct, exportAct, projectAct, self.projectImportAct, self.projectExportAct, self.simplifyAct, simplifyOptionsAct, simplifyAllAct, self.proposalAct, self.registerAct, rasterAct, cacheAct, undoAct, redoAct, self.frameTimeAct, self.profileAct, exportProfileAct, exitAct])
 
         # 웹 브라우저에서 URL을 여는 QAction
         url_act = QAction("URL : https://github.com/chartgod/Changedetection_labelingtool", self)
-        url_act.triggered.connect(lambda: webbrowser.open("https://github.com/chartgod/Changedetection_labelingtool"))
+        url_act.triggered.connect(self.open_homepage)
 
         help_menu.addAction("Question : dlgkstn68@naver.com, LEE-SEUNG-HEON")
         help_menu.addAction(url_act)
@@ -396,6 +991,9 @@ class change_detection(QMainWindow):
         self.box = ImageBox()
         self.box.setMouseTracking(True)
         self.box.bigbox = self
+        self.box.level_store = self.prefetcher.level_store
+        self.frameTimeAct.toggled.connect(self.box.set_show_frame_time)
+        self.profileAct.toggled.connect(self.box.set_show_profile)
 
         # 라벨 리스트
         self.LV_label = QListView()
@@ -407,6 +1005,32 @@ class change_detection(QMainWindow):
         self.LV_A = QListView()
         self.LV_B = QListView()
 
+        # 리스트 모델은 한 번만 만들고 증분 갱신 (paintEvent에서는 건드리지 않음)
+        self.model_A = QStandardItemModel()
+        self.model_B = QStandardItemModel()
+        self.label_model = QStringListModel()
+        self.LV_A.setModel(self.model_A)
+        self.LV_B.setModel(self.model_B)
+        # 목록에 보이는 행만 디스크 캐시의 썸네일을 읽어 아이콘으로 표시
+        for view in (self.LV_A, self.LV_B):
+            view.setIconSize(QSize(48, 48))
+            view.verticalScrollBar().valueChanged.connect(self.request_thumbnails)
+
+        # 폴더 import 시 A/B 목록 대신 쓰는 짝 표 (행을 필요할 때만 불러옴)
+        self.pair_model = None
+        self.TV_pairs = QTableView()
+        self.TV_pairs.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.TV_pairs.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.TV_pairs.verticalHeader().hide()
+        self.TV_pairs.horizontalHeader().setStretchLastSection(True)
+        self.TV_pairs.clicked.connect(self.on_pair_clicked)
+        self.TV_pairs.hide()
+        self.LV_label.setModel(self.label_model)
+        self.file_rows = {'A': {}, 'B': {}}  # 경로 -> 행 번호
+        self.bold_rows = {'A': -1, 'B': -1}  # 현재 굵게 표시된 행
+        self.files_dirty = True  # 파일 목록 재구성 필요
+        self.labels_dirty = True  # 라벨 목록 전체 재구성 필요
+
         # 버튼 및 입력창
         self.import_btn = QPushButton("Import...")
         self.import_btnB = QPushButton("Import...")
@@ -415,6 +1039,16 @@ class change_detection(QMainWindow):
         self.save_btn = QPushButton("Save Label")
         self.switch_btn = QPushButton('전환 On')
         self.auto_switch_btn = QPushButton('자동 전환')
+        self.compare_combo = QComboBox()
+        self.compare_combo.addItem('전환', 'swap')
+        self.compare_combo.addItem('스와이프', 'swipe')
+        self.compare_combo.addItem('나란히', 'side')
+        self.compare_combo.addItem('블렌드', 'blend')
+        # 스와이프에서는 분할선 위치, 블렌드에서는 B의 불투명도
+        self.compare_slider = QSlider(Qt.Horizontal)
+        self.compare_slider.setRange(0, 100)
+        self.compare_slider.setValue(50)
+        self.compare_slider.setEnabled(False)
         self.class_input_label = QLabel('Class:')
         self.class_input = QLineEdit()
         self.class_input.setText('1')
@@ -442,9 +1076,11 @@ class change_detection(QMainWindow):
         self.import_btnB.clicked.connect(lambda: self.openimage("B"))
         self.LV_A.clicked.connect(self.load_image_pair)
         self.LV_B.clicked.connect(self.load_image_pair)
-        self.save_btn.clicked.connect(self.savepoint)
+        self.save_btn.clicked.connect(lambda: self.savepoint())
         self.switch_btn.clicked.connect(self.change_switch_btn)
         self.auto_switch_btn.clicked.connect(self.auto_switch_dialog)
+        self.compare_combo.currentIndexChanged.connect(self.change_compare_mode)
+        self.compare_slider.valueChanged.connect(self.change_compare_value)
         self.class_input.returnPressed.connect(self.update_class)
 
         # 레이아웃 설정
@@ -457,6 +1093,10 @@ class change_detection(QMainWindow):
         V_Tool.addWidget(self.save_btn)
         V_Tool.addWidget(self.switch_btn)
         V_Tool.addWidget(self.auto_switch_btn)
+        H_Compare = QHBoxLayout()
+        H_Compare.addWidget(self.compare_combo)
+        H_Compare.addWidget(self.compare_slider)
+        V_Tool.addLayout(H_Compare)
 
         # 클래스 버튼들 가로 배치
         H_ClassButtons = QHBoxLayout()
@@ -470,6 +1110,7 @@ class change_detection(QMainWindow):
         V_Tool.addWidget(self.class_input_label)
         V_Tool.addWidget(self.class_input)
         V_Tool.addLayout(H_TempBox)
+        V_Tool.addWidget(self.TV_pairs)
 
         V_Imagebox.addWidget(self.box)
 
@@ -509,6 +1150,12 @@ class change_detection(QMainWindow):
         main_frame.setLayout(main_layout)
         self.setCentralWidget(main_frame)
 
+        # 저장 진행률 표시
+        self.save_progress = QProgressBar()
+        self.save_progress.setMaximumWidth(200)
+        self.save_progress.hide()
+        self.statusBar().addPermanentWidget(self.save_progress)
+
         # 메인 윈도우가 키보드 이벤트를 받을 수 있도록 설정
         self.setFocusPolicy(Qt.StrongFocus)
 
@@ -523,7 +1170,7 @@ class change_detection(QMainWindow):
                     self.switch_btn.setText('전환 Off')
                 else:
                     self.switch_btn.setText('전환 On')
-                self.box.repaint()
+                self.box.schedule()
             else:
                 QMessageBox.information(self, "경고", "Temporary B를 먼저 불러오세요")
         elif event.key() == Qt.Key_A:
@@ -554,6 +1201,9 @@ class change_detection(QMainWindow):
             self.update_class_from_button(4)  # 산불피해
         elif event.key() == Qt.Key_5:
             self.update_class_from_button(5)  # 수계
+        elif event.key() == Qt.Key_C and not event.modifiers():
+            # 커서 아래 변화 후보를 현재 클래스로 라벨에 추가
+            self.accept_proposal()
         elif event.key() == Qt.Key_Z and event.modifiers() & Qt.ControlModifier:
             if not self.box.is_drawing:
                 self.undo()
@@ -587,10 +1237,27 @@ class change_detection(QMainWindow):
                 self.switch_btn.setText('전환 Off')
             else:
                 self.switch_btn.setText('전환 On')
-            self.box.repaint()
+            self.box.schedule()
         else:
             QMessageBox.information(self, "경고", "Temporary B를 먼저 불러오세요")
 
+    def change_compare_mode(self, index):
+        mode = self.compare_combo.itemData(index)
+        self.compare_slider.blockSignals(True)
+        if mode == 'swipe':
+            self.compare_slider.setValue(int(self.box.swipe_ratio * 100))
+        elif mode == 'blend':
+            self.compare_slider.setValue(int(self.box.blend_alpha * 100))
+        self.compare_slider.blockSignals(False)
+        self.compare_slider.setEnabled(mode in ('swipe', 'blend'))
+        self.box.set_compare_mode(mode)
+
+    def change_compare_value(self, value):
+        if self.box.compare_mode == 'swipe':
+            self.box.set_swipe_ratio(value / 100)
+        elif self.box.compare_mode == 'blend':
+            self.box.set_blend_alpha(value / 100)
+
     def auto_switch_dialog(self):
         if not self.auto_switching:
             # 자동 전환 시작
@@ -616,7 +1283,7 @@ class change_detection(QMainWindow):
                 self.switch_btn.setText('전환 Off')
             else:
                 self.switch_btn.setText('전환 On')
-            self.box.repaint()
+            self.box.schedule()
         else:
             # tempB 이미지가 없을 경우 자동 전환 중지
             self.auto_switch_timer.stop()
@@ -625,8 +1292,18 @@ class change_detection(QMainWindow):
             QMessageBox.information(self, "경고", "Temporary B를 먼저 불러오세요")
 
     def select_polygon(self, index):
-        self.box.selected_poly_index = index.row()
-        self.box.repaint()
+        self.box.set_selected(index.row())
+
+    def select_polygon_row(self, row):
+        """
+        이미지에서 클릭한 폴리곤을 선택하고 라벨 리스트 선택도 맞춤
+        """
+        self.set_list()
+        self.box.set_selected(row)
+        if row >= 0:
+            self.LV_label.setCurrentIndex(self.label_model.index(row))
+        else:
+            self.LV_label.clearSelection()
 
     def rightMenuShow2(self, point):
         rightMenu = QMenu(self.LV_label)
@@ -634,108 +1311,383 @@ class change_detection(QMainWindow):
         rightMenu.addAction(removeAction)
         rightMenu.exec_(self.LV_label.mapToGlobal(point))
 
-    # 수정된 부분: clear_redo 인자 추가, 기본값 True
-    def push_undo(self, clear_redo=True):
-        # 현재 상태를 undo 스택에 저장
-        self.undo_stack.append(self.box.poly_list.copy())
-        # undo 스택 크기 제한 (선택사항)
-        # 예: 최근 20개의 액션만 저장하려면:
-        # if len(self.undo_stack) > 20:
-        #     self.undo_stack.pop(0)
-        # redo 스택 비우기 (clear_redo가 True일 때만)
-        if clear_redo:
-            self.redo_stack.clear()
+    def add_polygon(self, poly_dict):
+        """
+        현재 이미지에 폴리곤 하나를 추가 (저널, 라벨 리스트, undo 기록, 저장 대상 모두 반영)
+        """
+        items = [(len(self.box.poly_list), poly_dict)]
+        # 복구용 저널에 먼저 기록 (큐에 넣기만 함)
+        self.journal_edit('add', ('add', items))
+        self.box.poly_list.append(poly_dict)
+        self.box.geometry.insert(len(self.box.poly_list) - 1, poly_dict)
+        self.label_row_inserted(len(self.box.poly_list) - 1)
+        # 추가된 폴리곤만 undo 기록에 저장 (redo 기록은 비워짐)
+        self.push_edit('add', items)
+        # 이미지 라벨 업데이트
+        self.image_labels[self.box.path] = self.box.poly_list.copy()
+        self.dirty_labels.add(self.box.path)
+
+    def update_proposals(self):
+        """
+        현재 이미지 쌍의 변화 후보를 표시 (없으면 계산 요청)
+        """
+        self.box.proposals = []
+        if self.proposalAct.isChecked() and self.box.path and self.selected_b_image_path:
+            path_b = self.display_b_path(self.selected_b_image_path)
+            cached = self.proposal_engine.get(self.box.path, path_b)
+            if cached is None:
+                if self.box.img and self.box.imgB:
+                    self.proposal_engine.request(self.box.path, path_b, self.box.img, self.box.imgB)
+            else:
+                self.box.proposals = list(cached)
+        self.box.schedule()
+
+    def on_proposals_ready(self, path_a, path_b):
+        # 계산이 끝난 쌍이 현재 쌍일 때만 표시
+        if self.selected_b_image_path and (path_a, path_b) == (self.box.path, self.display_b_path(self.selected_b_image_path)):
+            self.update_proposals()
+
+    def display_b_path(self, path_b):
+        """
+        정합이 켜져 있고 정합 결과가 있으면 정합된 B 경로, 아니면 원본 B 경로
+        """
+        if self.registerAct.isChecked():
+            return self.aligned.get(path_b, path_b)
+        return path_b
+
+    def start_registration(self):
+        """
+        모든 이미지 쌍의 B를 A에 맞춰 프로세스 풀에서 정합 (캐시가 있으면 바로 끝남)
+        """
+        if not (self.temp_listA and len(self.temp_listA) == len(self.temp_listB)):
+            return
+        # cv2/프로세스 풀 모듈은 정합을 켤 때 불러옴 (시작 시간 단축)
+        from concurrent.futures import ProcessPoolExecutor
+        import registration
+        if self.registration_pool is None:
+            self.registration_pool = ProcessPoolExecutor()
+        for path_a, path_b in zip(self.temp_listA, self.temp_listB):
+            if path_b in self.aligned:
+                continue
+            future = self.registration_pool.submit(registration.align_pair, path_a, path_b)
+            future.add_done_callback(
+                lambda f, b=path_b: self.registration_done.emit(b, '' if f.cancelled() or f.exception() else f.result()))
+
+    def on_registration_toggled(self, checked):
+        if checked:
+            self.start_registration()
+        self.reload_b()
+
+    def on_registration_done(self, path_b, aligned_path):
+        if not aligned_path:
+            print(f"align_pair 오류: {path_b}")
+            return
+        self.aligned[path_b] = aligned_path
+        if path_b == self.selected_b_image_path:
+            self.reload_b()
+
+    def reload_b(self):
+        """
+        현재 B 영상을 (정합 여부에 맞게) 다시 불러옴
+        """
+        if self.selected_b_image_path:
+            path_b = self.display_b_path(self.selected_b_image_path)
+            self.box.imgB = self.prefetcher.pixmap(path_b)
+            self.box.pyramidB = self.box.make_pyramid(self.box.imgB, self.box.pyramidB, path_b)
+            self.update_proposals()
+
+    def set_raster_bands(self):
+        """
+        메모리 매핑으로 연 다중 밴드/16비트 영상의 표시 밴드와 밝기 늘이기 백분위 설정
+        """
+        try:
+            options = self.prefetcher.raster_options
+            current = ",".join(str(b + 1) for b in options['bands']) if options['bands'] else ""
+            text, ok = QInputDialog.getText(
+                self, '래스터 밴드', '표시할 밴드 번호 (1부터, 1개 또는 R,G,B 3개. 비우면 기본값):', text=current)
+            if not ok:
+                return
+            bands = tuple(int(b) - 1 for b in text.replace(" ", "").split(",") if b) or None
+            current = ",".join(str(p) for p in options['percentiles']) if options['percentiles'] else ""
+            text, ok = QInputDialog.getText(
+                self, '래스터 밴드', '밝기 늘이기 백분위 (하한,상한. 비우면 16비트 이상만 2,98):', text=current)
+            if not ok:
+                return
+            percentiles = tuple(float(p) for p in text.replace(" ", "").split(",") if p) or None
+            if percentiles is not None and not (len(percentiles) == 2 and 0 <= percentiles[0] < percentiles[1] <= 100):
+                raise ValueError("percentiles must be two values 0 <= low < high <= 100")
+            # 현재 영상에 먼저 적용해 보고 문제가 없을 때만 기본값으로 저장
+            for source in (self.box.img, self.box.imgB):
+                if isinstance(source, RasterSource):
+                    source.configure(bands, percentiles)
+            self.prefetcher.raster_options = {'bands': bands, 'percentiles': percentiles}
+            self.box.schedule()
+        except Exception as e:
+            print(f"set_raster_bands 오류: {e}")
+            QMessageBox.warning(self, "오류", f"밴드 설정 실패: {e}")
+
+    def set_cache_options(self):
+        """
+        디스크 캐시에 보관할 전체 해상도 디코딩 결과의 상한 설정 (0이면 저장하지 않고 매번 디코딩)
+        """
+        try:
+            disk = self.prefetcher.disk
+            mb = 1024 * 1024
+            size, ok = QInputDialog.getInt(self, '캐시 설정', '전체 해상도 영상 캐시 상한 (MB, 0이면 끔):',
+                                           disk.full_bytes // mb, 0, CACHE_BYTES // mb, 256)
+            if not ok:
+                return
+            disk.set_full_bytes(size * mb)
+        except Exception as e:
+            print(f"set_cache_options 오류: {e}")
+            QMessageBox.warning(self, "오류", f"캐시 설정 실패: {e}")
+
+    def set_simplify_options(self):
+        """
+        폴리곤 단순화 방법과 허용 오차 설정
+        """
+        try:
+            options = self.simplify_options
+            names = [METHOD_NAMES[m] for m in METHODS]
+            name, ok = QInputDialog.getItem(self, '폴리곤 단순화', '방법:', names,
+                                            METHODS.index(options['method']), False)
+            if not ok:
+                return
+            method = METHODS[names.index(name)]
+            label = ('허용 오차 (픽셀, 원래 선에서 벗어나는 최대 거리):' if method == 'dp'
+                     else '허용 오차 (픽셀, 넓이가 오차² 미만인 꼭짓점 제거):')
+            tolerance, ok = QInputDialog.getDouble(self, '폴리곤 단순화', label, options['tolerance'], 0.1, 100.0, 2)
+            if not ok:
+                return
+            self.simplify_options = {'method': method, 'tolerance': tolerance}
+        except Exception as e:
+            print(f"set_simplify_options 오류: {e}")
+            QMessageBox.warning(self, "오류", f"단순화 설정 실패: {e}")
+
+    def simplify_drawn(self, points):
+        """
+        그리기를 마친 좌표를 'Simplify polygons on finish'가 켜져 있으면 단순화하고 줄어든 꼭짓점 수를 표시
+        """
+        if not self.simplifyAct.isChecked():
+            return points
+        simplified, removed = simplify_points(points, self.simplify_options['tolerance'], self.simplify_options['method'])
+        if removed:
+            self.statusBar().showMessage(f"꼭짓점 {len(points) // 2}개 -> {len(simplified) // 2}개 ({removed}개 제거)", 3000)
+        return simplified
+
+    def simplify_all_labels(self):
+        """
+        image_labels의 모든 폴리곤을 단순화. 바뀐 폴리곤만 새 dict로 바꾸고 저장 대상에 추가 (undo로 되돌릴 수 없음)
+        """
+        try:
+            if self.box.path:
+                self.image_labels[self.box.path] = self.box.poly_list.copy()
+            if not any(self.image_labels.values()):
+                QMessageBox.information(self, "경고", "단순화할 라벨이 없습니다.")
+                return
+            options = self.simplify_options
+            reply = QMessageBox.question(
+                self, '폴리곤 단순화',
+                f"불러온 이미지 {len(self.image_labels)}개의 모든 폴리곤을 "
+                f"{METHOD_NAMES[options['method']]} (허용 오차 {options['tolerance']:g}px)로 단순화합니다.\n"
+                "undo로 되돌릴 수 없습니다. 계속하시겠습니까?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
+            total = removed = images = 0
+            for path, poly_list in self.image_labels.items():
+                changes, vertices, count = simplify_polys(poly_list, options['tolerance'], options['method'])
+                total += vertices
+                if not changes:
+                    continue
+                removed += count
+                images += 1
+                for row, poly_dict in changes:
+                    poly_list[row] = poly_dict
+                self.dirty_labels.add(path)
+                if path == self.box.path:
+                    # 현재 이미지는 바뀐 행만 라벨 리스트와 화면에 반영
+                    for row, poly_dict in changes:
+                        self.box.poly_list[row] = poly_dict
+                        self.box.geometry.replace(row, poly_dict)
+                        self.label_row_updated(row)
+                    self.box.schedule()
+            if images:
+                # 복구 저널의 기준 상태도 단순화한 라벨로 다시 씀
+                self.compact_journal()
+            percent = 100 * removed / total if total else 0
+            self.statusBar().showMessage(
+                f"꼭짓점 {total}개 중 {removed}개 제거 ({percent:.1f}%, 이미지 {images}개)", 10000)
+        except Exception as e:
+            print(f"simplify_all_labels 오류: {e}")
+            QMessageBox.warning(self, "오류", f"폴리곤 단순화 실패: {e}")
+
+    def accept_proposal(self):
+        index = self.box.proposal_at(self.box.mapFromGlobal(QCursor.pos()))
+        if index < 0 or self.box.is_drawing:
+            return
+        proposal = self.box.proposals.pop(index)
+        self.proposal_engine.discard(self.box.path, self.display_b_path(self.selected_b_image_path), proposal)
+        self.add_polygon({'points': list(proposal['points']), 'class': self.box.current_class})
+        self.box.schedule_view(self.box.points_rect(proposal['points']))
+
+    def push_edit(self, kind, items):
+        """
+        현재 이미지의 undo 기록에 추가/삭제된 폴리곤만 저장 (redo 기록은 비움)
+        """
+        self.history.push(self.box.path, (kind, items))
+
+    def journal_edit(self, op, edit, reverse=False):
+        """
+        poly_list를 바꾸기 직전에 호출: 실제로 일어날 변화를 저널에 기록
+        """
+        if self.journal is None:
+            return
+        kind, items = edit
+        adding = (kind == 'add') != reverse
+        self.journal.record(self.box.path, op, 'add' if adding else 'remove', items, self.box.poly_list)
+
+    def workspace(self, folder):
+        # 프로젝트 저장소가 열려 있으면 프로젝트 파일, 아니면 Base Image 폴더 단위로 저널을 나눔
+        return self.store.path if self.store is not None else folder
+
+    def open_journal(self, workspace):
+        """
+        workspace의 저널로 바꿈. 그 저널에 저장하지 않은 이전 작업이 남아 있으면 복구
+        """
+        path = journal_path(workspace)
+        if self.journal is not None:
+            if self.journal.path == path:
+                return
+            # 이전 작업 폴더의 저장하지 않은 작업은 그 저널에 남겨 둠
+            self.compact_journal()
+            self.journal.close()
+            self.journal = None
+        try:
+            recovered = LabelJournal.recover(path)
+            if recovered:
+                reply = QMessageBox.question(self, '복구', f'저장하지 않은 라벨 작업이 있습니다 ({len(recovered)}개 이미지).\n복구하시겠습니까?',
+                                             QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+                if reply == QMessageBox.Yes:
+                    self.image_labels.update(recovered)
+                    self.dirty_labels.update(recovered)
+                    if self.box.path in recovered:
+                        self.box.poly_list = recovered[self.box.path].copy()
+                        self.labels_dirty = True
+                        self.box.schedule()
+                else:
+                    recovered = {}
+        except Exception as e:
+            print(f"open_journal 오류: {e}")
+            recovered = {}
+        self.journal = LabelJournal(path)
+        # 복구한 상태를 새 기준으로 저널을 다시 씀
+        self.journal.compact(recovered)
+
+    def compact_journal(self):
+        # 저장된 작업은 저널에서 정리하고, 아직 저장되지 않은 이미지만 남김
+        if self.journal is not None:
+            self.journal.compact({path: self.image_labels.get(path, []) for path in self.dirty_labels})
+
+    def apply_edit(self, op, edit, reverse=False):
+        """
+        기록된 편집을 poly_list에 적용하고 라벨 리스트에는 행 단위로 반영
+        """
+        self.journal_edit(op, edit, reverse)
+        # 바뀐 폴리곤과 선택이 풀리는 폴리곤 영역만 다시 그림
+        damage = self.box.polygon_rect(self.box.selected_poly_index)
+        for _, poly_dict in edit[1]:
+            damage = damage.united(self.box.points_rect(poly_dict['points']))
+        # 적용된 순서대로 좌표 배열/공간 인덱스에도 행 단위로 반영
+        for row, added in HistoryManager.apply(self.box.poly_list, edit, reverse):
+            if added:
+                self.box.geometry.insert(row, self.box.poly_list[row])
+                self.label_row_inserted(row)
+            else:
+                self.box.geometry.remove(row)
+                self.label_row_removed(row)
+        self.image_labels[self.box.path] = self.box.poly_list.copy()
+        self.dirty_labels.add(self.box.path)
+        self.box.selected_poly_index = -1  # 선택 인덱스 리셋
+        self.box.schedule_view(damage)
+        self.set_list()
 
     def removepoint(self):
         try:
             selected = self.LV_label.selectedIndexes()
             if not selected:
                 return
-            # 현재 상태를 undo 스택에 저장
-            self.push_undo()
-            for i in selected:
-                self.box.poly_list.pop(i.row())
-            self.box.selected_poly_index = -1  # 선택 인덱스 리셋
-            self.repaint()
-            # 이미지 라벨 업데이트
-            self.image_labels[self.box.path] = self.box.poly_list.copy()
-            # redo 스택 비우기
-            # self.redo_stack.clear()  # push_undo에서 처리됨
+            # 삭제되는 폴리곤만 undo 기록에 저장
+            rows = sorted({i.row() for i in selected})
+            items = [(row, self.box.poly_list[row]) for row in rows]
+            self.push_edit('remove', items)
+            self.apply_edit('remove', ('remove', items))
         except Exception as e:
             print(f"removepoint 오류: {e}")
             QMessageBox.warning(self, "오류", f"포인트 삭제 실패: {e}")
 
     def undo(self):
         try:
-            if not self.undo_stack:
+            edit = self.history.get(self.box.path).undo()
+            if edit is None:
                 QMessageBox.information(self, "Undo", "되돌릴 작업이 없습니다.")
                 return
-            # 현재 상태를 redo 스택에 저장
-            self.redo_stack.append(self.box.poly_list.copy())
-            # undo 스택에서 상태 복원
-            self.box.poly_list = self.undo_stack.pop()
-            self.image_labels[self.box.path] = self.box.poly_list.copy()
-            self.box.selected_poly_index = -1  # 선택 인덱스 리셋
-            self.repaint()
+            # 기록된 편집을 거꾸로 적용
+            self.apply_edit('undo', edit, reverse=True)
         except Exception as e:
             print(f"undo 오류: {e}")
             QMessageBox.warning(self, "오류", f"Undo 실패: {e}")
 
     def redo(self):
         try:
-            if not self.redo_stack:
+            edit = self.history.get(self.box.path).redo()
+            if edit is None:
                 QMessageBox.information(self, "Redo", "다시 실행할 작업이 없습니다.")
                 return
-            # 현재 상태를 undo 스택에 저장, redo 시에는 redo_stack을 비우지 않음
-            self.push_undo(clear_redo=False)  # 수정된 부분
-            # redo 스택에서 상태 복원
-            self.box.poly_list = self.redo_stack.pop()
-            self.image_labels[self.box.path] = self.box.poly_list.copy()
-            self.box.selected_poly_index = -1  # 선택 인덱스 리셋
-            self.repaint()
+            self.apply_edit('redo', edit)
         except Exception as e:
             print(f"redo 오류: {e}")
             QMessageBox.warning(self, "오류", f"Redo 실패: {e}")
 
+    @profiled('load_image_pair')
     def load_image_pair(self, qModelIndex):
         try:
             index = qModelIndex.row()
-            # 인덱스가 두 리스트의 범위 내에 있는지 확인
-            if index < len(self.temp_listA) and index < len(self.temp_listB):
+            # 인덱스가 두 리스트의 범위 내에 있는지 확인 (무효 인덱스의 row -1이 마지막 항목을 가리키지 않도록)
+            if qModelIndex.isValid() and 0 <= index < len(self.temp_listA) and index < len(self.temp_listB):
                 # 현재 라벨 저장
                 if self.box.path:
                     self.image_labels[self.box.path] = self.box.poly_list.copy()
-                # undo 및 redo 스택 초기화
-                self.undo_stack.clear()
-                self.redo_stack.clear()
+                # undo 및 redo 기록은 이미지별로 유지되므로 초기화하지 않음
                 # 새로운 이미지 경로 설정
                 self.box.path = self.temp_listA[index]
-                self.box.set_image()
+                self.box.set_image(self.prefetcher.pixmap(self.box.path))
 
                 # 새로운 이미지에 대한 라벨 로드
-                if self.box.path in self.image_labels:
+                if self.has_working_labels(self.box.path):
                     self.box.poly_list = self.image_labels[self.box.path].copy()
                 else:
                     # 파일에서 라벨 로드 시도
                     self.load_labels_from_file()
+                self.labels_dirty = True
 
                 # Temporary B 이미지 설정
                 self.selected_b_image_path = self.temp_listB[index]
-                try:
-                    img_array = np.fromfile(self.selected_b_image_path, np.uint8)
-                    img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    height, width, channel = img.shape
-                    bytesPerLine = 3 * width
-                    qimg = QImage(img, width, height, bytesPerLine, QImage.Format_RGB888)
-                    self.box.imgB = QPixmap(qimg)
-                except:
-                    self.box.imgB = QPixmap(self.selected_b_image_path)
+                path_b = self.display_b_path(self.selected_b_image_path)
+                self.box.imgB = self.prefetcher.pixmap(path_b)
+                self.box.pyramidB = self.box.make_pyramid(self.box.imgB, self.box.pyramidB, path_b)
+                # 다음/이전 쌍 미리 디코딩
+                self.prefetcher.prefetch_around(self.temp_listA, [self.display_b_path(p) for p in self.temp_listB], index)
+                self.update_proposals()
 
                 self.switch_btn.setText('전환 On')
                 self.box.is_tempB = False
-                self.box.repaint()
+                self.box.schedule()
                 self.set_list()
+                # A 영상의 디코딩 시간/추정 메모리 (미리 디코딩된 경우 그때의 기록)
+                message = self.prefetcher.decoder.describe(self.box.path)
+                if message:
+                    self.statusBar().showMessage(message, 3000)
             else:
                 QMessageBox.warning(self, "오류", "Base Image와 Temporary B의 이미지 수가 다릅니다.")
         except Exception as e:
@@ -747,15 +1699,18 @@ class change_detection(QMainWindow):
             # 현재 라벨 저장
             if self.box.path:
                 self.image_labels[self.box.path] = self.box.poly_list.copy()
-            # undo 및 redo 스택 초기화
-            self.undo_stack.clear()
-            self.redo_stack.clear()
             imgNames, _ = QFileDialog.getOpenFileNames(self, "파일 선택", "",
                                                       "이미지 파일 (*.png *.jpg *.bmp);;모든 파일 (*)")
+            if self.pair_model is not None:
+                self.set_folder_mode(None)
             if flag == "A":
                 self.temp_listA = imgNames
+                if imgNames:
+                    self.open_journal(self.workspace(os.path.dirname(imgNames[0])))
             else:
                 self.temp_listB = imgNames
+            # 파일 목록 모델은 import 시에만 재구성
+            self.files_dirty = True
             self.set_list()
             # 두 리스트 모두 로드되었을 때
             if self.temp_listA and self.temp_listB:
@@ -764,132 +1719,497 @@ class change_detection(QMainWindow):
                 else:
                     # 첫 번째 이미지 쌍 로드
                     self.box.path = self.temp_listA[0]
-                    self.box.set_image()
-                    if self.box.path in self.image_labels:
+                    self.box.set_image(self.prefetcher.pixmap(self.box.path))
+                    if self.has_working_labels(self.box.path):
                         self.box.poly_list = self.image_labels[self.box.path].copy()
                     else:
                         self.load_labels_from_file()
+                    self.labels_dirty = True
                     self.selected_b_image_path = self.temp_listB[0]
-                    try:
-                        img_array = np.fromfile(self.selected_b_image_path, np.uint8)
-                        img = cv2.imdecode(img_array, cv2.IMREAD_COLOR)
-                        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                        height, width, channel = img.shape
-                        bytesPerLine = 3 * width
-                        qimg = QImage(img, width, height, bytesPerLine, QImage.Format_RGB888)
-                        self.box.imgB = QPixmap(qimg)
-                    except:
-                        self.box.imgB = QPixmap(self.selected_b_image_path)
+                    path_b = self.display_b_path(self.selected_b_image_path)
+                    self.box.imgB = self.prefetcher.pixmap(path_b)
+                    self.box.pyramidB = self.box.make_pyramid(self.box.imgB, self.box.pyramidB, path_b)
+                    if self.registerAct.isChecked():
+                        self.start_registration()
+                    self.prefetcher.prefetch_around(self.temp_listA, [self.display_b_path(p) for p in self.temp_listB], 0)
+                    self.update_proposals()
                     self.switch_btn.setText('전환 On')
                     self.box.is_tempB = False
-                    self.box.repaint()
+                    self.box.schedule()
                     self.set_list()
         except Exception as e:
             print(f"openimage 오류: {e}")
             QMessageBox.warning(self, "오류", f"이미지 열기 실패: {e}")
 
+    def import_folders(self):
+        """
+        Base Image / Temporary B 폴더를 골라 파일 이름(또는 정규식 키)으로 짝지어 불러옴
+        """
+        try:
+            dir_a = QFileDialog.getExistingDirectory(self, "Base Image 폴더 선택")
+            if not dir_a:
+                return
+            dir_b = QFileDialog.getExistingDirectory(self, "Temporary B 폴더 선택")
+            if not dir_b:
+                return
+            pattern, ok = QInputDialog.getText(
+                self, '폴더 짝짓기', '짝을 찾을 정규식 (첫 번째 그룹이 키, 비우면 파일 이름으로 짝지음):')
+            if not ok:
+                return
+            # 현재 라벨 저장
+            if self.box.path:
+                self.image_labels[self.box.path] = self.box.poly_list.copy()
+            pairs = PairIndex(dir_a, dir_b, pattern or None)
+            pairs.set_store(self.store)
+            self.open_journal(self.workspace(dir_a))
+            self.set_folder_mode(PairTableModel(pairs, self))
+            self.temp_listA = pairs.pairs_a
+            self.temp_listB = pairs.pairs_b
+            self.statusBar().showMessage(f"{pairs.complete}쌍, 짝 없는 파일 {len(pairs) - pairs.complete}개", 5000)
+            if pairs.complete:
+                if self.registerAct.isChecked():
+                    self.start_registration()
+                # 표가 아직 한 행도 가져오지 않았으면 index(0, 0)이 무효(row -1)이므로 먼저 가져옴
+                self.pair_model.ensure_loaded(0)
+                self.load_image_pair(self.pair_model.index(0, 0))
+        except Exception as e:
+            print(f"import_folders 오류: {e}")
+            QMessageBox.warning(self, "오류", f"폴더 불러오기 실패: {e}")
+
+    def set_folder_mode(self, model):
+        """
+        model이 있으면 A/B 목록을 숨기고 짝 표를 보여줌, None이면 원래 목록으로 돌아감
+        """
+        self.pair_model = model
+        self.TV_pairs.setModel(model)
+        self.TV_pairs.setVisible(model is not None)
+        self.LV_A.setVisible(model is None)
+        self.LV_B.setVisible(model is None)
+        # 폴더 모드에서는 파일 목록 모델을 만들지 않음
+        self.model_A.clear()
+        self.model_B.clear()
+        self.file_rows = {'A': {}, 'B': {}}
+        self.bold_rows = {'A': -1, 'B': -1}
+        self.files_dirty = model is None
+
+    def on_pair_clicked(self, index):
+        if index.row() >= self.pair_model.pairs.complete:
+            QMessageBox.information(self, "경고", "짝이 없는 이미지입니다.")
+            return
+        self.load_image_pair(index)
+
+    @profiled('savepoint')
     def savepoint(self):
         try:
             if not self.image_labels:
                 QMessageBox.information(self, "경고", "저장할 라벨이 없습니다.")
                 return
-            for image_path, poly_list in self.image_labels.items():
-                if not poly_list:
-                    continue  # 라벨이 없는 이미지는 건너뜀
-                (filepath, filename) = os.path.split(image_path)
-                csv_filename = os.path.splitext(filename)[0][:-2] + "_Label.csv"
-                label_dir = os.path.join(filepath, "label")
-                if not os.path.exists(label_dir):
-                    os.makedirs(label_dir)
-
-                # Open file and write data
-                with open(os.path.join(label_dir, csv_filename), 'w', encoding='utf_8_sig') as f:
-                    for poly_dict in poly_list:
-                        class_number = poly_dict['class']
-                        points = poly_dict['points']
-
-                        # NaN 값 필터링
-                        valid_points = [coord for coord in points if not np.isnan(coord)]
-
-                        # Write the class number on its own row
-                        f.write(f"{class_number}\n")
-
-                        # Write the coordinates on the next row, each coordinate in a separate "cell"
-                        point_str = ','.join(map(str, valid_points))  # Write each coordinate separated by a comma
-                        f.write(f"{point_str}\n")
-
-            QMessageBox.information(self, "저장", "성공적으로 저장되었습니다.")
-            self.set_list()
+            if self.save_worker is not None and self.save_worker.isRunning():
+                self.statusBar().showMessage("저장 중입니다...", 2000)
+                return
+            # 마지막 저장 이후 바뀐 이미지만 저장
+            if self.box.path:
+                self.image_labels[self.box.path] = self.box.poly_list.copy()
+            # 라벨이 없는 이미지는 건너뜀 (저장소에 있던 이미지는 모두 지운 것도 저장)
+            jobs = [(path, list(self.image_labels[path])) for path in self.dirty_labels
+                    if self.image_labels.get(path) or self.label_versions.get(path)]
+            self.dirty_labels.clear()
+            if not jobs:
+                self.statusBar().showMessage("변경된 라벨이 없습니다.", 2000)
+                return
+
+            # 저장은 백그라운드 스레드에서 진행하고 라벨링은 계속 가능
+            self.save_worker = LabelSaveWorker(jobs, self.binaryAct.isChecked(),
+                                               self.store.path if self.store is not None else None,
+                                               {path: self.label_versions.get(path, 0) for path, _ in jobs})
+            self.save_worker.progress.connect(self.on_save_progress)
+            self.save_worker.failed.connect(self.on_save_failed)
+            self.save_worker.finished.connect(self.on_save_finished)
+            self.save_progress.setRange(0, len(jobs))
+            self.save_progress.setValue(0)
+            self.save_progress.show()
+            self.save_worker.start()
         except Exception as e:
             print(f"savepoint 오류: {e}")
             QMessageBox.warning(self, "오류", f"포인트 저장 실패: {e}")
 
+    def on_save_progress(self, done, total):
+        self.save_progress.setValue(done)
+
+    def on_save_failed(self, image_path, message):
+        print(f"savepoint 오류: {image_path}: {message}")
+        # 실패한 이미지는 다음 저장 때 다시 시도
+        self.dirty_labels.add(image_path)
+
+    def on_save_finished(self):
+        self.save_progress.hide()
+        failed = self.save_worker.failed_paths
+        self.label_versions.update(self.save_worker.saved)
+        if self.pair_model is not None:
+            for path, _ in self.save_worker.jobs:
+                if path not in failed and path not in self.save_worker.conflicts:
+                    self.pair_model.mark_labeled(path)
+        if self.save_worker.conflicts:
+            self.resolve_conflicts(self.save_worker.conflicts)
+        self.compact_journal()
+        if failed:
+            QMessageBox.warning(self, "오류", f"포인트 저장 실패: {len(failed)}개 이미지")
+        else:
+            self.statusBar().showMessage("성공적으로 저장되었습니다.", 3000)
 
-    def load_labels_from_file(self):
-        (label_path, filename) = os.path.split(self.box.path)
-        csv_filename = os.path.splitext(filename)[0][:-2] + "_Label.csv"
-        csv_filepath = os.path.join(label_path, "label", csv_filename)
 
-        if os.path.exists(csv_filepath):
-            poly_list = []
+    def export_masks(self):
+        """
+        라벨이 있는 모든 이미지를 mask/ 폴더에 클래스 마스크와 변화 마스크로 저장
+        """
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.statusBar().showMessage("마스크 내보내는 중입니다...", 2000)
+            return
+        if self.box.path:
+            self.image_labels[self.box.path] = self.box.poly_list.copy()
+        jobs = [(path, list(polys), None, "png") for path, polys in self.image_labels.items() if polys]
+        if not jobs:
+            QMessageBox.information(self, "경고", "저장할 라벨이 없습니다.")
+            return
+        self.export_worker = MaskExportWorker(jobs)
+        self.export_worker.progress.connect(self.on_save_progress)
+        self.export_worker.report.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        self.export_worker.finished.connect(self.save_progress.hide)
+        self.save_progress.setRange(0, len(jobs))
+        self.save_progress.setValue(0)
+        self.save_progress.show()
+        self.export_worker.start()
+
+    def has_working_labels(self, path):
+        """
+        image_labels의 라벨을 그대로 써도 되는지. 프로젝트 저장소가 열려 있으면
+        저장하지 않은 편집이 있거나, 읽은 뒤로 다른 작업자가 저장하지 않았을 때만
+        """
+        if path not in self.image_labels:
+            return False
+        if self.store is None or path in self.dirty_labels:
+            return True
+        return self.store.version(path) == self.label_versions.get(path, 0)
+
+    def reload_current_labels(self):
+        """
+        저장소가 바뀐 뒤 현재 이미지의 라벨을 다시 읽음 (저장하지 않은 편집이 있으면 그대로 둠)
+        """
+        if not self.box.path or self.has_working_labels(self.box.path):
+            return
+        self.load_labels_from_file()
+        self.labels_dirty = True
+        self.box.selected_poly_index = -1
+        self.box.schedule()
+        self.set_list()
+
+    def open_project(self):
+        """
+        프로젝트 저장소(SQLite)를 열거나 새로 만듦. 이후 라벨은 저장소에서 읽고 저장소에 저장
+        """
+        try:
+            path, _ = QFileDialog.getSaveFileName(self, "프로젝트 저장소 열기/만들기", "project.sqlite",
+                                                  "프로젝트 (*.sqlite *.db);;모든 파일 (*)",
+                                                  options=QFileDialog.DontConfirmOverwrite)
+            if not path:
+                return
+            if any(worker is not None and worker.isRunning() for worker in (self.save_worker, self.transfer_worker)):
+                self.statusBar().showMessage("저장 중입니다...", 2000)
+                return
+            store = ProjectStore(path)
+            if self.store is not None:
+                self.store.close()
+            self.store = store
+            self.label_versions = {}
+            if self.pair_model is not None:
+                self.pair_model.set_store(store)
+            self.projectImportAct.setEnabled(True)
+            self.projectExportAct.setEnabled(True)
+            self.open_journal(store.path)
+            self.reload_current_labels()
+            message = f"프로젝트: {store.path} (라벨 {len(store.versions())}개 이미지)"
+            if store.journal_mode.lower() != 'wal':
+                # 네트워크 파일 시스템 등에서는 WAL을 쓸 수 없음
+                message += f", WAL 대신 {store.journal_mode} 모드"
+            self.statusBar().showMessage(message, 5000)
+        except Exception as e:
+            print(f"open_project 오류: {e}")
+            QMessageBox.warning(self, "오류", f"프로젝트 열기 실패: {e}")
 
-            with open(csv_filepath, 'r', encoding='utf_8_sig') as f:
-                content = f.readlines()
-                for i in range(0, len(content), 2):
-                    class_number = int(content[i].strip())
-                    points_str = content[i+1].strip().split(',')
-                    points = [float(coord) for coord in points_str]
-                    poly_list.append({'points': points, 'class': class_number})
+    def resolve_conflicts(self, conflicts):
+        """
+        다른 작업자가 먼저 저장한 이미지: 내 라벨로 덮어쓰거나 저장소 라벨을 다시 불러옴
+        """
+        names = "\n".join(os.path.basename(path) for path in list(conflicts)[:10])
+        reply = QMessageBox.question(
+            self, '저장 충돌',
+            f'다른 작업자가 먼저 저장한 이미지가 {len(conflicts)}개 있습니다.\n{names}\n\n'
+            '예: 내 라벨로 덮어쓰기, 아니요: 저장소 라벨 불러오기 (내 편집은 버림)',
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            # 저장소 버전을 읽은 것으로 보고 다시 저장
+            self.label_versions.update(conflicts)
+            self.dirty_labels.update(conflicts)
+            QTimer.singleShot(0, self.savepoint)
+            return
+        for path in conflicts:
+            poly_list, version = self.store.load(path)
+            self.image_labels[path] = poly_list or []
+            self.label_versions[path] = version
+            self.history.discard(path)
+            if path == self.box.path:
+                self.box.poly_list = list(self.image_labels[path])
+                self.box.selected_poly_index = -1
+                self.labels_dirty = True
+        self.box.schedule()
+        self.set_list()
 
+    def import_project_labels(self):
+        """
+        불러온 Base Image들의 _Label.csv를 프로젝트 저장소로 일괄 가져옴
+        """
+        if self.transfer_worker is not None and self.transfer_worker.isRunning():
+            self.statusBar().showMessage("프로젝트 라벨을 옮기는 중입니다...", 2000)
+            return
+        if not self.temp_listA:
+            QMessageBox.information(self, "경고", "불러온 이미지가 없습니다.")
+            return
+        reply = QMessageBox.question(self, '라벨 가져오기', '이미 프로젝트에 있는 이미지도 CSV 라벨로 덮어쓰시겠습니까?',
+                                     QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel, QMessageBox.No)
+        if reply == QMessageBox.Cancel:
+            return
+        self.start_transfer(ProjectTransferWorker(self.store.path, list(self.temp_listA), reply == QMessageBox.Yes),
+                            len(self.temp_listA))
+
+    def export_project_labels(self):
+        """
+        프로젝트 저장소의 라벨을 이미지별 _Label.csv로 내보냄 (저장하지 않은 편집은 포함되지 않음)
+        """
+        if self.transfer_worker is not None and self.transfer_worker.isRunning():
+            self.statusBar().showMessage("프로젝트 라벨을 옮기는 중입니다...", 2000)
+            return
+        if self.dirty_labels:
+            QMessageBox.information(self, "알림", "저장하지 않은 편집은 내보내지 않습니다. 먼저 저장하세요.")
+        self.start_transfer(ProjectTransferWorker(self.store.path, binary=self.binaryAct.isChecked()), 0)
+
+    def start_transfer(self, worker, total):
+        self.transfer_worker = worker
+        worker.progress.connect(self.on_transfer_progress)
+        worker.report.connect(lambda message: self.statusBar().showMessage(message, 10000))
+        worker.finished.connect(self.on_transfer_finished)
+        self.save_progress.setRange(0, total)
+        self.save_progress.setValue(0)
+        self.save_progress.show()
+        worker.start()
+
+    def on_transfer_progress(self, done, total):
+        self.save_progress.setRange(0, total)
+        self.save_progress.setValue(done)
+
+    def on_transfer_finished(self):
+        self.save_progress.hide()
+        if self.pair_model is not None:
+            self.pair_model.set_store(self.store)
+        self.reload_current_labels()
+
+    @profiled('load_labels_from_file')
+    def load_labels_from_file(self):
+        poly_list = None
+        if self.store is not None:
+            # 프로젝트 저장소에 있으면 저장소의 라벨과 버전을 사용
+            poly_list, version = self.store.load(self.box.path)
+            if version != self.label_versions.get(self.box.path, 0):
+                self.history.discard(self.box.path)
+            self.label_versions[self.box.path] = version
+        if poly_list is None:
+            # _Label.npz가 더 최신이면 바이너리 라벨을, 아니면 _Label.csv를 읽음
+            poly_list = read_label_file(label_csv_path(self.box.path))
+
+        if poly_list is not None:
             self.box.poly_list = poly_list
             self.image_labels[self.box.path] = poly_list
+            self.labels_dirty = True
 
 
+    @profiled('set_list')
     def set_list(self):
+        """
+        더티 플래그가 설정된 모델만 갱신하고, 선택 파일의 굵게 표시만 이동
+        """
         try:
-            # 리스트 업데이트
-            poly_info = []
-            for poly_dict in self.box.poly_list:
-                poly_info.append(f"Class {poly_dict['class']}: {poly_dict['points']}")
+            if self.files_dirty:
+                self.fill_file_model('A', self.model_A, self.temp_listA)
+                self.fill_file_model('B', self.model_B, self.temp_listB)
+                self.files_dirty = False
+                # 목록 배치가 끝난 뒤 보이는 행의 썸네일 요청
+                QTimer.singleShot(0, self.request_thumbnails)
 
             # Base Image와 Temporary B 리스트 모두 굵게 표시 적용
-            self.LV_A.setModel(self.create_bold_model(self.temp_listA, self.box.path))
-            self.LV_B.setModel(self.create_bold_model(self.temp_listB, self.selected_b_image_path))
-            self.LV_label.setModel(QStringListModel(poly_info))
+            if self.pair_model is not None:
+                self.pair_model.set_current(self.pair_model.pairs.row_of.get(self.box.path, -1))
+            else:
+                self.move_bold('A', self.model_A, self.box.path)
+                self.move_bold('B', self.model_B, self.selected_b_image_path)
+
+            if self.labels_dirty:
+                self.label_model.setStringList([self.poly_text(p) for p in self.box.poly_list])
+                self.labels_dirty = False
         except Exception as e:
             print(f"set_list 오류: {e}")
 
-    def create_bold_model(self, file_list, selected_file):
+    def fill_file_model(self, key, model, file_list):
+        """
+        파일 목록 모델을 다시 채움 (import 시에만 호출)
         """
-        리스트에서 선택된 파일을 굵게 처리하는 모델 생성
+        model.clear()
+        rows = {}
+        for row, file in enumerate(file_list):
+            model.appendRow(QStandardItem(file))
+            rows.setdefault(file, row)
+        self.file_rows[key] = rows
+        self.bold_rows[key] = -1
+
+    def request_thumbnails(self):
         """
-        model = QStandardItemModel()
-        for file in file_list:
-            item = QStandardItem(file)
-            if file == selected_file:
-                # 굵게 표시
+        LV_A/LV_B에서 현재 보이는 행 중 아이콘이 없는 파일의 썸네일만 요청
+        """
+        for view, model in ((self.LV_A, self.model_A), (self.LV_B, self.model_B)):
+            first = view.indexAt(QPoint(0, 0)).row()
+            if first < 0:
+                continue
+            last = view.indexAt(QPoint(0, view.viewport().height() - 1)).row()
+            if last < 0:
+                last = model.rowCount() - 1
+            for row in range(first, last + 1):
+                item = model.item(row)
+                if item is not None and item.icon().isNull():
+                    self.prefetcher.request_thumbnail(item.text())
+
+    def on_thumbnail_ready(self, path, image):
+        icon = QIcon(QPixmap.fromImage(image))
+        for key, model in (('A', self.model_A), ('B', self.model_B)):
+            row = self.file_rows[key].get(path)
+            if row is not None and model.item(row) is not None:
+                model.item(row).setIcon(icon)
+
+    def move_bold(self, key, model, selected_file):
+        """
+        이전에 굵게 표시된 행을 해제하고 선택된 파일 행만 굵게 처리
+        """
+        row = self.file_rows[key].get(selected_file, -1)
+        if row == self.bold_rows[key]:
+            return
+        for r, bold in ((self.bold_rows[key], False), (row, True)):
+            item = model.item(r) if r >= 0 else None
+            if item is not None:
                 font = item.font()
-                font.setBold(True)
+                font.setBold(bold)
                 item.setFont(font)
-            model.appendRow(item)
-        return model
+        self.bold_rows[key] = row
+
+    def poly_text(self, poly_dict):
+        return f"Class {poly_dict['class']}: {poly_dict['points']}"
+
+    def label_row_inserted(self, row):
+        # 전체 재구성이 예정되어 있으면 개별 행 갱신은 생략
+        if self.labels_dirty:
+            return
+        self.label_model.insertRows(row, 1)
+        self.label_model.setData(self.label_model.index(row), self.poly_text(self.box.poly_list[row]))
+
+    def label_row_removed(self, row):
+        if self.labels_dirty:
+            return
+        self.label_model.removeRows(row, 1)
+
+    def label_row_updated(self, row):
+        if self.labels_dirty:
+            return
+        self.label_model.setData(self.label_model.index(row), self.poly_text(self.box.poly_list[row]))
 
     def repaint(self):
-        self.box.repaint()
+        self.box.schedule()
         self.set_list()
 
+    def open_homepage(self):
+        import webbrowser  # Help 메뉴를 쓸 때만 필요
+        webbrowser.open("https://github.com/chartgod/Changedetection_labelingtool")
+
+    def export_profile(self):
+        """
+        계측 기록을 Chrome trace(.trace.json) 또는 구간별 요약 JSON으로 저장
+        """
+        try:
+            if not PROFILER.enabled and not PROFILER.events:
+                QMessageBox.information(self, "계측", "기록이 없습니다. File 메뉴의 Profiling overlay(Ctrl+F12)를 먼저 켜세요.")
+                return
+            trace_filter = "Chrome trace (*.trace.json)"
+            path, selected = QFileDialog.getSaveFileName(self, "계측 기록 저장", "profile.trace.json",
+                                                         f"{trace_filter};;JSON 요약 (*.json)")
+            if not path:
+                return
+            if selected == trace_filter and not path.lower().endswith(".trace.json"):
+                path = os.path.splitext(path)[0] + ".trace.json"
+            elif not path.lower().endswith(".json"):
+                path += ".json"
+            PROFILER.export(path)
+            self.statusBar().showMessage(f"계측 기록 저장: {path}", 5000)
+        except Exception as e:
+            print(f"export_profile 오류: {e}")
+            QMessageBox.warning(self, "오류", f"계측 기록 저장 실패: {e}")
+
     def closeEvent(self, event):
         reply = QMessageBox.question(self, 'Exit', '정말 종료하시겠습니까?', QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         if reply == QMessageBox.Yes:
             if self.auto_switching:
                 self.auto_switch_timer.stop()
+            self.prefetcher.shutdown()
+            self.proposal_engine.shutdown()
+            if self.registration_pool is not None:
+                self.registration_pool.shutdown(wait=False, cancel_futures=True)
+            # 진행 중인 저장이 끝날 때까지 대기
+            if self.save_worker is not None:
+                self.save_worker.wait()
+            if self.export_worker is not None:
+                self.export_worker.wait()
+            if self.transfer_worker is not None:
+                self.transfer_worker.wait()
+            if self.save_worker is not None:
+                # wait() 뒤에는 on_save_failed/on_save_finished가 불리지 않으므로 실패/충돌한 이미지를 직접 남김
+                self.dirty_labels.update(self.save_worker.failed_paths)
+                self.dirty_labels.update(self.save_worker.conflicts)
+            if self.box.path:
+                self.image_labels[self.box.path] = self.box.poly_list.copy()
+            if self.store is not None:
+                self.store.close()
+            if self.journal is not None:
+                # 저장된 작업은 저널에서 지워 다음 실행 때 이미 저장한 편집을 복구하겠냐고 묻지 않음
+                self.compact_journal()
+                self.journal.close()
             event.accept()
         else:
             event.ignore()
 
+def warm_up_imports():
+    """
+    창이 뜬 뒤 백그라운드 스레드에서 cv2를 미리 불러 첫 디코딩 지연을 줄임
+    """
+    threading.Thread(target=lambda: __import__('cv2'), daemon=True).start()
+
+
+def report_startup(app):
+    # 창이 처음 그려진 뒤 호출: 모듈 로드부터 걸린 시간을 출력하고 종료 (benchmarks/bench_startup.py에서 사용)
+    print(f"startup {(time.perf_counter() - STARTED) * 1000:.1f} ms", flush=True)
+    app.quit()
+
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     win = change_detection()
     win.show()
     win.setFocus()
+    if "--startup-time" in sys.argv:
+        QTimer.singleShot(0, lambda: report_startup(app))
+    else:
+        QTimer.singleShot(0, warm_up_imports)
     sys.exit(app.exec_())
\ No newline at end of file
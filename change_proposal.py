@@ -0,0 +1,149 @@
+# Base Image / Temporary B 차이로 변화 후보 폴리곤 생성
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from image_prefetch import qimage_to_array
+from raster_source import RasterSource
+
+WORK_SIZE = 1024  # 차이 계산용 축소 영상의 긴 변 길이
+MIN_THRESHOLD = 0.12  # 정규화된 변화량의 최소 임계값 (Otsu 결과가 더 낮아도 이 값 사용)
+MIN_AREA = 64  # 축소 영상 기준 최소 후보 면적(픽셀)
+MAX_CANDIDATES = 200
+PROPOSAL_PAIRS = 64  # 후보를 보관할 최근 이미지 쌍 수
+
+
+def propose_changes(img_a, img_b, work_size=WORK_SIZE, min_threshold=MIN_THRESHOLD, min_area=MIN_AREA,
+                    source_size=None):
+    """
+    두 영상(같은 채널 순서의 uint8 배열)을 축소한 뒤 변화 벡터 크기로 변화 영역을 찾아
+    A 영상 좌표계의 후보 폴리곤 [{'points': [x1, y1, ...], 'class': 0}, ...] 반환.
+    source_size: img_a가 이미 줄인 배열이면 원래 A 영상의 (너비, 높이)
+    """
+    import cv2  # 작업 스레드에서 처음 계산할 때 불러옴 (시작 시간 단축)
+    height, width = img_a.shape[:2]
+    factor = min(1.0, work_size / max(height, width))
+    size = (max(1, int(width * factor)), max(1, int(height * factor)))
+    source_width, source_height = source_size or (width, height)
+    back = np.array([source_width / size[0], source_height / size[1]])  # 축소 좌표 -> A 영상 좌표
+    a = cv2.resize(img_a, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+    b = cv2.resize(img_b, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    # 밝기 차이를 줄이기 위해 채널별 평균/표준편차로 정규화한 뒤 변화 벡터 크기 계산
+    a = (a - a.mean(axis=(0, 1))) / (a.std(axis=(0, 1)) + 1e-6)
+    b = (b - b.mean(axis=(0, 1))) / (b.std(axis=(0, 1)) + 1e-6)
+    magnitude = np.sqrt(((a - b) ** 2).sum(axis=2))
+    magnitude = cv2.GaussianBlur(magnitude, (5, 5), 0)
+    magnitude /= magnitude.max() + 1e-6
+
+    level = (magnitude * 255).astype(np.uint8)
+    otsu, _ = cv2.threshold(level, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = (level > max(otsu, min_threshold * 255)).astype(np.uint8)
+    kernel = np.ones((3, 3), np.uint8)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=2)
+
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    contours = sorted((c for c in contours if cv2.contourArea(c) >= min_area), key=cv2.contourArea, reverse=True)
+    candidates = []
+    for contour in contours[:MAX_CANDIDATES]:
+        approx = cv2.approxPolyDP(contour, 1.5, True).reshape(-1, 2)
+        if len(approx) < 3:
+            continue
+        points = (approx.astype(np.float64) * back).ravel().tolist()
+        candidates.append({'points': points, 'class': 0})
+    return candidates
+
+
+def proposal_input(image, work_size=WORK_SIZE):
+    """
+    화면에 띄운 영상(QPixmap/QImage/RasterSource)을 작업 스레드로 넘길 수 있는 형태로 (GUI 스레드에서 호출).
+    QPixmap은 GUI 스레드에서만 다룰 수 있으므로 긴 변이 work_size의 두 배 이하인 QImage로 줄여서 넘기고,
+    RasterSource는 작업 스레드에서 간격을 두고 읽음 (원본 파일을 다시 디코딩하지 않음)
+    """
+    if isinstance(image, RasterSource):
+        return image
+    limit = 2 * work_size
+    if max(image.width(), image.height()) > limit:
+        image = image.scaled(limit, limit, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return image.toImage() if isinstance(image, QPixmap) else image
+
+
+def work_array(image, work_size=WORK_SIZE):
+    """
+    proposal_input의 결과 -> (높이, 너비, 3) uint8 RGB 배열 (작업 스레드에서 호출)
+    """
+    if isinstance(image, QImage):
+        return qimage_to_array(image)
+    step = max(1, max(image.width(), image.height()) // (2 * work_size))
+    return image.render(0, 0, image.width(), image.height(), step)
+
+
+class ProposalEngine(QObject):
+    """
+    이미지 쌍별 변화 후보를 작업 스레드에서 계산하고 최근 max_pairs개 쌍의 결과를 LRU로 캐시.
+    영상은 이미 디코딩/매핑해 둔 것을 받아 씀
+    """
+    ready = pyqtSignal(str, str)  # (A 경로, B 경로)
+
+    def __init__(self, max_pairs=PROPOSAL_PAIRS):
+        super(ProposalEngine, self).__init__()
+        self.pool = ThreadPoolExecutor(max_workers=1)
+        self.max_pairs = max_pairs
+        # cache/pending은 UI 스레드와 작업 스레드가 함께 쓰므로 lock을 잡고 접근
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # (A 경로, B 경로) -> 후보 목록
+        self.pending = set()
+
+    def get(self, path_a, path_b):
+        key = (path_a, path_b)
+        with self.lock:
+            candidates = self.cache.get(key)
+            if candidates is not None:
+                self.cache.move_to_end(key)
+            return candidates
+
+    def discard(self, path_a, path_b, proposal):
+        """
+        받아들인 후보를 캐시된 목록에서 뺌
+        """
+        with self.lock:
+            candidates = self.cache.get((path_a, path_b))
+            if candidates is not None and proposal in candidates:
+                candidates.remove(proposal)
+
+    def request(self, path_a, path_b, image_a, image_b):
+        """
+        캐시에 없으면 백그라운드 계산을 시작하고, 끝나면 ready 시그널 발생.
+        image_a/image_b: 화면에 띄운 A/B 영상 (QPixmap/QImage/RasterSource)
+        """
+        key = (path_a, path_b)
+        with self.lock:
+            if key in self.cache or key in self.pending:
+                return
+            self.pending.add(key)
+        source_size = (image_a.width(), image_a.height())
+        self.pool.submit(self.work, path_a, path_b, proposal_input(image_a), proposal_input(image_b), source_size)
+
+    def work(self, path_a, path_b, image_a, image_b, source_size):
+        try:
+            candidates = propose_changes(work_array(image_a), work_array(image_b), source_size=source_size)
+        except Exception as e:
+            print(f"propose_changes 오류: {e}")
+            candidates = []
+        key = (path_a, path_b)
+        with self.lock:
+            self.cache[key] = candidates
+            self.cache.move_to_end(key)
+            # 가장 오래 보지 않은 쌍부터 제거
+            while len(self.cache) > self.max_pairs:
+                self.cache.popitem(last=False)
+            self.pending.discard(key)
+        self.ready.emit(path_a, path_b)
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
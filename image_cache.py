@@ -0,0 +1,227 @@
+# 디코딩한 영상, 썸네일, 피라미드 레벨을 디스크에 보관하는 영구 캐시
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from image_decoder import read_image
+from profiler import PROFILER
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".change_detection", "cache")
+CACHE_BYTES = 4 * 1024 * 1024 * 1024  # 캐시 폴더 전체 크기 상한
+# 전체 해상도 디코딩 결과('bgr') 상한 (원본 PNG/JPG보다 몇 배 커서 전체 상한과 따로 둠, 0이면 저장하지 않음).
+# File → Cache settings...에서 바꿀 수 있음. 썸네일과 피라미드 축소 레벨은 이 설정과 관계없이 저장
+FULL_IMAGE_BYTES = 1024 * 1024 * 1024
+THUMB_SIZE = 128  # 썸네일 긴 변 길이
+
+
+def cache_key(path):
+    """
+    경로/수정 시각/크기로 만든 키 (파일이 바뀌면 키도 바뀌어 예전 항목은 자연히 밀려남)
+    """
+    stat = os.stat(path)
+    return hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}".encode('utf-8')).hexdigest()
+
+
+def is_full(name):
+    return name.endswith("_bgr.npy")
+
+
+def make_thumbnail(img, size=THUMB_SIZE):
+    import cv2  # 처음 쓸 때 불러옴 (시작 시간 단축)
+    height, width = img.shape[:2]
+    factor = min(1.0, size / max(height, width))
+    return cv2.resize(img, (max(1, int(width * factor)), max(1, int(height * factor))), interpolation=cv2.INTER_AREA)
+
+
+class DiskCache:
+    """
+    <키>_<종류>.npy 파일(uint8 배열, 메모리 매핑으로 읽음)로 보관.
+    디코딩 결과('bgr', full_bytes > 0일 때만)는 cv2 순서 그대로, 썸네일('thumb')은 RGB 순서.
+    전체 크기가 max_bytes를, 'bgr' 파일 크기 합이 full_bytes를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+    """
+    def __init__(self, root=CACHE_DIR, max_bytes=CACHE_BYTES, full_bytes=FULL_IMAGE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.full_bytes = full_bytes
+        # files/bytes/keys는 UI 스레드, 디코딩 스레드, 쓰기 스레드가 함께 쓰므로 항상 lock을 잡고 접근
+        self.lock = threading.Lock()
+        self.files = None  # 파일 이름 -> [크기, 마지막 사용 시각] (처음 쓸 때 폴더를 한 번 훑음)
+        self.bytes = 0
+        self.full_used = 0  # 'bgr' 파일 크기 합
+        self.keys = {}  # 경로 -> (수정 시각, 크기, 키)
+        # 쓰기는 별도 스레드에서 (디코딩 스레드/GUI 스레드를 막지 않음)
+        self.writer = ThreadPoolExecutor(max_workers=1)
+        self.hits = 0
+        self.misses = 0
+
+    def scan(self):
+        if self.files is not None:
+            return
+        os.makedirs(self.root, exist_ok=True)
+        self.files = {}
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.name.endswith(".npy"):
+                    stat = entry.stat()
+                    self.files[entry.name] = [stat.st_size, stat.st_mtime]
+                    self.bytes += stat.st_size
+                    if is_full(entry.name):
+                        self.full_used += stat.st_size
+        # 예전 설정으로 저장된 전체 해상도 파일이 상한을 넘으면 정리
+        self.evict()
+
+    def key(self, path):
+        stat = os.stat(path)
+        with self.lock:
+            cached = self.keys.get(path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            # 해시는 lock 밖에서 계산 (다른 스레드가 같은 값을 넣어도 결과는 같음)
+            cached = (stat.st_mtime_ns, stat.st_size, cache_key(path))
+            with self.lock:
+                self.keys[path] = cached
+        return cached[2]
+
+    def load(self, path, kind):
+        """
+        캐시된 배열(읽기 전용 메모리 매핑), 없으면 None
+        """
+        try:
+            name = f"{self.key(path)}_{kind}.npy"
+        except OSError:
+            return None
+        with self.lock:
+            self.scan()
+            entry = self.files.get(name)
+            if PROFILER.enabled:
+                PROFILER.count('disk', entry is not None)
+            if entry is None:
+                self.misses += 1
+                return None
+            entry[1] = time.time()
+            self.hits += 1
+        try:
+            file_path = os.path.join(self.root, name)
+            # 다음 실행 때도 사용 순서를 알 수 있도록 수정 시각 갱신
+            os.utime(file_path)
+            return np.load(file_path, mmap_mode='r')
+        except (OSError, ValueError):
+            self.forget(name)
+            return None
+
+    def store(self, path, kind, array):
+        """
+        배열을 백그라운드에서 기록 (array는 호출 후 바뀌지 않아야 함)
+        """
+        try:
+            name = f"{self.key(path)}_{kind}.npy"
+        except OSError:
+            return
+        self.writer.submit(self.write, name, array)
+
+    def write(self, name, array):
+        target = os.path.join(self.root, name)
+        temp = target + ".tmp"
+        try:
+            with self.lock:
+                self.scan()
+                if name in self.files:
+                    return
+            with open(temp, 'wb') as f:
+                np.save(f, np.ascontiguousarray(array))
+            os.replace(temp, target)
+            size = os.path.getsize(target)
+            with self.lock:
+                self.files[name] = [size, time.time()]
+                self.bytes += size
+                if is_full(name):
+                    self.full_used += size
+                self.evict()
+        except Exception as e:
+            print(f"DiskCache 쓰기 오류: {e}")
+
+    def evict(self):
+        """
+        상한을 넘으면 마지막 사용 시각이 오래된 파일부터 삭제 (lock을 잡은 상태에서 호출)
+        """
+        if self.bytes <= self.max_bytes and self.full_used <= self.full_bytes:
+            return
+        for name, (size, _) in sorted(self.files.items(), key=lambda item: item[1][1]):
+            if self.bytes <= self.max_bytes and self.full_used <= self.full_bytes:
+                break
+            if self.bytes <= self.max_bytes and not is_full(name):
+                continue  # 전체 해상도 상한만 넘은 경우
+            try:
+                os.remove(os.path.join(self.root, name))
+            except OSError:
+                pass
+            self.remove_entry(name)
+
+    def remove_entry(self, name):
+        # lock을 잡은 상태에서 호출
+        entry = self.files.pop(name, None)
+        if entry is not None:
+            self.bytes -= entry[0]
+            if is_full(name):
+                self.full_used -= entry[0]
+
+    def forget(self, name):
+        with self.lock:
+            self.remove_entry(name)
+
+    def set_full_bytes(self, full_bytes):
+        """
+        전체 해상도 캐시 상한 변경 (줄이면 넘는 만큼 바로 삭제)
+        """
+        with self.lock:
+            self.full_bytes = full_bytes
+            if self.files is not None:
+                self.evict()
+
+    def load_full(self, path):
+        """
+        캐시된 전체 해상도 BGR 영상 (전체 해상도 캐시를 끈 경우 조회하지 않고 None)
+        """
+        return self.load(path, 'bgr') if self.full_bytes > 0 else None
+
+    def store_decoded(self, path, img):
+        """
+        디코딩된 BGR 영상의 썸네일을 저장. 전체 해상도 캐시를 켰고 영상 하나가 상한 안이면 영상도 저장
+        """
+        if 0 < img.nbytes <= self.full_bytes:
+            self.store(path, 'bgr', img)
+        self.store(path, 'thumb', np.ascontiguousarray(make_thumbnail(img)[:, :, ::-1]))
+
+    def thumbnail(self, path):
+        """
+        캐시된 RGB 썸네일, 없으면 원본(또는 캐시된 전체 영상)에서 만들어 저장
+        """
+        thumb = self.load(path, 'thumb')
+        if thumb is not None:
+            return thumb
+        img = self.load_full(path)
+        if img is None:
+            img = read_image(path)
+        thumb = np.ascontiguousarray(make_thumbnail(img)[:, :, ::-1])  # BGR -> RGB
+        self.store(path, 'thumb', thumb)
+        return thumb
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'files': len(self.files or ()),
+                'bytes': self.bytes,
+                'full_bytes': self.full_used,
+            }
+
+    def shutdown(self):
+        # 대기 중인 쓰기는 버리고 쓰던 파일만 마저 기록
+        self.writer.shutdown(wait=True, cancel_futures=True)
+
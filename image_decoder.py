@@ -0,0 +1,107 @@
+# 영상 디코딩 공용 모듈: 한글 경로 지원, 복사 없는 numpy -> QImage 변환, 영상별 디코딩 시간/추정 메모리 기록
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+from PyQt5.QtGui import QImage
+
+from profiler import profiled
+
+DECODE_LOG_SIZE = 256  # 보관할 최근 디코딩 기록 수
+
+
+def read_image(path, flags=None):
+    """
+    파일을 바이트로 읽어 디코딩 (flags가 없으면 IMREAD_COLOR: (높이, 너비, 3) BGR uint8)
+    """
+    import cv2  # 프로그램 시작을 늦추지 않도록 처음 디코딩할 때 불러옴
+    if flags is None:
+        flags = cv2.IMREAD_COLOR
+    img = cv2.imdecode(np.fromfile(path, np.uint8), flags)  # 한글 경로 문제로 우회.
+    if img is None:
+        raise ValueError(f"cannot decode {path}")
+    return img
+
+
+def array_to_qimage(img, bgr=False):
+    """
+    (높이, 너비, 3) uint8 배열을 복사 없이 감싼 QImage (bgr=True면 BGR 순서 그대로).
+    QImage가 배열 메모리를 그대로 쓰므로 QImage 객체에 배열 참조를 붙여 함께 유지.
+    C++ 쪽으로 넘겨 오래 보관할 때는 QPixmap.fromImage나 copy()로 먼저 옮겨야 함
+    """
+    img = np.ascontiguousarray(img)
+    height, width = img.shape[:2]
+    fmt = QImage.Format_BGR888 if bgr else QImage.Format_RGB888
+    qimage = QImage(img.data, width, height, img.strides[0], fmt)
+    qimage.buffer = img
+    return qimage
+
+
+def decode_qimage(path):
+    return array_to_qimage(read_image(path), bgr=True)
+
+
+class ImageDecoder:
+    """
+    QImage 디코딩 공용 서비스 (작업 스레드에서 호출 가능).
+    디스크 캐시가 있으면 디코딩된 BGR 배열을 먼저 찾고(전체 해상도 캐시를 켠 경우), 없으면 디코딩 후 썸네일 등을 저장.
+    영상마다 (경로, 걸린 시간(초), 추정 최대 버퍼 크기(바이트), 디스크 캐시 사용 여부)를 기록.
+    버퍼 크기는 측정값이 아니라 파일/배열 크기로 계산한 추정치 (여러 작업 스레드가 동시에 디코딩하므로
+    tracemalloc이나 RSS 차이로는 한 영상의 몫을 가려낼 수 없음)
+    """
+    def __init__(self, disk=None):
+        self.disk = disk
+        self.lock = threading.Lock()
+        self.records = deque(maxlen=DECODE_LOG_SIZE)
+        self.latest = {}  # 경로 -> 마지막 기록
+
+    @profiled('decode')
+    def decode(self, path):
+        start = time.perf_counter()
+        img = self.disk.load_full(path) if self.disk is not None else None
+        cached = img is not None
+        if cached:
+            estimate = img.nbytes  # 메모리 매핑이라 실제로는 읽은 페이지만큼만 올라옴
+        else:
+            img = read_image(path)
+            # 압축된 파일 바이트와 디코딩 결과가 동시에 잡혀 있는 순간을 최대로 추정 (cv2 내부 작업 버퍼는 제외)
+            estimate = os.path.getsize(path) + img.nbytes
+            if self.disk is not None:
+                self.disk.store_decoded(path, img)
+        qimage = array_to_qimage(img, bgr=True)
+        self.record(path, time.perf_counter() - start, estimate, cached)
+        return qimage
+
+    def record(self, path, seconds, estimate, cached):
+        entry = (path, seconds, estimate, cached)
+        with self.lock:
+            self.records.append(entry)
+            self.latest[path] = entry
+            if len(self.latest) > DECODE_LOG_SIZE:
+                self.latest.pop(next(iter(self.latest)))
+
+    def describe(self, path):
+        """
+        상태 표시줄용 한 줄 요약 (기록이 없으면 빈 문자열)
+        """
+        with self.lock:
+            entry = self.latest.get(path)
+        if entry is None:
+            return ""
+        _, seconds, estimate, cached = entry
+        source = "디스크 캐시" if cached else "디코딩"
+        return f"{os.path.basename(path)}: {source} {seconds * 1000:.0f} ms, 추정 메모리 약 {estimate / (1024 * 1024):.1f} MB"
+
+    def stats(self):
+        with self.lock:
+            records = list(self.records)
+        decoded = [r for r in records if not r[3]]
+        return {
+            'images': len(records),
+            'cached': len(records) - len(decoded),
+            'mean_ms': sum(r[1] for r in decoded) * 1000 / len(decoded) if decoded else 0.0,
+            'max_ms': max((r[1] for r in decoded), default=0.0) * 1000,
+            'est_peak_bytes': max((r[2] for r in decoded), default=0),
+        }
@@ -0,0 +1,264 @@
+# 이미지 쌍 백그라운드 디코딩 및 캐시
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
+
+from image_cache import THUMB_SIZE, DiskCache, make_thumbnail
+from image_decoder import ImageDecoder, array_to_qimage
+from profiler import PROFILER
+from raster_source import RasterSource, UnsupportedRaster, open_raster, prefers_raster
+from tile_renderer import TilePyramid
+
+PREFETCH_NEXT = 3  # 다음 방향으로 미리 읽을 쌍 수
+PREFETCH_PREV = 1  # 이전 방향으로 미리 읽을 쌍 수
+CACHE_BYTES = 1024 * 1024 * 1024  # 디코딩 캐시 메모리 상한
+# 열어 둘 RasterSource 수 (현재 쌍과 미리 읽는 쌍보다 넉넉하게, 넘으면 오래된 것부터 매핑을 닫음)
+RASTER_SOURCES = 32
+
+
+def qimage_to_array(img):
+    """
+    QImage를 (높이, 너비, 3) RGB uint8 배열로 복사
+    """
+    img = img.convertToFormat(QImage.Format_RGB888)
+    ptr = img.constBits()
+    ptr.setsize(img.bytesPerLine() * img.height())
+    rows = np.frombuffer(ptr, np.uint8).reshape(img.height(), img.bytesPerLine())
+    return rows[:, :img.width() * 3].reshape(img.height(), img.width(), 3).copy()
+
+
+class LevelStore:
+    """
+    TilePyramid의 축소 레벨을 디스크 캐시에서 읽고, 새로 만든 레벨은 캐시에 저장
+    """
+    def __init__(self, disk, path):
+        self.disk = disk
+        self.path = path
+
+    def load(self, level):
+        # 메모리 매핑 배열을 감싼 QImage (타일을 자를 때 필요한 부분만 읽힘)
+        img = self.disk.load(self.path, f"level{level}")
+        return None if img is None else array_to_qimage(img)
+
+    def save(self, level, image):
+        image = image.toImage() if isinstance(image, QPixmap) else image
+        self.disk.store(self.path, f"level{level}", qimage_to_array(image))
+
+
+class ImagePrefetcher(QObject):
+    """
+    주변 이미지 쌍을 스레드 풀에서 미리 디코딩하고 크기 제한 캐시에 보관
+    """
+    decoded = pyqtSignal(str)
+    thumbnail_ready = pyqtSignal(str, object)  # (경로, QImage)
+
+    def __init__(self, max_bytes=CACHE_BYTES, workers=2, disk=None):
+        super(ImagePrefetcher, self).__init__()
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        # 경로 -> QImage(디코딩 직후, 타일로 그릴 큰 영상은 계속) 또는 QPixmap(GUI 스레드 변환 후)
+        self.cache = OrderedDict()
+        self.pending = {}  # 경로 -> Future
+        self.lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        # 디코딩 결과/썸네일/피라미드 레벨 영구 캐시
+        self.disk = disk if disk is not None else DiskCache()
+        self.decoder = ImageDecoder(self.disk)
+        # 썸네일은 별도 스레드에서 (다음 쌍 미리 읽기를 막지 않도록)
+        self.thumb_pool = ThreadPoolExecutor(max_workers=1)
+        self.thumb_pending = set()
+        # 메모리 매핑으로 여는 영상: 경로 -> RasterSource (일반 디코딩 경로면 False), 최근 사용 순
+        self.rasters = OrderedDict()
+        self.raster_options = {'bands': None, 'percentiles': None}
+        self.hits = 0
+        self.misses = 0
+        # 작업 스레드에서 emit되면 GUI 스레드에서 QPixmap으로 변환
+        self.decoded.connect(self.to_pixmap)
+
+    def pixmap(self, path):
+        """
+        캐시에 있으면 바로 반환, 없으면 (진행 중인 작업을 기다리거나) 직접 디코딩.
+        다중 밴드/16비트/대용량 영상은 디코딩하지 않고 RasterSource를,
+        타일로 그릴 큰 영상은 전체 QPixmap 대신 디코딩 배열을 감싼 QImage를 반환
+        """
+        source = self.raster(path)
+        if source:
+            try:
+                source.configure(**self.raster_options)
+            except ValueError as e:
+                print(f"raster 설정 오류: {path}: {e}")
+            return source
+        with self.lock:
+            img = self.cache.get(path)
+            if img is not None:
+                self.cache.move_to_end(path)
+                self.hits += 1
+            else:
+                self.misses += 1
+            future = self.pending.get(path)
+        if PROFILER.enabled:
+            PROFILER.count('prefetch', img is not None)
+        if img is None:
+            img = future.result() if future is not None else self.decoder.decode(path)
+            self.store(path, img)
+        if isinstance(img, QImage):
+            # 다른 스레드의 store가 방금 넣은 항목을 밀어냈을 수 있으므로 캐시를 다시 찾지 않고 변환
+            img = self.to_pixmap(path, img)
+        return img
+
+    def prefetch_around(self, list_a, list_b, index):
+        """
+        index 기준으로 다음 PREFETCH_NEXT, 이전 PREFETCH_PREV 쌍을 백그라운드에서 디코딩
+        """
+        order = list(range(index + 1, index + 1 + PREFETCH_NEXT)) + list(range(index - 1, index - 1 - PREFETCH_PREV, -1))
+        for i in order:
+            for file_list in (list_a, list_b):
+                if 0 <= i < len(file_list):
+                    self.submit(file_list[i])
+
+    def raster(self, path, keep=True):
+        """
+        메모리 매핑 경로로 보여줄 영상이면 RasterSource, 아니면 False (헤더만 읽고 결과를 기억).
+        keep이 아니면 새로 연 소스를 기억하지 않음 (다 쓴 뒤 호출한 쪽에서 close)
+        """
+        with self.lock:
+            source = self.rasters.get(path)
+            if source is not None:
+                self.rasters.move_to_end(path)
+        if source is None:
+            try:
+                source = open_raster(path)
+                source = source if prefers_raster(source) else False
+            except UnsupportedRaster:
+                source = False  # 압축 TIFF 등은 기존 cv2 디코딩으로
+            except Exception as e:
+                print(f"open_raster 오류: {path}: {e}")
+                source = False
+            if keep:
+                evicted = []
+                with self.lock:
+                    source = self.rasters.setdefault(path, source)
+                    while len(self.rasters) > RASTER_SOURCES:
+                        evicted.append(self.rasters.popitem(last=False)[1])
+                # 화면에 남아 있는 소스라도 다음에 읽을 때 다시 매핑되므로 닫아도 됨
+                for old in evicted:
+                    if old:
+                        old.close()
+        return source
+
+    def submit(self, path):
+        if self.raster(path):
+            return  # 전체 디코딩이 필요 없음
+        with self.lock:
+            if path in self.cache or path in self.pending:
+                return
+            self.pending[path] = self.pool.submit(self.work, path)
+
+    def work(self, path):
+        try:
+            img = self.decoder.decode(path)
+        except Exception:
+            # 실패한 작업은 지워서 다음 요청 때 다시 시도 (오류는 pixmap()을 부른 쪽에서 처리)
+            with self.lock:
+                self.pending.pop(path, None)
+            raise
+        self.store(path, img)
+        self.decoded.emit(path)
+        return img
+
+    def request_thumbnail(self, path):
+        """
+        썸네일을 백그라운드에서 읽고(없으면 만들어 디스크에 저장) thumbnail_ready 시그널 발생
+        """
+        with self.lock:
+            if path in self.thumb_pending:
+                return
+            self.thumb_pending.add(path)
+        self.thumb_pool.submit(self.thumb_work, path)
+
+    def thumb_work(self, path):
+        try:
+            # 목록을 훑으며 만드는 썸네일 때문에 열어 둔 소스가 늘지 않도록 기억하지 않음
+            with self.lock:
+                kept = path in self.rasters
+            source = self.raster(path, keep=False)
+            if source:
+                # 간격을 두고 읽어 파일 전체를 읽지 않음
+                step = max(1, max(source.width(), source.height()) // THUMB_SIZE)
+                img = array_to_qimage(make_thumbnail(source.render(0, 0, source.width(), source.height(), step)))
+                if not kept:
+                    source.close()
+            else:
+                img = array_to_qimage(self.disk.thumbnail(path))
+        except Exception as e:
+            print(f"thumbnail 오류: {path}: {e}")
+            return
+        self.thumbnail_ready.emit(path, img)
+
+    def level_store(self, path):
+        return LevelStore(self.disk, path)
+
+    def store(self, path, img):
+        with self.lock:
+            self.pending.pop(path, None)
+            if path in self.cache:
+                self.bytes -= self.image_bytes(self.cache.pop(path))
+            self.cache[path] = img
+            self.bytes += self.image_bytes(img)
+            while self.bytes > self.max_bytes and len(self.cache) > 1:
+                _, old = self.cache.popitem(last=False)
+                self.bytes -= self.image_bytes(old)
+
+    def to_pixmap(self, path, img=None):
+        """
+        QPixmap은 GUI 스레드에서만 만들 수 있으므로 여기서 변환.
+        img가 없으면 캐시에서 찾고, 캐시 항목이 아직 같은 QImage일 때만 변환 결과로 바꿈.
+        타일로 그릴 큰 영상은 변환하지 않음 (TilePyramid가 보이는 타일만 변환)
+        """
+        if img is None:
+            with self.lock:
+                img = self.cache.get(path)
+        if not isinstance(img, QImage) or TilePyramid.wants_tiles(img):
+            return img
+        pixmap = QPixmap.fromImage(img)
+        with self.lock:
+            if self.cache.get(path) is img:
+                self.cache[path] = pixmap
+        return pixmap
+
+    def clear(self):
+        with self.lock:
+            self.cache.clear()
+            rasters = list(self.rasters.values())
+            self.rasters.clear()
+            self.bytes = 0
+        for source in rasters:
+            if source:
+                source.close()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'cached': len(self.cache),
+            'bytes': self.bytes,
+            'disk': self.disk.stats(),
+            'decode': self.decoder.stats(),
+        }
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.thumb_pool.shutdown(wait=False, cancel_futures=True)
+        self.disk.shutdown()
+
+    @staticmethod
+    def image_bytes(img):
+        if isinstance(img, QImage):
+            return img.bytesPerLine() * img.height()
+        return img.width() * img.height() * 4
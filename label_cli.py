@@ -0,0 +1,108 @@
+# 라벨 파일 일괄 처리 CLI (Qt 없이 실행)
+# 사용법:
+#   python label_cli.py validate <디렉터리...> [-j 작업 수] [--json]
+#   python label_cli.py convert <디렉터리...> --to npz|csv
+#   python label_cli.py summary <디렉터리...>
+import argparse
+import json
+import os
+import sys
+from multiprocessing import Pool
+
+from label_io import (
+    csv_to_npz, find_label_files, npz_to_csv, read_any, summarize_labels, validate_labels
+)
+
+
+def validate_file(path):
+    try:
+        problems = validate_labels(read_any(path))
+    except Exception as e:
+        problems = [f"parse error: {e}"]
+    return {'path': path, 'ok': not problems, 'problems': problems}
+
+
+def convert_file(args):
+    path, target = args
+    try:
+        if target == "npz" and path.endswith(".csv"):
+            out = csv_to_npz(path)
+        elif target == "csv" and path.endswith(".npz"):
+            out = npz_to_csv(path)
+        else:
+            return {'path': path, 'ok': True, 'skipped': True}
+        return {'path': path, 'ok': True, 'output': out}
+    except Exception as e:
+        return {'path': path, 'ok': False, 'problems': [str(e)]}
+
+
+def summarize_file(path):
+    try:
+        return dict(summarize_labels(read_any(path)), path=path, ok=True)
+    except Exception as e:
+        return {'path': path, 'ok': False, 'problems': [f"parse error: {e}"]}
+
+
+def iter_files(roots):
+    for root in roots:
+        if os.path.isfile(root):
+            yield root
+        else:
+            yield from find_label_files(root)
+
+
+def print_result(result, as_json):
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False), flush=True)
+        return
+    if not result['ok']:
+        print(f"FAIL {result['path']}")
+        for problem in result['problems']:
+            print(f"     {problem}")
+    elif 'polygons' in result:
+        print(f"{result['polygons']:>7} {result['vertices']:>9}  {result['path']}")
+    elif 'output' in result:
+        print(f"OK   {result['path']} -> {result['output']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate, convert and summarize label files without starting Qt.")
+    parser.add_argument("command", choices=["validate", "convert", "summary"])
+    parser.add_argument("paths", nargs="+", help="label directories or files")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--to", choices=["npz", "csv"], default="npz", help="convert target format")
+    parser.add_argument("--json", action="store_true", help="print one JSON object per file")
+    args = parser.parse_args(argv)
+
+    files = iter_files(args.paths)
+    if args.command == "validate":
+        func, tasks = validate_file, files
+    elif args.command == "convert":
+        func, tasks = convert_file, ((path, args.to) for path in files)
+    else:
+        func, tasks = summarize_file, files
+
+    total = failed = polygons = 0
+    classes = {}
+    with Pool(args.jobs) as pool:
+        # 끝나는 순서대로 바로 출력
+        for result in pool.imap_unordered(func, tasks, chunksize=16):
+            total += 1
+            failed += not result['ok']
+            polygons += result.get('polygons', 0)
+            for class_number, count in result.get('classes', {}).items():
+                classes[class_number] = classes.get(class_number, 0) + count
+            print_result(result, args.json)
+
+    summary = {'files': total, 'failed': failed}
+    if args.command == "summary":
+        summary.update(polygons=polygons, classes=classes)
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    else:
+        print(", ".join(f"{key}={value}" for key, value in summary.items()), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+# 라벨 파일 입출력
+# - CSV: 클래스 번호 한 줄 + 좌표 한 줄 (x1,y1,x2,y2,...)
+# - NPZ: 모든 좌표를 이어 붙인 coords + 폴리곤 경계 offsets + classes 배열
+import os
+
+import numpy as np
+
+
+def label_csv_path(image_path):
+    """
+    이미지 경로에 대응하는 label/<이름>_Label.csv 경로 (change_detection_v5)
+    """
+    (filepath, filename) = os.path.split(image_path)
+    csv_filename = os.path.splitext(filename)[0][:-2] + "_Label.csv"
+    return os.path.join(filepath, "label", csv_filename)
+
+
+def gt_csv_path(image_path):
+    """
+    이미지 경로에 대응하는 label/<이름>_GT.csv 경로 (main_detection_label_lsh_v4)
+    """
+    (filepath, filename) = os.path.split(image_path)
+    csv_filename = os.path.splitext(filename)[0] + "_GT.csv"
+    return os.path.join(filepath, "label", csv_filename)
+
+
+def npz_path(csv_path):
+    """
+    CSV 라벨 경로와 같은 이름의 바이너리 라벨 경로 (_Label.npz / _GT.npz)
+    """
+    return os.path.splitext(csv_path)[0] + ".npz"
+
+
+def format_points(points, drop_nan=True):
+    """
+    쉼표로 구분된 좌표 문자열 생성 (drop_nan이면 NaN을 한 번에 걸러냄)
+    """
+    arr = np.asarray(points, dtype=np.float64)
+    if drop_nan:
+        arr = arr[~np.isnan(arr)]
+    return ','.join(map(str, arr.tolist()))
+
+
+def read_labels(csv_path):
+    """
+    CSV 라벨 파일을 한 번만 읽어 poly_list로 변환 (NaN 패딩 없음)
+    """
+    poly_list = []
+    with open(csv_path, 'r', encoding='utf_8_sig') as f:
+        content = f.readlines()
+    for i in range(0, len(content) - 1, 2):
+        class_number = int(content[i].strip())
+        points_str = content[i + 1].strip().split(',')
+        points = [float(coord) for coord in points_str]
+        poly_list.append({'points': points, 'class': class_number})
+    return poly_list
+
+
+def write_labels(csv_path, poly_list, drop_nan=True):
+    """
+    임시 파일에 모두 쓴 뒤 이름을 바꿔 원자적으로 저장
+    """
+    os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+    tmp_path = csv_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf_8_sig') as f:
+        for poly_dict in poly_list:
+            # Write the class number on its own row, coordinates on the next row
+            f.write(f"{poly_dict['class']}\n")
+            f.write(f"{format_points(poly_dict['points'], drop_nan)}\n")
+    os.replace(tmp_path, csv_path)
+
+
+def pack_labels(poly_list):
+    """
+    poly_list -> (coords float64, offsets int64, classes int32)
+    """
+    counts = np.fromiter((len(d['points']) for d in poly_list), np.int64, len(poly_list))
+    offsets = np.zeros(len(poly_list) + 1, np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    coords = np.empty(offsets[-1], np.float64)
+    for i, poly_dict in enumerate(poly_list):
+        coords[offsets[i]:offsets[i + 1]] = poly_dict['points']
+    classes = np.fromiter((d['class'] for d in poly_list), np.int32, len(poly_list))
+    return coords, offsets, classes
+
+
+def unpack_labels(coords, offsets, classes):
+    flat = coords.tolist()
+    bounds = offsets.tolist()
+    return [{'points': flat[bounds[i]:bounds[i + 1]], 'class': c} for i, c in enumerate(classes.tolist())]
+
+
+def write_labels_npz(path, poly_list):
+    """
+    바이너리(NPZ) 라벨 저장, CSV와 마찬가지로 임시 파일 후 이름 변경
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    coords, offsets, classes = pack_labels(poly_list)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, coords=coords, offsets=offsets, classes=classes)
+    os.replace(tmp_path, path)
+
+
+def read_labels_npz(path):
+    with np.load(path) as data:
+        return unpack_labels(data['coords'], data['offsets'], data['classes'])
+
+
+def read_label_file(csv_path):
+    """
+    같은 이름의 NPZ가 CSV보다 새롭거나 CSV가 없으면 NPZ를, 아니면 CSV를 읽음.
+    둘 다 없으면 None
+    """
+    binary_path = npz_path(csv_path)
+    has_csv = os.path.exists(csv_path)
+    if os.path.exists(binary_path) and (not has_csv or os.path.getmtime(binary_path) >= os.path.getmtime(csv_path)):
+        return read_labels_npz(binary_path)
+    if has_csv:
+        return read_labels(csv_path)
+    return None
+
+
+def write_label_file(csv_path, poly_list, binary=False, drop_nan=True):
+    """
+    CSV를 저장하고, binary이면 같은 이름의 NPZ도 함께 저장
+    """
+    write_labels(csv_path, poly_list, drop_nan)
+    if binary:
+        write_labels_npz(npz_path(csv_path), poly_list)
+
+
+def csv_to_npz(csv_path, binary_path=None):
+    """
+    CSV -> NPZ 무손실 변환 (NaN 패딩까지 그대로 보존)
+    """
+    binary_path = binary_path or npz_path(csv_path)
+    write_labels_npz(binary_path, read_labels(csv_path))
+    return binary_path
+
+
+def npz_to_csv(binary_path, csv_path=None):
+    """
+    NPZ -> CSV 무손실 변환 (float repr로 기록하므로 값이 그대로 복원됨)
+    """
+    csv_path = csv_path or os.path.splitext(binary_path)[0] + ".csv"
+    write_labels(csv_path, read_labels_npz(binary_path), drop_nan=False)
+    return csv_path
+
+
+# ---- 디렉터리 단위 처리 (GUI 없이 사용) ----
+
+LABEL_SUFFIXES = ("_Label.csv", "_GT.csv", "_Label.npz", "_GT.npz")
+VALID_CLASSES = range(1, 6)  # 1: 건축물, 2: 도로, 3: 녹지, 4: 산불피해, 5: 수계
+
+
+def is_label_file(filename):
+    return filename.endswith(LABEL_SUFFIXES)
+
+
+def find_label_files(root):
+    """
+    root 아래 label 파일 경로를 디렉터리를 읽는 대로 하나씩 반환
+    """
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            if is_label_file(filename):
+                yield os.path.join(dirpath, filename)
+
+
+def read_any(path):
+    """
+    확장자에 따라 CSV 또는 NPZ 라벨 파일 읽기
+    """
+    if path.endswith(".npz"):
+        return read_labels_npz(path)
+    return read_labels(path)
+
+
+def validate_labels(poly_list):
+    """
+    폴리곤 목록의 문제점을 문자열 목록으로 반환 (문제 없으면 빈 목록)
+    """
+    problems = []
+    for i, poly_dict in enumerate(poly_list):
+        arr = np.asarray(poly_dict['points'], dtype=np.float64)
+        if poly_dict['class'] not in VALID_CLASSES:
+            problems.append(f"polygon {i}: invalid class {poly_dict['class']}")
+        if len(arr) % 2:
+            problems.append(f"polygon {i}: odd number of coordinates ({len(arr)})")
+        valid = arr[~np.isnan(arr)]
+        if len(valid) < len(arr):
+            problems.append(f"polygon {i}: {len(arr) - len(valid)} NaN coordinates")
+        if len(valid) < 6:
+            problems.append(f"polygon {i}: fewer than 3 vertices")
+        if len(valid) and valid.min() < 0:
+            problems.append(f"polygon {i}: negative coordinates")
+    return problems
+
+
+def summarize_labels(poly_list):
+    """
+    클래스별 폴리곤 수와 전체 꼭짓점 수
+    """
+    classes = {}
+    vertices = 0
+    for poly_dict in poly_list:
+        classes[poly_dict['class']] = classes.get(poly_dict['class'], 0) + 1
+        arr = np.asarray(poly_dict['points'], dtype=np.float64)
+        vertices += int(np.count_nonzero(~np.isnan(arr))) // 2
+    return {'polygons': len(poly_list), 'vertices': vertices, 'classes': classes}
@@ -0,0 +1,138 @@
+# 라벨 편집 선기록(write-ahead) 저널: 비정상 종료 시 저장하지 않은 작업 복구용
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+
+from undo_history import HistoryManager
+
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".change_detection", "journals")
+FLUSH_INTERVAL = 0.5  # 기록을 모아서 디스크에 쓰는 간격(초)
+
+
+def journal_path(workspace):
+    """
+    작업 폴더(또는 프로젝트 파일)마다 따로 쓰는 저널 경로 (다른 폴더를 연 두 창의 기록이 섞이지 않음)
+    """
+    workspace = os.path.normcase(os.path.abspath(workspace))
+    digest = hashlib.sha1(workspace.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(JOURNAL_DIR, f"{os.path.basename(workspace)}_{digest}.jsonl")
+
+
+def encode_polys(items):
+    return [[poly_dict['class'], list(poly_dict['points'])] for poly_dict in items]
+
+
+def decode_polys(items):
+    return [{'points': points, 'class': class_number} for class_number, points in items]
+
+
+class LabelJournal:
+    """
+    폴리곤 추가/삭제/undo/redo를 한 줄씩 추가 기록하는 저널.
+    GUI 스레드에서는 큐에 넣기만 하고, 직렬화와 디스크 쓰기는 백그라운드 스레드가 묶어서 처리
+    """
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.queue = queue.Queue()
+        self.based = set()  # 현재 저널에 기준 상태가 기록된 이미지
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def record(self, image_path, op, kind, items, before):
+        """
+        op: 'add' | 'remove' | 'undo' | 'redo', kind: 실제로 일어난 변화 ('add' | 'remove'),
+        items: [(행 번호, 폴리곤 dict), ...], before: 변경 전 poly_list
+        """
+        if image_path not in self.based:
+            # 이미지별 첫 기록 앞에 변경 전 상태를 한 번 남김
+            self.based.add(image_path)
+            self.queue.put(('base', image_path, list(before)))
+        self.queue.put(('edit', image_path, op, kind, list(items)))
+
+    def compact(self, snapshots):
+        """
+        저장 후 호출: 아직 저장되지 않은 이미지의 현재 상태만 남기고 저널을 다시 씀
+        """
+        self.based = set(snapshots)
+        self.queue.put(('compact', {path: list(polys) for path, polys in snapshots.items()}))
+
+    def close(self):
+        self.queue.put(None)
+        self.thread.join(timeout=5)
+
+    @staticmethod
+    def encode(item):
+        if item[0] == 'base':
+            _, image_path, polys = item
+            record = {'op': 'base', 'image': image_path, 'polys': encode_polys(polys)}
+        else:
+            _, image_path, op, kind, items = item
+            record = {'op': op, 'image': image_path, 'kind': kind,
+                      'rows': [row for row, _ in items], 'polys': encode_polys([p for _, p in items])}
+        return json.dumps(record, ensure_ascii=False) + "\n"
+
+    def run(self):
+        f = open(self.path, 'a', encoding='utf-8')
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                for item in batch:
+                    if item is None:
+                        running = False
+                        break
+                    if item[0] == 'compact':
+                        f.close()
+                        self.rewrite(item[1])
+                        f = open(self.path, 'a', encoding='utf-8')
+                    else:
+                        f.write(self.encode(item))
+                f.flush()
+                os.fsync(f.fileno())
+            except Exception as e:
+                print(f"journal 오류: {e}")
+        f.close()
+
+    def rewrite(self, snapshots):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for image_path, polys in snapshots.items():
+                f.write(self.encode(('base', image_path, polys)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def recover(path):
+        """
+        저널을 재생해 이미지 경로별 poly_list를 복원 (마지막 줄이 잘려 있으면 그 앞까지만)
+        """
+        state = {}
+        if not os.path.exists(path):
+            return state
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                image_path = record['image']
+                if record['op'] == 'base':
+                    state[image_path] = decode_polys(record['polys'])
+                elif image_path in state:
+                    items = list(zip(record['rows'], decode_polys(record['polys'])))
+                    HistoryManager.apply(state[image_path], (record['kind'], items))
+        return state
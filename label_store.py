@@ -0,0 +1,200 @@
+# 프로젝트 라벨 저장소: 여러 작업자가 함께 쓰는 SQLite(WAL) 데이터베이스
+# - images: 이미지별 한 행 (경로, 버전, 마지막 저장한 사람/시각)
+# - polygons: (image_id, row) 기본 키로 묶인 폴리곤 행 (좌표는 float64 BLOB, 경계 상자 색인)
+# - 저장할 때 읽었던 버전과 현재 버전이 다르면 VersionConflict (낙관적 동시성 제어)
+import getpass
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+from label_io import label_csv_path, read_label_file, write_label_file
+
+BUSY_TIMEOUT_MS = 10000  # 다른 작업자가 쓰는 중일 때 기다리는 최대 시간
+BATCH_IMAGES = 256  # 가져오기에서 한 트랜잭션으로 묶는 이미지 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    version INTEGER NOT NULL,
+    updated_by TEXT,
+    updated_at REAL
+);
+CREATE TABLE IF NOT EXISTS polygons (
+    image_id INTEGER NOT NULL REFERENCES images(id) ON DELETE CASCADE,
+    row INTEGER NOT NULL,
+    class INTEGER NOT NULL,
+    points BLOB NOT NULL,
+    x0 REAL, y0 REAL, x1 REAL, y1 REAL,
+    PRIMARY KEY (image_id, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS polygons_class ON polygons (class);
+CREATE INDEX IF NOT EXISTS polygons_bbox ON polygons (image_id, x0, x1, y0, y1);
+"""
+
+
+class VersionConflict(Exception):
+    """
+    다른 작업자가 먼저 저장해 읽었던 버전(expected)과 저장소 버전(current)이 다름
+    """
+    def __init__(self, path, expected, current):
+        super(VersionConflict, self).__init__(f"{path}: version {expected} -> {current}")
+        self.path = path
+        self.expected = expected
+        self.current = current
+
+
+def polygon_row(image_id, row, poly_dict):
+    arr = np.asarray(poly_dict['points'], dtype=np.float64)
+    xs, ys = arr[0::2], arr[1::2]
+    bounds = (None,) * 4
+    if len(ys) and not np.isnan(arr).all():
+        bounds = (float(np.nanmin(xs)), float(np.nanmin(ys)), float(np.nanmax(xs)), float(np.nanmax(ys)))
+    return (image_id, row, int(poly_dict['class']), arr.tobytes()) + bounds
+
+
+class ProjectStore:
+    """
+    연결 하나는 한 스레드에서만 사용 (저장 스레드는 같은 경로로 따로 엶).
+    WAL 모드라 읽기는 다른 작업자의 쓰기를 기다리지 않음.
+    경로는 데이터베이스 파일이 있는 폴더 기준 상대 경로로 저장해 작업자마다 마운트 위치가 달라도 같은 행을 가리킴
+    """
+    def __init__(self, path):
+        self.path = os.path.abspath(path)
+        self.root = os.path.dirname(self.path)
+        self.user = getpass.getuser()
+        # 트랜잭션은 직접 BEGIN/COMMIT으로 관리
+        self.conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+        self.journal_mode = self.conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def key(self, image_path):
+        path = os.path.abspath(image_path)
+        try:
+            rel = os.path.relpath(path, self.root)
+        except ValueError:  # 다른 드라이브
+            rel = os.pardir
+        if rel.split(os.sep)[0] != os.pardir:
+            path = rel
+        return path.replace(os.sep, '/')
+
+    def image_path(self, key):
+        path = key.replace('/', os.sep)
+        return path if os.path.isabs(path) else os.path.join(self.root, path)
+
+    def version(self, image_path):
+        """
+        저장소 버전 (저장된 적 없으면 0)
+        """
+        found = self.conn.execute("SELECT version FROM images WHERE path = ?", (self.key(image_path),)).fetchone()
+        return found[0] if found else 0
+
+    def versions(self):
+        """
+        {키(key()의 결과): 버전} (라벨 유무 표시용, 폴리곤은 읽지 않음)
+        """
+        return dict(self.conn.execute("SELECT path, version FROM images"))
+
+    def load(self, image_path):
+        """
+        (poly_list 또는 None, 버전). 한 번의 읽기 트랜잭션이라 버전과 폴리곤이 항상 같은 저장 시점의 것
+        """
+        self.conn.execute("BEGIN")
+        try:
+            found = self.conn.execute("SELECT id, version FROM images WHERE path = ?",
+                                      (self.key(image_path),)).fetchone()
+            if found is None:
+                return None, 0
+            rows = self.conn.execute("SELECT class, points FROM polygons WHERE image_id = ? ORDER BY row", (found[0],))
+            poly_list = [{'points': np.frombuffer(points, np.float64).tolist(), 'class': class_number}
+                         for class_number, points in rows]
+            return poly_list, found[1]
+        finally:
+            self.conn.execute("COMMIT")
+
+    def save(self, image_path, poly_list, expected):
+        """
+        expected: 편집을 시작할 때 읽은 버전. 저장소 버전이 그대로일 때만 폴리곤을 통째로 바꾸고 새 버전을 반환
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = self.write(image_path, poly_list, expected)
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+        return version
+
+    def write(self, image_path, poly_list, expected=None):
+        """
+        트랜잭션 안에서 호출. expected가 None이면 버전을 확인하지 않음
+        """
+        key = self.key(image_path)
+        found = self.conn.execute("SELECT id, version FROM images WHERE path = ?", (key,)).fetchone()
+        current = found[1] if found else 0
+        if expected is not None and current != expected:
+            raise VersionConflict(image_path, expected, current)
+        if found is None:
+            image_id = self.conn.execute("INSERT INTO images (path, version, updated_by, updated_at) VALUES (?, 1, ?, ?)",
+                                         (key, self.user, time.time())).lastrowid
+        else:
+            image_id = found[0]
+            self.conn.execute("UPDATE images SET version = ?, updated_by = ?, updated_at = ? WHERE id = ?",
+                              (current + 1, self.user, time.time(), image_id))
+            self.conn.execute("DELETE FROM polygons WHERE image_id = ?", (image_id,))
+        self.conn.executemany("INSERT INTO polygons VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                              (polygon_row(image_id, row, p) for row, p in enumerate(poly_list)))
+        return current + 1
+
+    def import_csv(self, image_paths, overwrite=False, callback=None):
+        """
+        이미지별 _Label.csv(.npz가 더 최신이면 npz)를 BATCH_IMAGES개씩 읽어 한 트랜잭션으로 씀
+        (파일은 트랜잭션 밖에서 읽어 다른 작업자의 저장을 오래 막지 않음).
+        overwrite가 아니면 이미 저장소에 있는 이미지는 건너뜀. callback(처리한 수, 전체 수). 가져온 수 반환
+        """
+        imported = 0
+        image_paths = list(image_paths)
+        for start in range(0, len(image_paths), BATCH_IMAGES):
+            chunk = image_paths[start:start + BATCH_IMAGES]
+            existing = set() if overwrite else set(self.versions())
+            labels = []
+            for image_path in chunk:
+                if self.key(image_path) not in existing:
+                    poly_list = read_label_file(label_csv_path(image_path))
+                    if poly_list is not None:
+                        labels.append((image_path, poly_list))
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for image_path, poly_list in labels:
+                    try:
+                        # 읽는 사이에 다른 작업자가 저장한 이미지는 덮어쓰지 않음
+                        self.write(image_path, poly_list, None if overwrite else 0)
+                        imported += 1
+                    except VersionConflict:
+                        pass
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            if callback is not None:
+                callback(start + len(chunk), len(image_paths))
+        return imported
+
+    def export_csv(self, binary=False, callback=None):
+        """
+        저장소의 모든 이미지 라벨을 이미지 옆 label/<이름>_Label.csv로 씀. 내보낸 수 반환
+        """
+        paths = [self.image_path(key) for key in sorted(self.versions())]
+        for done, image_path in enumerate(paths, 1):
+            poly_list, _ = self.load(image_path)
+            write_label_file(label_csv_path(image_path), poly_list, binary)
+            if callback is not None:
+                callback(done, len(paths))
+        return len(paths)
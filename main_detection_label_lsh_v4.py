@@ -1,5 +1,4 @@
 # author: LSH <Change detection tool 폴리곤 작업>
-import pandas as pd
 import numpy as np
 import os
 import sys
@@ -16,6 +15,7 @@ from PyQt5.QtWidgets import (
     QFileDialog, QMenu, QFontDialog
 )
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
+from label_io import gt_csv_path, read_label_file, write_label_file
 
 # 전역 예외 처리기
 def exception_hook(exctype, value, tb):
@@ -335,6 +335,8 @@ class change_detection(QMainWindow):
         undoAct.setShortcut('Ctrl+Z')
         redoAct = QAction('Redo', self, triggered=self.redo)
         redoAct.setShortcut('Ctrl+Y')
+        # 저장 시 NPZ 바이너리 라벨도 함께 기록
+        self.binaryAct = QAction('Save binary labels (.npz)', self, checkable=True)
         exitAct = QAction('Exit', self)
         exitAct.setShortcut('Ctrl+Q')
         exitAct.triggered.connect(self.close)
@@ -342,7 +344,7 @@ class change_detection(QMainWindow):
         bar = self.menuBar()
         file = bar.addMenu("File")
         edit = bar.addMenu("Help")
-        file.addActions([importAct, saveAct, undoAct, redoAct, exitAct])
+        file.addActions([importAct, saveAct, self.binaryAct, undoAct, redoAct, exitAct])
         edit.addAction("Question : dlgkstn68@naver.com, LEE-SEUNG-HEON")
         edit.addAction("URL : https://github.com/chartgod/Changedetection_labelingtool")
 
@@ -655,35 +657,10 @@ class change_detection(QMainWindow):
             QMessageBox.warning(self, "오류", f"이미지 로드 실패: {e}")
 
     def load_labels_from_file(self):
-        (label_path, filename) = os.path.split(self.box.path)
-        csv_filename = os.path.splitext(filename)[0] + "_GT.csv"
-        csv_filepath = os.path.join(label_path, "label", csv_filename)
-
-        if os.path.exists(csv_filepath):
-            poly_list = []
-            max_points = 0
-
-            # Read the file and calculate the maximum number of coordinates
-            with open(csv_filepath, 'r', encoding='utf_8_sig') as f:
-                content = f.readlines()
-                for i in range(1, len(content), 2):
-                    points_str = content[i].strip().split(',')
-                    max_points = max(max_points, len(points_str))
-
-            # Load the polygons and pad with NaN where necessary
-            with open(csv_filepath, 'r', encoding='utf_8_sig') as f:
-                content = f.readlines()
-                for i in range(0, len(content), 2):
-                    class_number = int(content[i].strip())
-                    points_str = content[i+1].strip().split(',')
-                    points = [float(coord) for coord in points_str]
-
-                    # Pad the points with NaN if they have fewer than max_points coordinates
-                    while len(points) < max_points:
-                        points.append(np.nan)
-
-                    poly_list.append({'points': points, 'class': class_number})
+        # _GT.npz가 더 최신이면 바이너리 라벨을, 아니면 _GT.csv를 한 번만 읽음 (NaN 패딩 없음)
+        poly_list = read_label_file(gt_csv_path(self.box.path))
 
+        if poly_list is not None:
             self.box.poly_list = poly_list
             self.image_labels[self.box.path] = poly_list
 
@@ -737,24 +714,9 @@ class change_detection(QMainWindow):
                 QMessageBox.information(self, "경고", "라벨을 저장할 이미지가 없습니다.")
                 return
 
-            (filepath, filename) = os.path.split(self.box.path)
-            csv_filename = os.path.splitext(filename)[0] + "_GT.csv"  # Save as .csv file
-            label_dir = os.path.join(filepath, "label")
-            if not os.path.exists(label_dir):
-                os.makedirs(label_dir)
-
-            # Open file and write data
-            with open(os.path.join(label_dir, csv_filename), 'w', encoding='utf_8_sig') as f:
-                for poly_dict in self.box.poly_list:
-                    class_number = poly_dict['class']
-                    points = poly_dict['points']
-
-                    # Write the class number on its own row
-                    f.write(f"{class_number}\n")
-
-                    # Write the coordinates on the next row, each coordinate in a separate "cell"
-                    point_str = ','.join(map(str, points))  # Write each coordinate separated by a comma
-                    f.write(f"{point_str}\n")
+            # _GT.csv (선택 시 _GT.npz도) 저장
+            write_label_file(gt_csv_path(self.box.path), self.box.poly_list,
+                             self.binaryAct.isChecked(), drop_nan=False)
 
             QMessageBox.information(self, "저장", "성공적으로 저장되었습니다.")
             self.set_list()
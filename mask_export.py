@@ -0,0 +1,187 @@
+# 폴리곤 라벨 -> 픽셀 단위 클래스 마스크 / 변화 마스크 내보내기
+# 사용법: python mask_export.py <디렉터리...> [-j 작업 수] [--format png|npy]
+import argparse
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from image_decoder import read_image
+from label_io import find_label_files, read_label_file
+from raster_source import UnsupportedRaster, open_raster
+
+STRIP_ROWS = 2048  # 한 번에 래스터화하는 행 수 (큰 영상도 메모리 일정)
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+def image_size(path):
+    """
+    (높이, 너비). PNG와 비압축 TIFF/ENVI는 헤더만 읽고, 그 외 형식은 디코딩해서 확인
+    """
+    with open(path, 'rb') as f:
+        head = f.read(24)
+    if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", head[16:24])
+        return height, width
+    try:
+        source = open_raster(path)
+        return source.height(), source.width()
+    except UnsupportedRaster:
+        pass
+    return read_image(path, cv2.IMREAD_UNCHANGED).shape[:2]
+
+
+def image_for_label(label_path):
+    """
+    label/<이름>_Label.csv 또는 label/<이름>_GT.csv에 대응하는 원본 이미지 경로 (없으면 None).
+    _Label은 이미지 이름 끝 2글자를 뗀 이름이므로 상위 폴더에서 찾아봄
+    """
+    label_dir, filename = os.path.split(label_path)
+    image_dir = os.path.dirname(label_dir)
+    stem = os.path.splitext(filename)[0]
+    if stem.endswith("_GT"):
+        name, cut = stem[:-3], 0
+    else:
+        name, cut = stem[:-6], 2
+    for candidate in sorted(os.listdir(image_dir)):
+        base, ext = os.path.splitext(candidate)
+        if ext.lower() in IMAGE_EXTS and (base[:-cut] if cut else base) == name:
+            return os.path.join(image_dir, candidate)
+    return None
+
+
+def polygon_arrays(poly_list):
+    """
+    poly_list -> [(클래스, (n, 1, 2) int32 꼭짓점, (y0, y1))], NaN 제거
+    """
+    result = []
+    for poly_dict in poly_list:
+        arr = np.asarray(poly_dict['points'], np.float64)
+        arr = arr[:len(arr) // 2 * 2].reshape(-1, 2)
+        arr = arr[~np.isnan(arr).any(axis=1)]
+        if len(arr) < 3:
+            continue
+        pts = np.rint(arr).astype(np.int32).reshape(-1, 1, 2)
+        result.append((poly_dict['class'], pts, (int(arr[:, 1].min()), int(arr[:, 1].max()))))
+    return result
+
+
+def rasterize_into(out, polys, strip_rows=STRIP_ROWS):
+    """
+    out(높이 x 너비 uint8, memmap 가능)에 가로 띠 단위로 클래스 번호를 채움 (나중 폴리곤이 위).
+    fillPoly는 한 번에 넘긴 윤곽선들을 짝홀 규칙으로 채워 겹친 부분이 구멍이 되므로 폴리곤마다 따로 채움
+    """
+    height = out.shape[0]
+    for y0 in range(0, height, strip_rows):
+        y1 = min(height, y0 + strip_rows)
+        strip = np.zeros((y1 - y0, out.shape[1]), np.uint8)
+        offset = np.array([0, y0], np.int32)
+        for class_number, pts, (py0, py1) in polys:
+            if py1 < y0 or py0 >= y1:
+                continue
+            cv2.fillPoly(strip, [pts - offset], int(class_number))
+        out[y0:y1] = strip
+
+
+def mask_paths(image_path, fmt):
+    image_dir, filename = os.path.split(image_path)
+    stem = os.path.splitext(filename)[0]
+    mask_dir = os.path.join(image_dir, "mask")
+    return (os.path.join(mask_dir, f"{stem}_class.{fmt}"),
+            os.path.join(mask_dir, f"{stem}_change.{fmt}"))
+
+
+def export_masks(image_path, poly_list, fmt="png"):
+    """
+    이미지 한 장의 클래스 마스크(uint8, 0=배경)와 변화 마스크(0/255) 저장. 처리한 픽셀 수 반환
+    """
+    height, width = image_size(image_path)
+    class_path, change_path = mask_paths(image_path, fmt)
+    os.makedirs(os.path.dirname(class_path), exist_ok=True)
+    polys = polygon_arrays(poly_list)
+    if fmt == "npy":
+        # 디스크에 바로 띠 단위로 기록
+        class_mask = np.lib.format.open_memmap(class_path, mode='w+', dtype=np.uint8, shape=(height, width))
+        rasterize_into(class_mask, polys)
+        change_mask = np.lib.format.open_memmap(change_path, mode='w+', dtype=np.uint8, shape=(height, width))
+        for y0 in range(0, height, STRIP_ROWS):
+            change_mask[y0:y0 + STRIP_ROWS] = (class_mask[y0:y0 + STRIP_ROWS] > 0) * np.uint8(255)
+        class_mask.flush()
+        change_mask.flush()
+        del class_mask, change_mask
+    else:
+        class_mask = np.zeros((height, width), np.uint8)
+        rasterize_into(class_mask, polys)
+        # imencode + tofile로 한글 경로 지원
+        cv2.imencode(".png", class_mask)[1].tofile(class_path)
+        cv2.imencode(".png", (class_mask > 0).astype(np.uint8) * 255)[1].tofile(change_path)
+    return height * width
+
+
+def export_job(job):
+    image_path, poly_list, label_path, fmt = job
+    try:
+        if poly_list is None:
+            poly_list = read_label_file(label_path) or []
+        return image_path, export_masks(image_path, poly_list, fmt), None
+    except Exception as e:
+        return image_path, 0, str(e)
+
+
+def export_all(jobs, workers=None, callback=None):
+    """
+    jobs: [(이미지 경로, poly_list 또는 None, 라벨 CSV 경로 또는 None, 형식)]
+    프로세스 풀에서 내보내고 (이미지 수, 실패 목록, 초당 이미지 수, 초당 메가픽셀) 반환
+    """
+    start = time.perf_counter()
+    done = pixels = 0
+    failed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for image_path, count, error in pool.map(export_job, jobs, chunksize=4):
+            done += 1
+            pixels += count
+            if error:
+                failed.append((image_path, error))
+            if callback:
+                callback(done, image_path, error)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    return done, failed, done / elapsed, pixels / elapsed / 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rasterize polygon labels into class and change masks.")
+    parser.add_argument("paths", nargs="+", help="directories containing label/ folders")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--format", choices=["png", "npy"], default="png", help="mask file format")
+    args = parser.parse_args(argv)
+
+    jobs = []
+    seen = set()
+    for root in args.paths:
+        for label_path in find_label_files(root):
+            # 같은 이름의 CSV/NPZ는 한 번만 처리 (read_label_file이 더 최신 파일을 읽음)
+            label_path = os.path.splitext(label_path)[0] + ".csv"
+            if label_path in seen:
+                continue
+            seen.add(label_path)
+            image_path = image_for_label(label_path)
+            if image_path is None:
+                print(f"SKIP {label_path}: image not found", file=sys.stderr)
+            else:
+                jobs.append((image_path, None, label_path, args.format))
+
+    def report(done, image_path, error):
+        print(f"FAIL {image_path}: {error}" if error else f"OK   {image_path}", flush=True)
+
+    done, failed, images_per_sec, mpix_per_sec = export_all(jobs, args.jobs, report)
+    print(f"{done} images, {len(failed)} failed, {images_per_sec:.2f} images/s, {mpix_per_sec:.1f} MPix/s",
+          file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+# 폴더 단위 import: Base Image / Temporary B 폴더를 파일 이름으로 짝짓고 가상화된 표로 보여줌
+import os
+import re
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor, QFont
+
+from label_io import label_csv_path, npz_path
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+FETCH_ROWS = 256  # fetchMore 한 번에 보여줄 행 수
+
+STATUS_LABELED = "라벨 있음"
+STATUS_UNLABELED = "라벨 없음"
+STATUS_MISSING_A = "A 없음"
+STATUS_MISSING_B = "B 없음"
+
+
+def scan_images(directory):
+    """
+    os.scandir로 폴더의 이미지 파일 이름만 읽음 (stat 호출 없음)
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTS and entry.is_file():
+                yield entry.name
+
+
+def pair_key(filename, pattern=None):
+    """
+    짝을 찾는 키. pattern(정규식)이 없으면 확장자를 뺀 이름,
+    있으면 첫 번째 그룹(그룹이 없으면 일치한 전체). 일치하지 않으면 None
+    """
+    stem = os.path.splitext(filename)[0]
+    if not pattern:
+        return stem
+    match = re.search(pattern, stem)
+    if match is None:
+        return None
+    return match.group(1) if match.groups() else match.group(0)
+
+
+class PairIndex:
+    """
+    두 폴더의 파일을 키로 짝지은 결과. 짝이 모두 있는 행이 먼저(키 순),
+    짝이 없는 행이 뒤에 오므로 앞쪽 행 번호가 pairs_a/pairs_b의 위치와 같음
+    """
+    def __init__(self, dir_a, dir_b, pattern=None):
+        self.dir_a = dir_a
+        self.dir_b = dir_b
+        self.pattern = pattern
+        files_a = self.key_map(dir_a)
+        files_b = self.key_map(dir_b)
+        complete = sorted(files_a.keys() & files_b.keys())
+        self.pairs_a = [os.path.join(dir_a, files_a[k]) for k in complete]
+        self.pairs_b = [os.path.join(dir_b, files_b[k]) for k in complete]
+        # (A 경로 또는 None, B 경로 또는 None)
+        self.rows = list(zip(self.pairs_a, self.pairs_b))
+        self.rows += [(os.path.join(dir_a, files_a[k]), None) for k in sorted(files_a.keys() - files_b.keys())]
+        self.rows += [(None, os.path.join(dir_b, files_b[k])) for k in sorted(files_b.keys() - files_a.keys())]
+        self.row_of = {path: row for row, path in enumerate(self.pairs_a)}
+        self.status = {}  # 행 -> 상태 (처음 요청될 때 계산)
+        self.label_names = None  # A 폴더의 label/ 안 파일 이름 (처음 요청될 때 한 번 읽음)
+        self.store = None  # 프로젝트 저장소 (label_store.ProjectStore)
+        self.stored = set()  # 저장소에 라벨이 있는 이미지 키
+
+    def key_map(self, directory):
+        files = {}
+        for name in scan_images(directory):
+            key = pair_key(name, self.pattern)
+            if key is not None:
+                # 같은 키가 여러 개면 이름 순으로 첫 번째만 사용
+                if key not in files or name < files[key]:
+                    files[key] = name
+        return files
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def complete(self):
+        return len(self.pairs_a)
+
+    def row_status(self, row):
+        status = self.status.get(row)
+        if status is None:
+            path_a, path_b = self.rows[row]
+            if path_a is None:
+                status = STATUS_MISSING_A
+            elif path_b is None:
+                status = STATUS_MISSING_B
+            else:
+                status = STATUS_LABELED if self.has_label(path_a) else STATUS_UNLABELED
+            self.status[row] = status
+        return status
+
+    def set_store(self, store):
+        """
+        프로젝트 저장소의 라벨도 '라벨 있음'으로 표시 (None이면 label/ 폴더만 확인)
+        """
+        self.store = store
+        self.stored = set(store.versions()) if store is not None else set()
+        self.status.clear()
+
+    def has_label(self, path_a):
+        if self.store is not None and self.store.key(path_a) in self.stored:
+            return True
+        if self.label_names is None:
+            label_dir = os.path.join(self.dir_a, "label")
+            try:
+                with os.scandir(label_dir) as entries:
+                    self.label_names = {entry.name for entry in entries}
+            except OSError:
+                self.label_names = set()
+        csv_path = label_csv_path(path_a)
+        return (os.path.basename(csv_path) in self.label_names
+                or os.path.basename(npz_path(csv_path)) in self.label_names)
+
+    def mark_labeled(self, path_a):
+        """
+        저장된 A 이미지의 행 번호 (짝이 있는 행이 아니면 -1)
+        """
+        if self.store is not None:
+            self.stored.add(self.store.key(path_a))
+        elif self.label_names is not None:
+            self.label_names.add(os.path.basename(label_csv_path(path_a)))
+        row = self.row_of.get(path_a, -1)
+        self.status.pop(row, None)
+        return row
+
+
+class PairTableModel(QAbstractTableModel):
+    """
+    PairIndex를 FETCH_ROWS씩 나눠 보여주는 표 모델 (스크롤할 때 fetchMore로 행 추가)
+    """
+    HEADERS = ("Base Image", "Temporary B", "상태")
+
+    def __init__(self, pairs, parent=None):
+        super(PairTableModel, self).__init__(parent)
+        self.pairs = pairs
+        self.loaded = 0
+        self.current_row = -1  # 굵게 표시할 현재 쌍
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.pairs)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(FETCH_ROWS, len(self.pairs) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.DisplayRole:
+            if column == 2:
+                return self.pairs.row_status(row)
+            path = self.pairs.rows[row][column]
+            return os.path.basename(path) if path else ""
+        if role == Qt.ToolTipRole and column < 2:
+            return self.pairs.rows[row][column]
+        if role == Qt.ForegroundRole and column == 2:
+            status = self.pairs.row_status(row)
+            if status in (STATUS_MISSING_A, STATUS_MISSING_B):
+                return QColor(200, 0, 0)
+            if status == STATUS_LABELED:
+                return QColor(0, 128, 0)
+        if role == Qt.FontRole and row == self.current_row:
+            font = QFont()
+            font.setBold(True)
+            return font
+        return None
+
+    def ensure_loaded(self, row):
+        while self.loaded <= row and self.canFetchMore():
+            self.fetchMore()
+
+    def set_current(self, row):
+        """
+        현재 쌍 표시를 옮기고 바뀐 두 행만 갱신
+        """
+        old, self.current_row = self.current_row, row
+        for r in (old, row):
+            if 0 <= r < self.loaded:
+                self.dataChanged.emit(self.index(r, 0), self.index(r, len(self.HEADERS) - 1))
+
+    def set_store(self, store):
+        self.pairs.set_store(store)
+        if self.loaded:
+            self.dataChanged.emit(self.index(0, 2), self.index(self.loaded - 1, 2))
+
+    def mark_labeled(self, path_a):
+        row = self.pairs.mark_labeled(path_a)
+        if 0 <= row < self.loaded:
+            self.dataChanged.emit(self.index(row, 2), self.index(row, 2))
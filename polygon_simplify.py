@@ -0,0 +1,134 @@
+# 폴리곤 단순화: 허용 오차(영상 픽셀) 안에서 거의 일직선인 꼭짓점을 줄임
+# - 'dp': Douglas–Peucker, 원래 선에서 tolerance 픽셀보다 멀리 벗어나지 않는 범위에서 꼭짓점 제거
+# - 'vw': Visvalingam–Whyatt, 이웃 두 점과 만드는 삼각형 넓이가 tolerance² 픽셀² 미만인 꼭짓점부터 제거
+# 폴리곤은 닫힌 고리로 다루고, 꼭짓점이 3개 미만으로 줄어들면 원래 좌표를 그대로 둠
+import heapq
+
+import numpy as np
+
+METHODS = ('dp', 'vw')
+METHOD_NAMES = {'dp': 'Douglas–Peucker', 'vw': 'Visvalingam–Whyatt'}
+
+
+def ring_points(points):
+    """
+    평탄한 좌표 목록 -> (N, 2) 배열 (NaN과 시작점을 반복한 마지막 점은 뺌)
+    """
+    arr = np.asarray(points, dtype=np.float64)
+    arr = arr[~np.isnan(arr)]
+    xy = arr[:len(arr) // 2 * 2].reshape(-1, 2)
+    if len(xy) > 1 and (xy[0] == xy[-1]).all():
+        xy = xy[:-1]
+    return xy
+
+
+def segment_distance(xy, start, end):
+    """
+    각 점에서 선분 start-end까지의 거리
+    """
+    direction = end - start
+    length = direction @ direction
+    if length == 0:
+        return np.hypot(*(xy - start).T)
+    t = np.clip((xy - start) @ direction / length, 0.0, 1.0)
+    return np.hypot(*(xy - start - t[:, None] * direction).T)
+
+
+def douglas_peucker(xy, tolerance):
+    """
+    남길 꼭짓점 마스크. 첫 점과 가장 먼 점을 고정하고 두 구간을 각각 단순화
+    """
+    n = len(xy)
+    closed = np.vstack([xy, xy[:1]])
+    far = int(np.argmax(np.hypot(*(xy - xy[0]).T)))
+    keep = np.zeros(n + 1, bool)
+    keep[[0, far, n]] = True
+    stack = [(0, far), (far, n)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        distance = segment_distance(closed[first + 1:last], closed[first], closed[last])
+        i = int(np.argmax(distance))
+        if distance[i] > tolerance:
+            i += first + 1
+            keep[i] = True
+            stack.append((first, i))
+            stack.append((i, last))
+    return keep[:n]
+
+
+def triangle_area(a, b, c):
+    return abs((b[0] - a[0]) * (c[1] - a[1]) - (c[0] - a[0]) * (b[1] - a[1])) / 2
+
+
+def visvalingam(xy, tolerance):
+    """
+    남길 꼭짓점 마스크. 유효 넓이가 가장 작은 꼭짓점부터 하나씩 지우고 양옆 넓이를 다시 계산
+    """
+    n = len(xy)
+    threshold = tolerance * tolerance
+    points = xy.tolist()
+    prev = [(i - 1) % n for i in range(n)]
+    next_ = [(i + 1) % n for i in range(n)]
+    areas = [triangle_area(points[prev[i]], points[i], points[next_[i]]) for i in range(n)]
+    heap = [(area, i) for i, area in enumerate(areas)]
+    heapq.heapify(heap)
+    keep = np.ones(n, bool)
+    count = n
+    while heap and count > 3:
+        area, i = heapq.heappop(heap)
+        if not keep[i] or area != areas[i]:
+            continue  # 이미 지웠거나 넓이가 다시 계산된 항목
+        if area >= threshold:
+            break
+        keep[i] = False
+        count -= 1
+        p, q = prev[i], next_[i]
+        next_[p], prev[q] = q, p
+        for j in (p, q):
+            # 지운 점보다 먼저 지워지지 않도록 넓이는 줄어들지 않게 함
+            areas[j] = max(area, triangle_area(points[prev[j]], points[j], points[next_[j]]))
+            heapq.heappush(heap, (areas[j], j))
+    return keep
+
+
+def vertex_count(points):
+    """
+    꼭짓점 수 (NaN 패딩은 세지 않음)
+    """
+    return int(np.count_nonzero(~np.isnan(np.asarray(points, dtype=np.float64)))) // 2
+
+
+def simplify_points(points, tolerance, method='dp'):
+    """
+    (단순화한 좌표 목록, 줄어든 꼭짓점 수). 줄어든 것이 없으면 원래 목록을 그대로 반환
+    """
+    xy = ring_points(points)
+    if len(xy) <= 3 or tolerance <= 0:
+        return points, 0
+    keep = douglas_peucker(xy, tolerance) if method == 'dp' else visvalingam(xy, tolerance)
+    kept = int(keep.sum())
+    if kept < 3:
+        return points, 0
+    # 닫는 중복 점은 지운 것으로 셈
+    removed = vertex_count(points) - kept
+    if removed <= 0:
+        return points, 0
+    return xy[keep].ravel().tolist(), removed
+
+
+def simplify_polys(poly_list, tolerance, method='dp'):
+    """
+    ([(행 번호, 새 폴리곤 dict), ...], 전체 꼭짓점 수, 줄어든 꼭짓점 수).
+    원래 dict는 undo 기록이 가리키고 있을 수 있으므로 바뀐 폴리곤만 새 dict로 만듦
+    """
+    changes = []
+    vertices = removed = 0
+    for row, poly_dict in enumerate(poly_list):
+        vertices += vertex_count(poly_dict['points'])
+        points, count = simplify_points(poly_dict['points'], tolerance, method)
+        if count:
+            changes.append((row, dict(poly_dict, points=points)))
+            removed += count
+    return changes, vertices, removed
@@ -0,0 +1,261 @@
+# 폴리곤 좌표를 연속된 numpy 배열로 보관하는 기하 저장소
+import itertools
+from collections import defaultdict
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtCore import QPointF
+from PyQt5.QtGui import QPolygonF
+
+GRID_CELL = 256  # 공간 인덱스 격자 한 칸의 크기 (영상 좌표)
+
+
+def to_qpolygonf(arr):
+    """
+    (n, 2) float64 배열을 QPolygonF 내부 버퍼에 한 번에 복사
+    """
+    n = len(arr)
+    poly = QPolygonF()
+    if n:
+        poly.fill(QPointF(), n)
+        buf = sip.voidptr(poly.data(), n * 16, True)
+        np.frombuffer(buf, np.float64).reshape(n, 2)[:] = arr
+    return poly
+
+
+def point_in_polygon(pts, x, y):
+    """
+    짝홀 규칙으로 점 (x, y)가 폴리곤 내부인지 판정
+    """
+    if len(pts) < 3:
+        return False
+    xs, ys = pts[:, 0], pts[:, 1]
+    xj, yj = np.roll(xs, 1), np.roll(ys, 1)
+    crosses = (ys > y) != (yj > y)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        x_cross = (xj - xs) * (y - ys) / (yj - ys) + xs
+    return bool(np.count_nonzero(crosses & (x < x_cross)) % 2)
+
+
+def polygon_points(poly_dict):
+    """
+    폴리곤 dict의 좌표 -> (n, 2) float32 (NaN 패딩된 꼭짓점 제거)
+    """
+    p = np.asarray(poly_dict['points'], np.float32)
+    p = p[:len(p) // 2 * 2].reshape(-1, 2)
+    return p[~np.isnan(p).any(axis=1)]
+
+
+class GridIndex:
+    """
+    폴리곤 경계 상자를 균일 격자에 등록해 영역/점 질의를 빠르게 처리
+    """
+    def __init__(self, cell=GRID_CELL):
+        self.cell = cell
+        self.cells = defaultdict(set)  # (cx, cy) -> 키 집합
+        self.boxes = {}  # 키 -> (x0, y0, x1, y1)
+
+    def cell_keys(self, x0, y0, x1, y1):
+        c = self.cell
+        for cx in range(int(x0 // c), int(x1 // c) + 1):
+            for cy in range(int(y0 // c), int(y1 // c) + 1):
+                yield cx, cy
+
+    def insert(self, key, box):
+        self.boxes[key] = box
+        for cell in self.cell_keys(*box):
+            self.cells[cell].add(key)
+
+    def remove(self, key):
+        box = self.boxes.pop(key, None)
+        if box is None:
+            return
+        for cell in self.cell_keys(*box):
+            keys = self.cells.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.cells[cell]
+
+    def query(self, x0, y0, x1, y1):
+        """
+        영역과 경계 상자가 겹치는 키 목록
+        """
+        # 질의 영역이 격자 전체보다 크면 모든 상자를 직접 검사
+        if (x1 - x0) * (y1 - y0) > len(self.cells) * self.cell * self.cell:
+            found = self.boxes.keys()
+        else:
+            found = set()
+            for cell in self.cell_keys(x0, y0, x1, y1):
+                found.update(self.cells.get(cell, ()))
+        boxes = self.boxes
+        return [k for k in found
+                if boxes[k][0] <= x1 and boxes[k][2] >= x0 and boxes[k][1] <= y1 and boxes[k][3] >= y0]
+
+
+class PolygonStore:
+    """
+    poly_list를 좌표(float32) / 오프셋 / 클래스 배열로 펼쳐 보관하고,
+    배율별 화면 좌표 변환을 한 번의 벡터 연산으로 처리
+    """
+    def __init__(self):
+        self.coords = np.empty((0, 2), np.float32)  # 모든 꼭짓점 (x, y)
+        self.offsets = np.zeros(1, np.int64)  # i번째 폴리곤 = coords[offsets[i]:offsets[i+1]]
+        self.classes = np.empty(0, np.int32)
+        self.dirty = True
+        self.version = 0  # 다시 구성할 때마다 증가 (그려 둔 오버레이 무효화 판단용)
+        self.cached_scale = None
+        self.screen = None
+        self.polygons = {}
+
+        # 경계 상자 공간 인덱스 (폴리곤 dict의 id를 키로 증분 유지)
+        self.index = GridIndex()
+        self.members = {}  # 키 -> 폴리곤 dict (id 재사용 방지를 위해 참조 유지)
+        self.key_rows = {}  # 키 -> poly_list 내 위치
+        self.row_keys = []  # 위치 -> 키
+
+    def __len__(self):
+        return len(self.classes)
+
+    def invalidate(self, poly_dict=None):
+        """
+        poly_dict가 주어지면 해당 폴리곤의 좌표가 바뀐 것으로 보고 인덱스에서도 다시 등록
+        """
+        if poly_dict is not None:
+            self.index.remove(id(poly_dict))
+            self.members.pop(id(poly_dict), None)
+        self.dirty = True
+
+    def insert(self, row, poly_dict):
+        """
+        poly_list의 row 위치에 폴리곤 하나가 들어간 것을 반영 (전체를 다시 구성하지 않음).
+        좌표 배열은 한 번의 복사로 끼워 넣고, 인덱스에는 이 폴리곤만 등록
+        """
+        if self.dirty:
+            return  # 다음 sync에서 어차피 전체를 다시 구성
+        p = polygon_points(poly_dict)
+        start = self.offsets[row]
+        self.coords = np.concatenate([self.coords[:start], p, self.coords[start:]])
+        self.offsets = np.insert(self.offsets, row + 1, start + len(p))
+        self.offsets[row + 2:] += len(p)
+        self.classes = np.insert(self.classes, row, poly_dict['class'])
+        key = id(poly_dict)
+        self.row_keys.insert(row, key)
+        self.shift_rows(row)
+        if len(p):
+            x0, y0 = p.min(axis=0).tolist()
+            x1, y1 = p.max(axis=0).tolist()
+            self.index.insert(key, (x0, y0, x1, y1))
+            self.members[key] = poly_dict
+        if self.cached_scale is not None:
+            self.screen = np.concatenate([self.screen[:start], p.astype(np.float64) * self.cached_scale,
+                                          self.screen[start:]])
+            self.polygons = {r + (r >= row): poly for r, poly in self.polygons.items()}
+        self.version += 1
+
+    def remove(self, row):
+        """
+        poly_list의 row 위치 폴리곤이 빠진 것을 반영
+        """
+        if self.dirty:
+            return
+        start, end = self.offsets[row], self.offsets[row + 1]
+        self.coords = np.concatenate([self.coords[:start], self.coords[end:]])
+        self.offsets = np.delete(self.offsets, row + 1)
+        self.offsets[row + 1:] -= end - start
+        self.classes = np.delete(self.classes, row)
+        key = self.row_keys.pop(row)
+        self.key_rows.pop(key, None)
+        self.index.remove(key)
+        self.members.pop(key, None)
+        self.shift_rows(row)
+        if self.cached_scale is not None:
+            self.screen = np.concatenate([self.screen[:start], self.screen[end:]])
+            self.polygons = {r - (r > row): poly for r, poly in self.polygons.items() if r != row}
+        self.version += 1
+
+    def replace(self, row, poly_dict):
+        self.remove(row)
+        self.insert(row, poly_dict)
+
+    def shift_rows(self, row):
+        # row 뒤의 위치가 바뀐 키만 갱신 (끝에 추가/삭제하면 할 일 없음)
+        for r in range(row, len(self.row_keys)):
+            self.key_rows[self.row_keys[r]] = r
+
+    def rebuild(self, poly_list):
+        # 폴리곤마다 배열을 만들지 않고 모든 좌표를 한 번에 변환한 뒤 NaN 패딩 꼭짓점만 빼고 개수를 다시 셈
+        n = len(poly_list)
+        counts = np.fromiter((len(d['points']) // 2 for d in poly_list), np.int64, n)
+        flat = np.fromiter(itertools.chain.from_iterable(d['points'][:2 * c] for d, c in zip(poly_list, counts.tolist())),
+                           np.float32, 2 * int(counts.sum()))
+        coords = flat.reshape(-1, 2)
+        valid = ~np.isnan(coords).any(axis=1)
+        if not valid.all():
+            counts = np.bincount(np.repeat(np.arange(n), counts)[valid], minlength=n).astype(np.int64)
+            coords = coords[valid]
+        self.coords = coords
+        self.offsets = np.zeros(n + 1, np.int64)
+        np.cumsum(counts, out=self.offsets[1:])
+        self.classes = np.fromiter((d['class'] for d in poly_list), np.int32, len(poly_list))
+        self.update_index(poly_list)
+        self.dirty = False
+        self.version += 1
+        self.cached_scale = None
+
+    def update_index(self, poly_list):
+        """
+        추가/삭제(undo/redo 복원 포함)된 폴리곤만 공간 인덱스에 반영
+        """
+        current = {id(d): d for d in poly_list}
+        for key in [k for k, d in self.members.items() if current.get(k) is not d]:
+            self.index.remove(key)
+            del self.members[key]
+        self.key_rows = {}
+        self.row_keys = [id(d) for d in poly_list]
+        for row, poly_dict in enumerate(poly_list):
+            key = id(poly_dict)
+            self.key_rows[key] = row
+            if key in self.members:
+                continue
+            pts = self.coords[self.offsets[row]:self.offsets[row + 1]]
+            if len(pts) == 0:
+                continue
+            x0, y0 = pts.min(axis=0).tolist()
+            x1, y1 = pts.max(axis=0).tolist()
+            self.index.insert(key, (x0, y0, x1, y1))
+            self.members[key] = poly_dict
+
+    def visible_rows(self, x0, y0, x1, y1):
+        """
+        영상 좌표 영역과 겹치는 폴리곤 위치 (그리기 순서 유지)
+        """
+        return sorted(self.key_rows[k] for k in self.index.query(x0, y0, x1, y1))
+
+    def polygon_at(self, x, y):
+        """
+        영상 좌표 (x, y)를 포함하는 가장 위(마지막에 그려진) 폴리곤 위치, 없으면 -1
+        """
+        for row in sorted((self.key_rows[k] for k in self.index.query(x, y, x, y)), reverse=True):
+            if point_in_polygon(self.coords[self.offsets[row]:self.offsets[row + 1]], x, y):
+                return row
+        return -1
+
+    def sync(self, poly_list):
+        if self.dirty or len(poly_list) != len(self.classes):
+            self.rebuild(poly_list)
+
+    def scaled_polygon(self, row, scale):
+        """
+        배율이 바뀔 때만 화면 좌표를 다시 계산 (이동은 painter 변환으로 처리),
+        QPolygonF는 실제로 그려지는 폴리곤만 생성
+        """
+        if scale != self.cached_scale:
+            self.screen = self.coords.astype(np.float64) * scale
+            self.polygons = {}
+            self.cached_scale = scale
+        poly = self.polygons.get(row)
+        if poly is None:
+            poly = to_qpolygonf(self.screen[self.offsets[row]:self.offsets[row + 1]])
+            self.polygons[row] = poly
+        return poly
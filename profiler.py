@@ -0,0 +1,130 @@
+# 핫 패스 계측: 구간별 지연 시간/캐시 적중 기록, 백분위 요약, JSON 및 Chrome trace 내보내기
+import functools
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+
+SECTION_SAMPLES = 2048  # 구간마다 보관할 최근 측정 수 (백분위 계산용)
+TRACE_EVENTS = 50000  # Chrome trace로 내보낼 최근 이벤트 수
+
+
+def percentile(sorted_values, q):
+    """
+    정렬된 값들의 q 백분위 (최근접 순위)
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class Profiler:
+    """
+    꺼져 있을 때는 enabled 검사 한 번만 하고 아무것도 기록하지 않음.
+    켜져 있으면 구간(이름)별 최근 시간과 trace 이벤트, 캐시별 적중/실패 수를 모음 (작업 스레드에서도 호출 가능)
+    """
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.sections = {}  # 이름 -> deque(걸린 시간(초))
+            self.events = deque(maxlen=TRACE_EVENTS)  # (이름, 시작(초), 걸린 시간(초), 스레드 id)
+            self.counters = {}  # 캐시 이름 -> [적중, 실패]
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            self.reset()
+        self.enabled = enabled
+
+    def record(self, name, start, duration):
+        with self.lock:
+            samples = self.sections.get(name)
+            if samples is None:
+                samples = self.sections[name] = deque(maxlen=SECTION_SAMPLES)
+            samples.append(duration)
+            self.events.append((name, start, duration, threading.get_ident()))
+
+    def count(self, name, hit):
+        with self.lock:
+            counter = self.counters.get(name)
+            if counter is None:
+                counter = self.counters[name] = [0, 0]
+            counter[0 if hit else 1] += 1
+
+    def summary(self):
+        """
+        {'sections': {이름: {'count', 'last_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'}},
+         'caches': {이름: {'hits', 'misses', 'hit_rate'}}}
+        """
+        with self.lock:
+            sections = {name: sorted(samples) for name, samples in self.sections.items()}
+            last = {name: samples[-1] for name, samples in self.sections.items() if samples}
+            counters = {name: tuple(counter) for name, counter in self.counters.items()}
+        result = {'sections': {}, 'caches': {}}
+        for name, values in sections.items():
+            result['sections'][name] = {
+                'count': len(values),
+                'last_ms': last.get(name, 0.0) * 1000,
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000 if values else 0.0,
+            }
+        for name, (hits, misses) in counters.items():
+            total = hits + misses
+            result['caches'][name] = {'hits': hits, 'misses': misses, 'hit_rate': hits / total if total else 0.0}
+        return result
+
+    def export(self, path):
+        """
+        확장자가 .trace.json이면 Chrome trace (chrome://tracing, Perfetto에서 열림), 아니면 요약 JSON
+        """
+        if path.lower().endswith(".trace.json"):
+            data = self.trace()
+        else:
+            data = self.summary()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    def trace(self):
+        with self.lock:
+            events = list(self.events)
+            origin = self.origin
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {'name': name, 'ph': 'X', 'ts': (start - origin) * 1e6, 'dur': duration * 1e6,
+                 'pid': pid, 'tid': tid, 'cat': 'change_detection'}
+                for name, start, duration, tid in events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+
+PROFILER = Profiler()
+
+
+def profiled(name):
+    """
+    함수/메서드 실행 시간을 name 구간으로 기록하는 데코레이터 (계측이 꺼져 있으면 그대로 호출).
+    인자는 그대로 넘기므로 Qt 시그널에 연결할 때는 checked 같은 인자를 연결하는 쪽에서 버려야 함
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, start, time.perf_counter() - start)
+        return wrapper
+    return decorate
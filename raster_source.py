@@ -0,0 +1,354 @@
+# 비압축 GeoTIFF / ENVI raw 영상을 메모리 매핑으로 열고 필요한 창(window)만 읽는 영상 소스
+import abc
+import math
+import os
+import struct
+
+import numpy as np
+
+RASTER_EXTS = (".tif", ".tiff", ".raw", ".img", ".dat", ".bsq", ".bil", ".bip")
+RASTER_MIN_PIXELS = 4096 * 4096  # 8비트 RGB 영상은 이 크기 이상일 때만 메모리 매핑 경로 사용
+STRETCH_BLOCKS = 16  # 밝기 범위 계산용 표본 블록 수 (가로/세로 각각)
+STRETCH_BLOCK_SIZE = 64  # 표본 블록 한 변의 픽셀 수
+DEFAULT_PERCENTILES = (2, 98)
+
+
+class UnsupportedRaster(Exception):
+    pass
+
+
+class RasterSource(abc.ABC):
+    """
+    (높이, 너비, 밴드) 영상의 공통 인터페이스.
+    read는 원본 값을, render는 밴드 선택과 밝기 늘이기(stretch)를 적용한 RGB uint8을 돌려줌
+    """
+    def __init__(self, path, width, height, bands, dtype):
+        self.path = path
+        self.width_ = width
+        self.height_ = height
+        self.bands = bands
+        self.dtype = np.dtype(dtype)
+        self.version = 0  # 밴드/stretch 설정이 바뀔 때마다 증가 (그려 둔 화면 무효화용)
+        self.selected = (0, 1, 2) if bands >= 3 else (0,)
+        self.percentiles = None if self.dtype == np.uint8 else DEFAULT_PERCENTILES
+        self.limits = None
+
+    # QPixmap과 같은 방식으로 크기를 물을 수 있도록
+    def width(self):
+        return self.width_
+
+    def height(self):
+        return self.height_
+
+    @abc.abstractmethod
+    def read(self, x0, y0, x1, y1, step=1, bands=None):
+        """
+        창 [x0, x1) x [y0, y1)을 step 간격으로 읽은 (높이, 너비, 밴드 수) 원본 값 배열
+        """
+
+    def close(self):
+        """
+        메모리 매핑을 놓음 (다시 읽으면 필요할 때 다시 매핑)
+        """
+
+    def configure(self, bands=None, percentiles=None):
+        """
+        bands: 표시할 밴드 번호(0부터) 1개 또는 3개 (None이면 그대로),
+        percentiles: 밝기 늘이기 (하한, 상한) 백분위. None이면 8비트는 원래 값 그대로, 그 외는 (2, 98)
+        """
+        bands = tuple(bands) if bands else self.selected
+        if len(bands) not in (1, 3) or not all(0 <= b < self.bands for b in bands):
+            raise ValueError(f"band numbers must be 1 or 3 values in 1..{self.bands}")
+        if percentiles is None:
+            percentiles = None if self.dtype == np.uint8 else DEFAULT_PERCENTILES
+        else:
+            percentiles = tuple(percentiles)
+        if (bands, percentiles) != (self.selected, self.percentiles):
+            self.selected = bands
+            self.percentiles = percentiles
+            self.limits = None
+            self.version += 1
+
+    def sample(self):
+        """
+        영상 전체에 고르게 흩어진 작은 블록들만 읽은 표본 (파일 전체를 읽지 않음)
+        """
+        size = STRETCH_BLOCK_SIZE
+        parts = []
+        for by in range(STRETCH_BLOCKS):
+            y0 = max(0, (self.height_ - size) * by // max(1, STRETCH_BLOCKS - 1))
+            for bx in range(STRETCH_BLOCKS):
+                x0 = max(0, (self.width_ - size) * bx // max(1, STRETCH_BLOCKS - 1))
+                block = self.read(x0, y0, min(self.width_, x0 + size), min(self.height_, y0 + size),
+                                  bands=self.selected)
+                parts.append(block.reshape(-1, len(self.selected)))
+        return np.concatenate(parts)
+
+    def stretch_limits(self):
+        if self.limits is None:
+            values = self.sample().astype(np.float64)
+            lo, hi = np.nanpercentile(values, self.percentiles, axis=0)
+            self.limits = (lo, np.maximum(hi, lo + 1e-6))
+        return self.limits
+
+    def render(self, x0, y0, x1, y1, step=1):
+        """
+        [x0, x1) x [y0, y1) 창을 step 간격으로 읽어 (h, w, 3) RGB uint8로 변환
+        """
+        data = self.read(x0, y0, x1, y1, step, self.selected)
+        if self.percentiles is None:
+            out = data
+        else:
+            lo, hi = self.stretch_limits()
+            out = np.empty(data.shape, np.uint8)
+            np.clip((data - lo) * (255.0 / (hi - lo)), 0, 255, out=out, casting='unsafe')
+        if out.shape[2] == 1:
+            out = np.repeat(out, 3, axis=2)
+        return np.ascontiguousarray(out)
+
+
+class ArraySource(RasterSource):
+    """
+    (높이, 너비, 밴드) 순서로 볼 수 있는 메모리 매핑 배열 (ENVI raw, 연속 저장된 비압축 TIFF).
+    reopen이 있으면 close() 뒤 다시 읽을 때 그것으로 배열을 다시 매핑
+    """
+    def __init__(self, path, array, reopen=None):
+        super(ArraySource, self).__init__(path, array.shape[1], array.shape[0], array.shape[2], array.dtype)
+        self.array = array
+        self.reopen = reopen
+
+    def close(self):
+        if self.reopen is not None:
+            self.array = None
+
+    def read(self, x0, y0, x1, y1, step=1, bands=None):
+        if self.array is None:
+            self.array = self.reopen()
+        window = self.array[y0:y1:step, x0:x1:step]
+        return window if bands is None else window[:, :, list(bands)]
+
+
+ENVI_DTYPES = {1: 'u1', 2: 'i2', 3: 'i4', 4: 'f4', 5: 'f8', 12: 'u2', 13: 'u4', 14: 'i8', 15: 'u8'}
+
+
+def envi_header_path(path):
+    for candidate in (path + ".hdr", os.path.splitext(path)[0] + ".hdr"):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def read_envi_header(path):
+    """
+    ENVI .hdr의 'key = value' 항목 (중괄호로 여러 줄에 걸친 값 포함)
+    """
+    fields = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    if not text.lstrip().startswith("ENVI"):
+        raise UnsupportedRaster(f"not an ENVI header: {path}")
+    key, value = None, None
+    for line in text.splitlines()[1:]:
+        if key is not None:
+            value += " " + line.strip()
+            if "}" in line:
+                fields[key] = value.strip()
+                key = None
+            continue
+        if "=" not in line:
+            continue
+        name, rest = line.split("=", 1)
+        name, rest = name.strip().lower(), rest.strip()
+        if rest.startswith("{") and "}" not in rest:
+            key, value = name, rest
+        else:
+            fields[name] = rest
+    return fields
+
+
+def open_envi(path):
+    header = read_envi_header(envi_header_path(path))
+    try:
+        width = int(header['samples'])
+        height = int(header['lines'])
+        bands = int(header.get('bands', 1))
+        dtype = np.dtype(ENVI_DTYPES[int(header['data type'])])
+    except (KeyError, ValueError) as e:
+        raise UnsupportedRaster(f"incomplete ENVI header: {e}")
+    dtype = dtype.newbyteorder('>' if header.get('byte order', '0').strip() == '1' else '<')
+    offset = int(header.get('header offset', 0))
+    interleave = header.get('interleave', 'bsq').strip().lower()
+    if interleave not in ('bsq', 'bil', 'bip'):
+        raise UnsupportedRaster(f"unknown interleave: {interleave}")
+
+    def mapped():
+        if interleave == 'bsq':
+            return np.memmap(path, dtype, 'r', offset, (bands, height, width)).transpose(1, 2, 0)
+        if interleave == 'bil':
+            return np.memmap(path, dtype, 'r', offset, (height, bands, width)).transpose(0, 2, 1)
+        return np.memmap(path, dtype, 'r', offset, (height, width, bands))
+    return ArraySource(path, mapped(), mapped)
+
+
+# TIFF 태그 자료형 -> numpy 자료형 (유리수는 두 값씩)
+TIFF_TYPES = {1: 'u1', 3: 'u2', 4: 'u4', 5: 'u4', 6: 'i1', 7: 'u1', 8: 'i2', 9: 'i4', 10: 'i4',
+              11: 'f4', 12: 'f8', 16: 'u8', 17: 'i8', 18: 'u8'}
+TIFF_SAMPLE_DTYPES = {(1, 8): 'u1', (1, 16): 'u2', (1, 32): 'u4', (2, 8): 'i1', (2, 16): 'i2', (2, 32): 'i4',
+                      (3, 32): 'f4', (3, 64): 'f8'}
+
+
+def read_tiff_tags(f, endian):
+    """
+    첫 번째 IFD의 태그 -> numpy 배열 (BigTIFF 포함)
+    """
+    magic = struct.unpack(endian + 'H', f.read(2))[0]
+    if magic == 42:
+        big = False
+        offset = struct.unpack(endian + 'I', f.read(4))[0]
+    elif magic == 43:
+        big = True
+        f.read(4)  # 오프셋 크기(8), 예약
+        offset = struct.unpack(endian + 'Q', f.read(8))[0]
+    else:
+        raise UnsupportedRaster("not a TIFF file")
+    count_fmt, entry_size, value_size = ('Q', 20, 8) if big else ('H', 12, 4)
+    f.seek(offset)
+    count = struct.unpack(endian + count_fmt, f.read(struct.calcsize(count_fmt)))[0]
+    entries = f.read(count * entry_size)
+    tags = {}
+    for i in range(count):
+        entry = entries[i * entry_size:(i + 1) * entry_size]
+        tag, kind = struct.unpack(endian + 'HH', entry[:4])
+        n = struct.unpack(endian + ('Q' if big else 'I'), entry[4:4 + value_size])[0]
+        code = TIFF_TYPES.get(kind)
+        if code is None:
+            continue
+        dtype = np.dtype(code).newbyteorder(endian)
+        n *= 2 if kind in (5, 10) else 1
+        size = n * dtype.itemsize
+        raw = entry[4 + value_size:]
+        if size > value_size:
+            f.seek(struct.unpack(endian + ('Q' if big else 'I'), raw)[0])
+            raw = f.read(size)
+        tags[tag] = np.frombuffer(raw[:size], dtype).astype(np.int64 if dtype.kind in 'ui' else np.float64)
+    return tags
+
+
+class TiffSource(RasterSource):
+    """
+    비압축 TIFF를 타일(또는 스트립) 단위 메모리 매핑 뷰로 읽음.
+    필요한 창과 겹치는 타일만 건드림
+    """
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            order = f.read(2)
+            if order not in (b'II', b'MM'):
+                raise UnsupportedRaster("not a TIFF file")
+            endian = '<' if order == b'II' else '>'
+            tags = read_tiff_tags(f, endian)
+
+        def tag(number, default=None):
+            values = tags.get(number)
+            if values is None:
+                if default is None:
+                    raise UnsupportedRaster(f"missing TIFF tag {number}")
+                return default
+            return values
+
+        if int(tag(259, [1])[0]) != 1:
+            raise UnsupportedRaster("compressed TIFF")
+        if int(tag(262, [1])[0]) == 3:
+            raise UnsupportedRaster("palette TIFF")
+        width, height = int(tag(256)[0]), int(tag(257)[0])
+        spp = int(tag(277, [1])[0])
+        bits = {int(b) for b in tag(258, [1])}
+        key = (int(tag(339, [1])[0]), bits.pop()) if len(bits) == 1 else None
+        if key not in TIFF_SAMPLE_DTYPES:
+            raise UnsupportedRaster("unsupported sample type")
+        dtype = np.dtype(TIFF_SAMPLE_DTYPES[key]).newbyteorder(endian)
+        super(TiffSource, self).__init__(path, width, height, spp, dtype)
+
+        self.planar = int(tag(284, [1])[0]) == 2  # 밴드별로 따로 저장
+        if 322 in tags:
+            self.chunk_w, self.chunk_h = int(tag(322)[0]), int(tag(323)[0])
+            self.offsets = tag(324)
+            self.tiled = True
+        else:
+            self.chunk_w, self.chunk_h = width, min(height, int(tag(278, [height])[0]))
+            self.offsets = tag(273)
+            self.tiled = False
+        self.cols = math.ceil(width / self.chunk_w)
+        self.rows = math.ceil(height / self.chunk_h)
+        self.memmap = np.memmap(path, np.uint8, 'r')
+
+    def close(self):
+        self.memmap = None
+
+    def chunk(self, plane, cy, cx):
+        """
+        (행, 열, 샘플) 타일 뷰 (복사 없음). 비어 있는 타일은 None
+        """
+        offset = int(self.offsets[plane * self.rows * self.cols + cy * self.cols + cx])
+        if offset == 0:
+            return None
+        rows = self.chunk_h if self.tiled else min(self.chunk_h, self.height_ - cy * self.chunk_h)
+        samples = 1 if self.planar else self.bands
+        nbytes = rows * self.chunk_w * samples * self.dtype.itemsize
+        if self.memmap is None:
+            self.memmap = np.memmap(self.path, np.uint8, 'r')
+        return self.memmap[offset:offset + nbytes].view(self.dtype).reshape(rows, self.chunk_w, samples)
+
+    def read(self, x0, y0, x1, y1, step=1, bands=None):
+        bands = list(range(self.bands)) if bands is None else list(bands)
+        out = np.zeros((len(range(y0, y1, step)), len(range(x0, x1, step)), len(bands)), self.dtype.newbyteorder('='))
+        if out.size == 0:
+            return out
+        for cy in range(y0 // self.chunk_h, (y1 - 1) // self.chunk_h + 1):
+            # 이 타일 행에 들어가는 첫/마지막 표본 행
+            top = cy * self.chunk_h
+            r0 = max(0, math.ceil((top - y0) / step))
+            r1 = min(out.shape[0], math.ceil((min(y1, top + self.chunk_h) - y0) / step))
+            if r0 >= r1:
+                continue
+            for cx in range(x0 // self.chunk_w, (x1 - 1) // self.chunk_w + 1):
+                left = cx * self.chunk_w
+                c0 = max(0, math.ceil((left - x0) / step))
+                c1 = min(out.shape[1], math.ceil((min(x1, left + self.chunk_w) - x0) / step))
+                if c0 >= c1:
+                    continue
+                ys = slice(y0 + r0 * step - top, y0 + (r1 - 1) * step - top + 1, step)
+                xs = slice(x0 + c0 * step - left, x0 + (c1 - 1) * step - left + 1, step)
+                if self.planar:
+                    for k, band in enumerate(bands):
+                        chunk = self.chunk(band, cy, cx)
+                        if chunk is not None:
+                            out[r0:r1, c0:c1, k] = chunk[ys, xs, 0]
+                else:
+                    chunk = self.chunk(0, cy, cx)
+                    if chunk is not None:
+                        out[r0:r1, c0:c1] = chunk[ys, xs][:, :, bands]
+        return out
+
+
+def open_raster(path):
+    """
+    메모리 매핑으로 열 수 있으면 RasterSource, 아니면 UnsupportedRaster 예외
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in RASTER_EXTS:
+        raise UnsupportedRaster(f"not a raster extension: {ext}")
+    if ext in (".tif", ".tiff"):
+        return TiffSource(path)
+    if envi_header_path(path) is None:
+        raise UnsupportedRaster("raw raster without .hdr")
+    return open_envi(path)
+
+
+def prefers_raster(source):
+    """
+    일반 디코딩으로 충분한 영상(작은 8비트 RGB/흑백)은 기존 cv2 경로를 쓰고,
+    다중 밴드/16비트 이상/대용량 영상만 메모리 매핑 경로로 보여줌
+    """
+    if source.dtype != np.uint8 or source.bands not in (1, 3):
+        return True
+    return source.width() * source.height() >= RASTER_MIN_PIXELS
@@ -0,0 +1,106 @@
+# Base Image / Temporary B 정합(registration) 및 정합 결과 디스크 캐시
+import hashlib
+import json
+import os
+
+import cv2
+import numpy as np
+
+from image_decoder import read_image
+
+WORK_SIZE = 1024  # 변환 추정용 축소 영상의 긴 변 길이
+MIN_MATCHES = 12  # 특징점 정합에 필요한 최소 매칭 수
+
+
+def pair_key(path_a, path_b):
+    """
+    두 파일의 경로/수정 시각/크기로 만든 캐시 키 (파일이 바뀌면 키도 바뀜)
+    """
+    h = hashlib.sha1()
+    for path in (path_a, path_b):
+        stat = os.stat(path)
+        h.update(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|".encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def aligned_paths(path_a, path_b):
+    """
+    정합된 B 영상과 변환 기록(JSON)의 캐시 경로: <B 폴더>/aligned/<B 이름>_<키>.png/.json
+    """
+    b_dir, b_name = os.path.split(path_b)
+    base = os.path.join(b_dir, "aligned", f"{os.path.splitext(b_name)[0]}_{pair_key(path_a, path_b)}")
+    return base + ".png", base + ".json"
+
+
+def to_gray(img, factor):
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+    size = (max(1, int(gray.shape[1] * factor)), max(1, int(gray.shape[0] * factor)))
+    return cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+
+
+def estimate_transform(img_a, img_b, method="orb"):
+    """
+    B 좌표 -> A 좌표로 옮기는 2x3 어파인 행렬 추정 (전체 해상도 기준).
+    method: 'orb' (특징점 + RANSAC 유사 변환) 또는 'phase' (위상 상관으로 평행 이동만)
+    """
+    ha, wa = img_a.shape[:2]
+    hb, wb = img_b.shape[:2]
+    # B를 A 크기로 맞추는 기본 배율
+    pre = np.array([[wa / wb, 0, 0], [0, ha / hb, 0]], np.float64)
+    factor = min(1.0, WORK_SIZE / max(ha, wa))
+    gray_a = to_gray(img_a, factor)
+    gray_b = cv2.resize(to_gray(img_b, 1.0), (gray_a.shape[1], gray_a.shape[0]), interpolation=cv2.INTER_AREA)
+
+    residual = None
+    if method == "orb":
+        orb = cv2.ORB_create(2000)
+        kp_a, des_a = orb.detectAndCompute(gray_a, None)
+        kp_b, des_b = orb.detectAndCompute(gray_b, None)
+        if des_a is not None and des_b is not None:
+            matches = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True).match(des_b, des_a)
+            if len(matches) >= MIN_MATCHES:
+                src = np.float32([kp_b[m.queryIdx].pt for m in matches])
+                dst = np.float32([kp_a[m.trainIdx].pt for m in matches])
+                residual, _ = cv2.estimateAffinePartial2D(src, dst, method=cv2.RANSAC, ransacReprojThreshold=3.0)
+    if residual is None:
+        # 특징점이 부족하면 위상 상관으로 평행 이동만 추정
+        (dx, dy), _ = cv2.phaseCorrelate(np.float32(gray_b), np.float32(gray_a))
+        residual = np.array([[1, 0, dx], [0, 1, dy]], np.float64)
+        method = "phase"
+
+    # 축소 좌표계의 변환을 전체 해상도로 환산하고 기본 배율과 합성
+    residual = residual.astype(np.float64)
+    residual[:, 2] /= factor
+    matrix = residual @ np.vstack([pre, [0, 0, 1]])
+    return matrix, method
+
+
+def align_pair(path_a, path_b, method="orb"):
+    """
+    B를 A에 맞춰 재표본화하고 디스크에 캐시. 정합된 B 영상 경로 반환 (이미 있으면 바로 반환)
+    """
+    image_path, meta_path = aligned_paths(path_a, path_b)
+    if os.path.exists(image_path) and os.path.exists(meta_path):
+        return image_path
+    img_a = read_image(path_a)
+    img_b = read_image(path_b)
+    matrix, used = estimate_transform(img_a, img_b, method)
+    aligned = cv2.warpAffine(img_b, matrix, (img_a.shape[1], img_a.shape[0]), flags=cv2.INTER_LINEAR)
+
+    os.makedirs(os.path.dirname(image_path), exist_ok=True)
+    cv2.imencode(".png", aligned)[1].tofile(image_path + ".tmp")
+    os.replace(image_path + ".tmp", image_path)
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump({'a': path_a, 'b': path_b, 'method': used, 'matrix': matrix.tolist()}, f, ensure_ascii=False)
+    return image_path
+
+
+def load_transform(path_a, path_b):
+    """
+    캐시에 기록된 2x3 변환 행렬 (없으면 None)
+    """
+    _, meta_path = aligned_paths(path_a, path_b)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        return np.array(json.load(f)['matrix'], np.float64)
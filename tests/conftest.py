@@ -0,0 +1,6 @@
+# 최상위 모듈(label_io 등)을 import할 수 있도록 저장소 폴더를 경로에 추가, Qt는 화면 없이 실행
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,36 @@
+import numpy as np
+
+from change_proposal import ProposalEngine, proposal_input, work_array
+from image_decoder import array_to_qimage
+
+
+def image_pair(size=3000):
+    rng = np.random.default_rng(0)
+    a = rng.integers(90, 110, (size, size, 3), dtype=np.uint8)
+    b = a.copy()
+    b[1200:1800, 600:1500] = 250  # 변화 영역 (x 600~1500, y 1200~1800)
+    return array_to_qimage(a, bgr=True), array_to_qimage(b, bgr=True)
+
+
+def test_input_is_reduced_before_the_worker():
+    image_a, _ = image_pair()
+    small = proposal_input(image_a, work_size=1024)
+    assert max(small.width(), small.height()) <= 2048
+    assert work_array(small).shape == (small.height(), small.width(), 3)
+
+
+def test_candidates_are_in_source_coordinates():
+    engine = ProposalEngine()
+    image_a, image_b = image_pair()
+    engine.request("a.png", "b.png", image_a, image_b)
+    engine.pool.shutdown(wait=True)
+    candidates = engine.get("a.png", "b.png")
+    assert candidates
+    xy = np.asarray(candidates[0]['points']).reshape(-1, 2)
+    assert np.allclose(xy.min(axis=0), (600, 1200), atol=30)
+    assert np.allclose(xy.max(axis=0), (1500, 1800), atol=30)
+
+    first, count = candidates[0], len(candidates)
+    engine.discard("a.png", "b.png", first)
+    assert len(engine.get("a.png", "b.png")) == count - 1
+    assert first not in engine.get("a.png", "b.png")
@@ -0,0 +1,50 @@
+import os
+
+import numpy as np
+
+from image_cache import DiskCache
+
+
+def image_file(tmp_path, name, value):
+    path = tmp_path / name
+    path.write_bytes(bytes([value]) * 16)
+    return str(path)
+
+
+def cached_kinds(root):
+    return sorted(name.rsplit('_', 1)[1] for name in os.listdir(root))
+
+
+def test_full_resolution_is_cached_by_default(tmp_path):
+    disk = DiskCache(root=str(tmp_path / "cache"))
+    path = image_file(tmp_path, "a.png", 1)
+    disk.store_decoded(path, np.zeros((300, 400, 3), np.uint8))
+    disk.writer.shutdown(wait=True)  # 대기 중인 쓰기까지 모두 기록
+    assert cached_kinds(disk.root) == ['bgr.npy', 'thumb.npy']
+    assert disk.load_full(path).shape == (300, 400, 3)
+    assert disk.load(path, 'thumb').shape == (96, 128, 3)
+
+
+def test_disabling_full_resolution_evicts(tmp_path):
+    disk = DiskCache(root=str(tmp_path / "cache"))
+    path = image_file(tmp_path, "a.png", 1)
+    disk.store_decoded(path, np.zeros((300, 400, 3), np.uint8))
+    disk.writer.shutdown(wait=True)
+    disk.set_full_bytes(0)
+    assert cached_kinds(disk.root) == ['thumb.npy']
+    assert disk.full_used == 0
+    assert disk.load_full(path) is None
+
+
+def test_full_resolution_budget_evicts_oldest(tmp_path):
+    img = np.zeros((100, 100, 3), np.uint8)
+    disk = DiskCache(root=str(tmp_path / "cache"), full_bytes=int(img.nbytes * 1.5))
+    paths = [image_file(tmp_path, f"{i}.png", i) for i in range(3)]
+    for path in paths:
+        disk.store_decoded(path, img)
+    disk.writer.shutdown(wait=True)
+    assert disk.full_used <= disk.full_bytes
+    assert cached_kinds(disk.root).count('bgr.npy') == 1
+    assert cached_kinds(disk.root).count('thumb.npy') == 3  # 썸네일은 전체 상한과 무관
+    assert disk.load_full(paths[-1]) is not None
+    assert disk.load_full(paths[0]) is None
@@ -0,0 +1,17 @@
+import os
+
+import cv2
+import numpy as np
+
+from image_decoder import ImageDecoder
+
+
+def test_memory_is_reported_as_estimate(tmp_path):
+    path = str(tmp_path / "a.png")
+    cv2.imwrite(path, np.zeros((64, 32, 3), np.uint8))
+    decoder = ImageDecoder()
+    decoder.decode(path)
+    stats = decoder.stats()
+    assert stats['est_peak_bytes'] == os.path.getsize(path) + 64 * 32 * 3
+    assert 'peak_bytes' not in stats
+    assert "추정" in decoder.describe(path)
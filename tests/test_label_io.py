@@ -0,0 +1,52 @@
+import math
+import os
+
+from label_io import (csv_to_npz, label_csv_path, npz_path, npz_to_csv, read_label_file, read_labels,
+                      read_labels_npz, write_label_file, write_labels)
+
+POLYS = [
+    {'points': [1.0, 2.0, 30.5, 2.0, 30.5, 40.25], 'class': 1},
+    {'points': [0.1, 0.2, 1e-7, 123456.789, 5.0, 6.0, 7.0, 8.0], 'class': 5},
+]
+
+
+def test_label_csv_path():
+    path = label_csv_path(os.path.join("data", "tile_07_A.png"))
+    assert path == os.path.join("data", "label", "tile_07_Label.csv")
+
+
+def test_csv_round_trip(tmp_path):
+    path = str(tmp_path / "label" / "a_Label.csv")
+    write_labels(path, POLYS)
+    assert read_labels(path) == POLYS
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_csv_drops_nan_padding(tmp_path):
+    path = str(tmp_path / "a_Label.csv")
+    write_labels(path, [{'points': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, math.nan, math.nan], 'class': 2}])
+    assert read_labels(path) == [{'points': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0], 'class': 2}]
+
+
+def test_npz_round_trip_is_lossless(tmp_path):
+    csv_path = str(tmp_path / "a_Label.csv")
+    padded = POLYS + [{'points': [1.0, 1.0, 2.0, 2.0, 3.0, 1.0, math.nan, math.nan], 'class': 3}]
+    write_labels(csv_path, padded, drop_nan=False)
+    binary_path = csv_to_npz(csv_path)
+    restored = read_labels_npz(binary_path)
+    assert restored[:2] == POLYS
+    assert restored[2]['points'][:6] == padded[2]['points'][:6]
+    assert all(math.isnan(v) for v in restored[2]['points'][6:])
+
+    back = npz_to_csv(binary_path, str(tmp_path / "b_Label.csv"))
+    assert read_labels(back)[:2] == POLYS
+
+
+def test_read_label_file_prefers_newer_npz(tmp_path):
+    csv_path = str(tmp_path / "a_Label.csv")
+    assert read_label_file(csv_path) is None
+    write_label_file(csv_path, POLYS, binary=True)
+    assert read_label_file(csv_path) == POLYS
+    write_labels(csv_path, POLYS[:1])
+    os.utime(npz_path(csv_path), (0, 0))
+    assert read_label_file(csv_path) == POLYS[:1]
@@ -0,0 +1,47 @@
+from label_journal import LabelJournal, journal_path
+
+
+def poly(i):
+    return {'points': [float(i), 0.0, i + 1.0, 0.0, i + 1.0, 1.0], 'class': 2}
+
+
+def test_recover_replays_edits(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = LabelJournal(path)
+    base = [poly(0)]
+    journal.record("a.png", 'add', 'add', [(1, poly(1))], base)
+    journal.record("a.png", 'remove', 'remove', [(0, poly(0))], base + [poly(1)])
+    journal.close()
+    assert LabelJournal.recover(path) == {"a.png": [poly(1)]}
+
+
+def test_recover_stops_at_truncated_line(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = LabelJournal(path)
+    journal.record("a.png", 'add', 'add', [(0, poly(0))], [])
+    journal.close()
+    # 마지막 기록을 쓰는 도중에 종료된 경우
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"op": "add", "image": "a.png", "kind": "add", "rows": [1], "po')
+    assert LabelJournal.recover(path) == {"a.png": [poly(0)]}
+
+
+def test_compact_keeps_only_given_images(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = LabelJournal(path)
+    journal.record("a.png", 'add', 'add', [(0, poly(0))], [])
+    journal.record("b.png", 'add', 'add', [(0, poly(1))], [])
+    journal.compact({"b.png": [poly(1)]})
+    journal.close()
+    assert LabelJournal.recover(path) == {"b.png": [poly(1)]}
+
+
+def test_recover_missing_file(tmp_path):
+    assert LabelJournal.recover(str(tmp_path / "none.jsonl")) == {}
+
+
+def test_journal_path_per_workspace(tmp_path):
+    a = journal_path(str(tmp_path / "x" / "A"))
+    b = journal_path(str(tmp_path / "y" / "A"))
+    assert a != b
+    assert a == journal_path(str(tmp_path / "x" / "A") + "/")
@@ -0,0 +1,42 @@
+import numpy as np
+
+from mask_export import polygon_arrays, rasterize_into
+
+
+def square(x0, y0, x1, y1, class_number):
+    return {'points': [x0, y0, x1, y0, x1, y1, x0, y1], 'class': class_number}
+
+
+def filled(polys, shape=(32, 32), strip_rows=2048):
+    out = np.zeros(shape, np.uint8)
+    rasterize_into(out, polygon_arrays(polys), strip_rows)
+    return out
+
+
+def test_overlapping_same_class_polygons_have_no_hole():
+    mask = filled([square(2, 2, 12, 12, 1), square(8, 8, 20, 20, 1)])
+    # 겹친 부분도 칠해져야 함 (짝홀 채우기면 0이 됨)
+    assert (mask[8:13, 8:13] == 1).all()
+    expected = np.zeros_like(mask)
+    expected[2:13, 2:13] = 1
+    expected[8:21, 8:21] = 1
+    assert (mask == expected).all()
+
+
+def test_later_polygon_is_drawn_on_top():
+    mask = filled([square(2, 2, 12, 12, 1), square(8, 8, 20, 20, 3), square(10, 10, 14, 14, 1)])
+    assert mask[9, 9] == 3
+    assert mask[12, 12] == 1
+    assert mask[18, 18] == 3
+
+
+def test_strips_match_whole_image():
+    polys = [square(1, 1, 30, 9, 2), square(4, 5, 12, 28, 2), square(20, 3, 28, 25, 5)]
+    assert (filled(polys, strip_rows=7) == filled(polys)).all()
+
+
+def test_nan_padding_and_degenerate_polygons_are_skipped():
+    polys = [{'points': [1.0, 1.0, 6.0, 1.0, 6.0, 6.0, np.nan, np.nan], 'class': 4},
+             {'points': [0.0, 0.0, 5.0, 5.0], 'class': 2}]
+    assert [class_number for class_number, _, _ in polygon_arrays(polys)] == [4]
+    assert filled(polys).max() == 4
@@ -0,0 +1,46 @@
+import numpy as np
+
+from polygon_simplify import simplify_points, simplify_polys
+
+SQUARE = [0, 0, 5, 0.2, 10, 0, 10, 5, 10.1, 10, 5, 10, 0, 10, -0.1, 5]
+CORNERS = {(0, 0), (10, 0), (10.1, 10), (0, 10)}
+
+
+def vertices(points):
+    return {tuple(p) for p in np.asarray(points).reshape(-1, 2).tolist()}
+
+
+def test_simplified_points_are_original_vertices():
+    for method in ('dp', 'vw'):
+        points, removed = simplify_points(SQUARE, 1.5, method)
+        assert vertices(points) <= vertices(SQUARE)
+        assert vertices(points) == CORNERS
+        assert removed == 4
+
+
+def test_at_least_three_vertices_are_kept():
+    triangle = [0, 0, 10, 0, 5, 0.01]
+    for method in ('dp', 'vw'):
+        assert simplify_points(triangle, 100.0, method) == (triangle, 0)
+        points, _ = simplify_points(SQUARE, 100.0, method)
+        assert len(points) // 2 >= 3
+        assert vertices(points) <= vertices(SQUARE)
+
+
+def test_zero_tolerance_keeps_points():
+    assert simplify_points(SQUARE, 0, 'dp') == (SQUARE, 0)
+
+
+def test_nan_padding_is_not_counted():
+    padded = SQUARE + [np.nan, np.nan, np.nan, np.nan]
+    changes, total, removed = simplify_polys([{'points': padded, 'class': 1}], 1.0)
+    assert total == 8
+    assert removed == 4
+    assert vertices(changes[0][1]['points']) == CORNERS
+    assert changes[0][1]['class'] == 1
+
+
+def test_unchanged_polygons_are_not_copied():
+    square = {'points': [0, 0, 10, 0, 10, 10, 0, 10], 'class': 2}
+    changes, total, removed = simplify_polys([square], 1.0)
+    assert (changes, total, removed) == ([], 4, 0)
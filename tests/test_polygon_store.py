@@ -0,0 +1,112 @@
+import numpy as np
+
+from polygon_store import GridIndex, PolygonStore
+
+
+def square(x0, y0, x1, y1, class_number=1):
+    return {'points': [x0, y0, x1, y0, x1, y1, x0, y1], 'class': class_number}
+
+
+def synced(poly_list):
+    store = PolygonStore()
+    store.sync(poly_list)
+    return store
+
+
+def assert_same_as_rebuild(store, poly_list):
+    fresh = synced(poly_list)
+    assert np.array_equal(store.coords, fresh.coords)
+    assert np.array_equal(store.offsets, fresh.offsets)
+    assert np.array_equal(store.classes, fresh.classes)
+    assert store.visible_rows(-1e9, -1e9, 1e9, 1e9) == list(range(len(poly_list)))
+
+
+def test_grid_index_query_and_remove():
+    index = GridIndex(cell=10)
+    index.insert('a', (0, 0, 5, 5))
+    index.insert('b', (20, 20, 35, 35))
+    assert index.query(1, 1, 1, 1) == ['a']
+    assert sorted(index.query(0, 0, 40, 40)) == ['a', 'b']
+    assert index.query(12, 12, 15, 15) == []
+    index.remove('b')
+    index.remove('b')  # 없는 키는 무시
+    assert index.query(30, 30, 30, 30) == []
+    assert not any('b' in keys for keys in index.cells.values())
+
+
+def test_insert_updates_hit_test_without_rebuild():
+    poly_list = [square(0, 0, 10, 10), square(20, 0, 30, 10, 2)]
+    store = synced(poly_list)
+    version = store.version
+
+    added = square(5, 5, 25, 8, 3)
+    poly_list.insert(1, added)
+    store.insert(1, added)
+    store.sync(poly_list)
+    assert store.version == version + 1  # sync가 전체를 다시 구성하지 않음
+    assert store.polygon_at(6, 6) == 1  # 겹치면 나중에 그려진 폴리곤
+    assert store.polygon_at(2, 2) == 0
+    assert store.polygon_at(28, 2) == 2
+    assert store.visible_rows(19, 0, 31, 4) == [2]
+    assert_same_as_rebuild(store, poly_list)
+
+    poly_list.append(square(40, 40, 50, 50))
+    store.insert(3, poly_list[3])
+    assert store.polygon_at(45, 45) == 3
+    assert_same_as_rebuild(store, poly_list)
+
+
+def test_remove_and_replace_update_hit_test():
+    poly_list = [square(0, 0, 10, 10), square(5, 5, 15, 15, 2), square(20, 20, 30, 30, 3)]
+    store = synced(poly_list)
+
+    del poly_list[1]
+    store.remove(1)
+    assert store.polygon_at(12, 12) == -1
+    assert store.polygon_at(7, 7) == 0
+    assert store.polygon_at(25, 25) == 1
+    assert_same_as_rebuild(store, poly_list)
+
+    moved = square(100, 100, 110, 110, 4)
+    poly_list[0] = moved
+    store.replace(0, moved)
+    assert store.polygon_at(5, 5) == -1
+    assert store.polygon_at(105, 105) == 0
+    assert_same_as_rebuild(store, poly_list)
+
+
+def test_nan_padding_is_not_stored():
+    padded = {'points': [0, 0, 10, 0, 10, 10, 0, 10, np.nan, np.nan], 'class': 1}
+    poly_list = [square(20, 20, 30, 30)]
+    store = synced(poly_list)
+    poly_list.insert(0, padded)
+    store.insert(0, padded)
+    assert store.offsets.tolist() == [0, 4, 8]
+    assert store.polygon_at(5, 5) == 0
+    assert_same_as_rebuild(store, poly_list)
+
+
+def test_scaled_cache_follows_insert_and_remove():
+    poly_list = [square(0, 0, 10, 10), square(20, 20, 30, 30)]
+    store = synced(poly_list)
+    store.scaled_polygon(1, 2.0)
+    added = square(40, 40, 50, 50)
+    poly_list.insert(0, added)
+    store.insert(0, added)
+    assert store.scaled_polygon(2, 2.0).boundingRect().left() == 40.0
+    assert store.scaled_polygon(0, 2.0).boundingRect().left() == 80.0
+    poly_list.pop(1)
+    store.remove(1)
+    assert store.scaled_polygon(1, 2.0).boundingRect().left() == 40.0
+    assert np.allclose(store.screen, store.coords * 2.0)
+
+
+def test_rebuild_skips_nan_vertices_per_polygon():
+    poly_list = [{'points': [0, 0, 10, 0, np.nan, np.nan, 10, 10], 'class': 1},
+                 {'points': [], 'class': 2},
+                 square(20, 20, 30, 30, 3)]
+    store = synced(poly_list)
+    assert store.offsets.tolist() == [0, 3, 3, 7]
+    assert store.classes.tolist() == [1, 2, 3]
+    assert not np.isnan(store.coords).any()
+    assert store.polygon_at(25, 25) == 2
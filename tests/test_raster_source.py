@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from raster_source import RasterSource, open_raster
+
+
+def write_envi(tmp_path, array, interleave='bsq'):
+    height, width, bands = array.shape
+    path = tmp_path / "image.raw"
+    data = {'bsq': array.transpose(2, 0, 1), 'bil': array.transpose(0, 2, 1), 'bip': array}[interleave]
+    np.ascontiguousarray(data).astype('<u2').tofile(path)
+    (tmp_path / "image.hdr").write_text(
+        f"ENVI\nsamples = {width}\nlines = {height}\nbands = {bands}\ndata type = 12\n"
+        f"interleave = {interleave}\nbyte order = 0\nheader offset = 0\n")
+    return str(path)
+
+
+@pytest.mark.parametrize('interleave', ['bsq', 'bil', 'bip'])
+def test_envi_window_and_reopen_after_close(tmp_path, interleave):
+    array = np.arange(40 * 30 * 4, dtype=np.uint16).reshape(40, 30, 4)
+    source = open_raster(write_envi(tmp_path, array, interleave))
+    assert (source.width(), source.height(), source.bands) == (30, 40, 4)
+    window = source.read(3, 5, 20, 33, 2, bands=(2, 0))
+    assert (window == array[5:33:2, 3:20:2][:, :, [2, 0]]).all()
+    # 매핑을 닫아도 다음 읽기에서 다시 매핑
+    source.close()
+    assert (source.read(0, 0, 30, 40) == array).all()
+
+
+def test_tiff_tiles_and_reopen_after_close(tmp_path):
+    tifffile = pytest.importorskip("tifffile")
+    array = np.random.default_rng(0).integers(0, 65535, (70, 50, 3), dtype=np.uint16)
+    path = str(tmp_path / "image.tif")
+    tifffile.imwrite(path, array, tile=(32, 32), planarconfig='contig')
+    source = open_raster(path)
+    assert (source.read(5, 7, 45, 66, 3) == array[7:66:3, 5:45:3]).all()
+    source.close()
+    assert (source.read(0, 0, 50, 70) == array).all()
+
+
+def test_raster_source_requires_read():
+    with pytest.raises(TypeError):
+        RasterSource("x", 1, 1, 3, np.uint8)
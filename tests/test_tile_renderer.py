@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QApplication
+
+import tile_renderer
+from image_cache import DiskCache
+from image_decoder import array_to_qimage
+from image_prefetch import ImagePrefetcher
+from tile_renderer import TileCache, TilePyramid
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    # QPixmap은 QApplication이 있어야 만들 수 있음
+    return QApplication.instance() or QApplication([])
+
+
+def source_image():
+    img = np.zeros((300, 200, 3), np.uint8)
+    img[:, :, 0] = 255  # BGR 파랑
+    img[150:, 100:] = (0, 0, 255)  # 오른쪽 아래 빨강
+    return array_to_qimage(img, bgr=True)
+
+
+def test_array_source_is_cut_into_tiles(app):
+    pyramid = TilePyramid(source_image(), TileCache(), tile_size=64)
+    assert isinstance(pyramid.levels[0], QImage)  # 전체 QPixmap을 만들지 않음
+    tile = pyramid.tile(0, 3, 3)
+    assert isinstance(tile, QPixmap)
+    assert (tile.width(), tile.height()) == (8, 64)
+    assert tile.toImage().pixelColor(0, 0).name() == "#ff0000"
+    assert pyramid.tile(0, 0, 0).toImage().pixelColor(0, 0).name() == "#0000ff"
+
+
+def test_reduced_levels_keep_array_channel_order(app):
+    pyramid = TilePyramid(source_image(), TileCache(), tile_size=64)
+    level = pyramid.level_image(1)
+    assert (level.width(), level.height()) == (100, 150)
+    assert level.format() == QImage.Format_BGR888
+    assert level.pixelColor(99, 149).name() == "#ff0000"
+
+
+def test_prefetcher_keeps_large_images_as_qimage(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(tile_renderer, "TILED_MIN_PIXELS", 200 * 300)
+    prefetcher = ImagePrefetcher(disk=DiskCache(root=str(tmp_path / "cache")))
+    try:
+        big = source_image()
+        assert prefetcher.to_pixmap("a.png", big) is big
+        small = array_to_qimage(np.zeros((10, 10, 3), np.uint8))
+        assert isinstance(prefetcher.to_pixmap("b.png", small), QPixmap)
+    finally:
+        prefetcher.shutdown()
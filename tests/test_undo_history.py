@@ -0,0 +1,52 @@
+from undo_history import EditHistory, HistoryManager, edit_bytes
+
+
+def poly(i):
+    return {'points': [float(i), 0.0, i + 1.0, 0.0, i + 1.0, 1.0], 'class': 1}
+
+
+def test_apply_and_reverse():
+    a, b, c = poly(0), poly(1), poly(2)
+    polys = [a, c]
+    assert HistoryManager.apply(polys, ('add', [(1, b)])) == [(1, True)]
+    assert polys == [a, b, c]
+    assert HistoryManager.apply(polys, ('add', [(1, b)]), reverse=True) == [(1, False)]
+    assert polys == [a, c]
+
+
+def test_remove_several_rows_and_restore_order():
+    items = [poly(i) for i in range(5)]
+    polys = list(items)
+    edit = ('remove', [(1, items[1]), (3, items[3])])
+    HistoryManager.apply(polys, edit)
+    assert polys == [items[0], items[2], items[4]]
+    HistoryManager.apply(polys, edit, reverse=True)
+    assert polys == items
+
+
+def test_undo_redo_stack():
+    history = EditHistory()
+    first, second = ('add', [(0, poly(0))]), ('add', [(1, poly(1))])
+    history.push(first)
+    history.push(second)
+    assert history.undo() is second
+    assert history.redo() is second
+    assert history.undo() is second
+    assert history.undo() is first
+    assert history.undo() is None
+    # 새 편집을 넣으면 redo 기록은 비워짐
+    history.push(first)
+    assert history.redo() is None
+    assert history.bytes == edit_bytes(first)
+
+
+def test_manager_trims_least_recently_used():
+    edit = ('add', [(0, poly(0))])
+    manager = HistoryManager(max_bytes=edit_bytes(edit) * 3)
+    for _ in range(2):
+        manager.push("a.png", edit)
+    for _ in range(2):
+        manager.push("b.png", edit)
+    assert manager.total_bytes() <= manager.max_bytes
+    assert len(manager.get("b.png").undo_stack) == 2
+    assert len(manager.get("a.png").undo_stack) == 1
@@ -0,0 +1,220 @@
+# 대용량 위성영상용 타일 피라미드 렌더러
+import math
+from collections import OrderedDict
+
+from PyQt5.QtCore import Qt, QRect, QRectF
+from PyQt5.QtGui import QImage, QPixmap
+
+from image_decoder import array_to_qimage
+from profiler import PROFILER
+
+TILE_SIZE = 512  # 타일 한 변의 픽셀 수
+TILED_MIN_PIXELS = 4096 * 4096  # 이 크기 이상인 영상만 타일 모드로 그림
+TILE_CACHE_BYTES = 256 * 1024 * 1024  # 타일 캐시 메모리 상한
+SCALED_MAX_PIXELS = 4096 * 4096  # 확대된 영상이 이보다 크면 전체 대신 보이는 부분만 보관
+
+
+class TileCache:
+    """
+    (피라미드, 레벨, 타일x, 타일y) 키로 타일 QPixmap을 보관하는 LRU 캐시
+    """
+    def __init__(self, max_bytes=TILE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.tiles = OrderedDict()
+
+    def get(self, key):
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+        if PROFILER.enabled:
+            PROFILER.count('tiles', tile is not None)
+        return tile
+
+    def put(self, key, tile):
+        if key in self.tiles:
+            self.bytes -= self.tile_bytes(self.tiles.pop(key))
+        self.tiles[key] = tile
+        self.bytes += self.tile_bytes(tile)
+        # 메모리 상한을 넘으면 가장 오래 쓰지 않은 타일부터 제거
+        while self.bytes > self.max_bytes and len(self.tiles) > 1:
+            _, old = self.tiles.popitem(last=False)
+            self.bytes -= self.tile_bytes(old)
+
+    def drop(self, owner):
+        """
+        특정 피라미드의 타일을 모두 제거
+        """
+        for key in [k for k in self.tiles if k[0] == owner]:
+            self.bytes -= self.tile_bytes(self.tiles.pop(key))
+
+    @staticmethod
+    def tile_bytes(tile):
+        return tile.width() * tile.height() * 4
+
+
+class TilePyramid:
+    """
+    원본 영상으로부터 1/2씩 줄어드는 레벨을 만들고,
+    화면에 보이는 타일만 가장 가까운 해상도에서 그림.
+    원본이 디코딩 배열을 감싼 QImage면 전체 QPixmap을 만들지 않고, 레벨 0도 보이는 타일만 배열에서 잘라 변환
+    """
+    def __init__(self, source, cache, tile_size=TILE_SIZE, store=None):
+        self.cache = cache
+        self.store = store  # 축소 레벨을 디스크에 보관하는 저장소 (load/save), 없으면 매번 생성
+        self.tile_size = tile_size
+        self.width = source.width()
+        self.height = source.height()
+        # 레벨 0은 원본(QPixmap 또는 배열을 감싼 QImage), 이후 레벨은 필요할 때 생성
+        self.levels = [source]
+        self.num_levels = 1
+        size = max(self.width, self.height)
+        while size > tile_size:
+            size = (size + 1) // 2
+            self.num_levels += 1
+
+    @staticmethod
+    def wants_tiles(image):
+        return image is not None and image.width() * image.height() >= TILED_MIN_PIXELS
+
+    def release(self):
+        self.cache.drop(id(self))
+        self.levels = []
+
+    def level_image(self, level):
+        while len(self.levels) <= level:
+            n = len(self.levels)
+            img = self.store.load(n) if self.store is not None else None
+            if img is None:
+                img = self.half(self.levels[-1])
+                if self.store is not None:
+                    self.store.save(n, img)
+            self.levels.append(img)
+        return self.levels[level]
+
+    @staticmethod
+    def half(prev):
+        """
+        prev를 1/2로 줄인 영상. 배열을 감싼 QImage면 cv2로 줄여 원본 전체를 32비트 영상으로 바꾸지 않음
+        """
+        width, height = max(1, (prev.width() + 1) // 2), max(1, (prev.height() + 1) // 2)
+        buffer = getattr(prev, 'buffer', None)
+        if buffer is None:
+            return prev.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        import cv2  # 처음 쓸 때 불러옴 (시작 시간 단축)
+        return array_to_qimage(cv2.resize(buffer, (width, height), interpolation=cv2.INTER_AREA),
+                               bgr=prev.format() == QImage.Format_BGR888)
+
+    def choose_level(self, scale):
+        """
+        화면 배율에 가장 가까운(같거나 더 높은 해상도의) 레벨 선택
+        """
+        if scale <= 0:
+            return self.num_levels - 1
+        level = int(math.floor(math.log2(1.0 / scale))) if scale < 1.0 else 0
+        return max(0, min(level, self.num_levels - 1))
+
+    def tile(self, level, tx, ty):
+        key = (id(self), level, tx, ty)
+        tile = self.cache.get(key)
+        if tile is None:
+            img = self.level_image(level)
+            t = self.tile_size
+            tile = img.copy(QRect(tx * t, ty * t, min(t, img.width() - tx * t), min(t, img.height() - ty * t)))
+            if isinstance(tile, QImage):
+                tile = QPixmap.fromImage(tile)  # 타일 크기만큼만 변환
+            self.cache.put(key, tile)
+        return tile
+
+    def draw(self, painter, origin, scale, view_rect):
+        """
+        origin: 화면상의 영상 좌상단, scale: 원본 대비 화면 배율, view_rect: 위젯 영역
+        """
+        level = self.choose_level(scale)
+        img = self.level_image(level)
+        # 레벨 픽셀 하나가 화면에서 차지하는 크기
+        step = scale * (self.width / img.width())
+        t = self.tile_size
+        ox, oy = origin.x(), origin.y()
+        cols = (img.width() + t - 1) // t
+        rows = (img.height() + t - 1) // t
+        tx0 = max(0, math.floor((view_rect.left() - ox) / (step * t)))
+        ty0 = max(0, math.floor((view_rect.top() - oy) / (step * t)))
+        tx1 = min(cols - 1, math.floor((view_rect.right() - ox) / (step * t)))
+        ty1 = min(rows - 1, math.floor((view_rect.bottom() - oy) / (step * t)))
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                tile = self.tile(level, tx, ty)
+                target = QRectF(ox + tx * t * step, oy + ty * t * step, tile.width() * step, tile.height() * step)
+                painter.drawPixmap(target, tile, QRectF(tile.rect()))
+
+
+class CachedLayer:
+    """
+    배율 좌표계(영상 원점 기준)의 한 영역을 미리 그려 둔 QPixmap.
+    키가 같고 필요한 영역을 포함하면 다시 그리지 않고 그대로 복사(blit)
+    """
+    def __init__(self):
+        self.key = None
+        self.region = QRect()
+        self.pixmap = None
+
+    def covers(self, key, need):
+        return self.pixmap is not None and self.key == key and self.region.contains(need)
+
+    def store(self, key, region, pixmap):
+        self.key = key
+        self.region = region
+        self.pixmap = pixmap
+
+    def clear(self):
+        self.key = None
+        self.pixmap = None
+
+    def blit(self, painter, origin, need):
+        """
+        origin: 화면상의 영상 좌상단, need: 배율 좌표계에서 그릴 영역
+        """
+        painter.drawPixmap(need.translated(origin), self.pixmap, need.translated(-self.region.topLeft()))
+
+    def blit_scaled(self, painter, origin, need, factor):
+        """
+        그려 둔 뒤 배율이 factor배 바뀐 경우 다시 그리지 않고 늘려서 복사 (레이어 밖 부분은 비워 둠)
+        """
+        source = QRectF(need.x() / factor - self.region.x(), need.y() / factor - self.region.y(),
+                        need.width() / factor, need.height() / factor)
+        painter.drawPixmap(QRectF(need.translated(origin)), self.pixmap, source)
+
+
+def scale_region(source, width, height, region, smooth=True):
+    """
+    source를 width x height로 확대/축소했을 때의 region 부분만 만듦.
+    원본 픽셀 경계에 맞춘 실제 영역과 QPixmap 반환
+    """
+    sx = source.width() / width
+    sy = source.height() / height
+    src = QRectF(region.x() * sx, region.y() * sy, region.width() * sx, region.height() * sy)
+    src = src.toAlignedRect().intersected(source.rect())
+    actual = QRect(round(src.x() / sx), round(src.y() / sy), max(1, round(src.width() / sx)),
+                   max(1, round(src.height() / sy)))
+    mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+    part = source if src == source.rect() else source.copy(src)
+    return actual, part.scaled(actual.width(), actual.height(), Qt.IgnoreAspectRatio, mode)
+
+
+def raster_region(source, width, height, region, smooth=True):
+    """
+    scale_region과 같지만 RasterSource에서 region에 해당하는 창만 읽음.
+    축소해서 보일 때는 화면 픽셀당 하나 정도만 간격을 두고 읽어 읽는 양을 줄임
+    """
+    sx = source.width() / width
+    sy = source.height() / height
+    src = QRectF(region.x() * sx, region.y() * sy, region.width() * sx, region.height() * sy)
+    src = src.toAlignedRect().intersected(QRect(0, 0, source.width(), source.height()))
+    actual = QRect(round(src.x() / sx), round(src.y() / sy), max(1, round(src.width() / sx)),
+                   max(1, round(src.height() / sy)))
+    step = max(1, int(min(sx, sy)))
+    data = source.render(src.left(), src.top(), src.right() + 1, src.bottom() + 1, step)
+    mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+    part = QPixmap.fromImage(array_to_qimage(data))
+    return actual, part.scaled(actual.width(), actual.height(), Qt.IgnoreAspectRatio, mode)
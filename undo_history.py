@@ -0,0 +1,111 @@
+# 이미지별 델타 기반 Undo/Redo 기록
+from collections import OrderedDict
+
+HISTORY_BYTES = 64 * 1024 * 1024  # 전체 기록 메모리 예산
+
+
+def edit_bytes(edit):
+    """
+    편집 하나가 차지하는 대략적인 메모리 (좌표 수 기준)
+    """
+    kind, items = edit
+    return sum(64 + 8 * len(poly_dict['points']) for _, poly_dict in items)
+
+
+class EditHistory:
+    """
+    이미지 하나의 Undo/Redo 스택.
+    각 항목은 ('add' | 'remove', [(행 번호, 폴리곤 dict), ...]) 로, 바뀐 폴리곤만 저장
+    """
+    def __init__(self):
+        self.undo_stack = []
+        self.redo_stack = []
+        self.bytes = 0
+
+    def push(self, edit):
+        self.undo_stack.append(edit)
+        self.bytes += edit_bytes(edit)
+        for old in self.redo_stack:
+            self.bytes -= edit_bytes(old)
+        self.redo_stack.clear()
+
+    def undo(self):
+        if not self.undo_stack:
+            return None
+        edit = self.undo_stack.pop()
+        self.redo_stack.append(edit)
+        return edit
+
+    def redo(self):
+        if not self.redo_stack:
+            return None
+        edit = self.redo_stack.pop()
+        self.undo_stack.append(edit)
+        return edit
+
+    def drop_oldest(self):
+        """
+        가장 오래된 undo 항목을 버림 (버릴 것이 없으면 False)
+        """
+        if not self.undo_stack:
+            return False
+        self.bytes -= edit_bytes(self.undo_stack.pop(0))
+        return True
+
+
+class HistoryManager:
+    """
+    이미지 경로별 EditHistory를 보관하고, 메모리 예산을 넘으면
+    가장 오래 사용하지 않은 이미지의 오래된 항목부터 버림
+    """
+    def __init__(self, max_bytes=HISTORY_BYTES):
+        self.max_bytes = max_bytes
+        self.histories = OrderedDict()
+
+    def get(self, path):
+        history = self.histories.get(path)
+        if history is None:
+            history = self.histories[path] = EditHistory()
+        self.histories.move_to_end(path)
+        return history
+
+    def push(self, path, edit):
+        self.get(path).push(edit)
+        self.trim()
+
+    def discard(self, path):
+        # 라벨이 다른 곳에서 통째로 바뀌어 기록된 행 번호가 더 이상 맞지 않을 때
+        self.histories.pop(path, None)
+
+    def total_bytes(self):
+        return sum(h.bytes for h in self.histories.values())
+
+    def trim(self):
+        total = self.total_bytes()
+        for history in list(self.histories.values()):
+            while total > self.max_bytes:
+                before = history.bytes
+                if not history.drop_oldest():
+                    break
+                total -= before - history.bytes
+            if total <= self.max_bytes:
+                break
+
+    @staticmethod
+    def apply(poly_list, edit, reverse=False):
+        """
+        편집을 poly_list에 적용 (reverse=True면 되돌림).
+        바뀐 (행 번호, 추가 여부) 목록을 변경 순서대로 반환
+        """
+        kind, items = edit
+        adding = (kind == 'add') != reverse
+        changes = []
+        if adding:
+            for row, poly_dict in sorted(items, key=lambda item: item[0]):
+                poly_list.insert(row, poly_dict)
+                changes.append((row, True))
+        else:
+            for row, poly_dict in sorted(items, key=lambda item: item[0], reverse=True):
+                poly_list.pop(row)
+                changes.append((row, False))
+        return changes